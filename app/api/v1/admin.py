@@ -0,0 +1,115 @@
+"""Admin endpoints for cache maintenance and Wikipedia traffic metrics.
+
+Every request must carry `ADMIN_API_KEY` in the `X-Admin-Key` header. While no key is
+configured the endpoints are disabled and answer 404.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import secrets
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from pydantic import BaseModel
+
+from ...core.llm_cache import get_llm_cache
+from ...core.settings import settings
+from ...services.wikipedia.api.limiter import get_limiter_stats
+from ...services.wikipedia.api.session import get_session_stats
+from ...services.wikipedia.cache import get_lookup_cache, get_page_cache
+from ...services.wikipedia.offline_index import get_offline_index
+from ...services.wikipedia.title_graph import get_title_graph
+
+
+def require_admin_key(x_admin_key: str | None = Header(None)) -> None:
+    """Reject the request unless it carries the configured admin key (all requests if none is configured)."""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=404, detail="admin endpoints are disabled (ADMIN_API_KEY not set)")
+    if not secrets.compare_digest(x_admin_key or "", settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=401, detail="invalid or missing X-Admin-Key header")
+
+
+router = APIRouter(prefix="/v1", tags=["admin"], dependencies=[Depends(require_admin_key)])
+
+
+class InvalidationResponse(BaseModel):
+    """Number of cache entries an invalidation removed."""
+
+    removed: int
+
+
+@router.delete("/admin/cache/negative", response_model=InvalidationResponse)
+async def invalidate_negative_cache(
+    label: str | None = Query(None, description="Only forget this entity label (all labels if omitted)"),
+    lang: Literal["de", "en"] | None = Query(None, description="Only forget entries of this language"),
+) -> InvalidationResponse:
+    """Forget cached 'not found' results so the labels are looked up again.
+
+    Use this after Wikipedia gained an article for a label that previously could
+    not be resolved, or to reset the negative cache entirely.
+    """
+    cache = get_page_cache()
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Wikipedia cache is disabled")
+    removed = await asyncio.to_thread(cache.invalidate_misses, label=label, lang=lang)
+    return InvalidationResponse(removed=removed)
+
+
+@router.delete("/admin/cache/llm", response_model=InvalidationResponse)
+async def invalidate_llm_cache(
+    endpoint: Literal["translate", "synonyms", "extract", "generate", "compendium", "qa"] | None = Query(
+        None, description="Only forget responses of this LLM endpoint (all if omitted)"
+    ),
+) -> InvalidationResponse:
+    """Forget cached LLM responses, e.g. after a prompt change that does not alter the request text."""
+    cache = get_llm_cache()
+    if cache is None:
+        raise HTTPException(status_code=404, detail="LLM cache is disabled")
+    return InvalidationResponse(removed=await asyncio.to_thread(cache.clear, endpoint))
+
+
+@router.get("/admin/stats/llm")
+async def llm_stats() -> dict:
+    """Return hit statistics of the LLM response cache, overall and per endpoint.
+
+    Hits are split into `memory_hits` (in-process LRU) and `disk_hits`; `bypassed`
+    counts calls of requests sent with `Cache-Control: no-cache`.
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        raise HTTPException(status_code=404, detail="LLM cache is disabled")
+    return await asyncio.to_thread(cache.get_stats)
+
+
+@router.get("/admin/stats/wikipedia")
+async def wikipedia_stats() -> dict:
+    """Return process-wide Wikipedia traffic metrics.
+
+    - `connections`: requests, new vs. reused connections and DNS cache hits of the HTTP sessions
+    - `limiters`: current adaptive concurrency window per host
+    - `page_cache` / `lookup_cache`: cache hit statistics
+    - `title_graph`: learned redirect and langlink edges
+    - `offline_index`: hits and indexed pages of the offline dump index (None if not configured)
+    """
+    page_cache = get_page_cache()
+    offline_index = get_offline_index()
+    title_graph = get_title_graph()
+
+    def _sqlite_stats() -> dict:
+        # The stores count their rows with SQLite queries
+        return {
+            "page_cache": page_cache.get_stats() if page_cache is not None else None,
+            "title_graph": title_graph.get_stats() if title_graph is not None else None,
+            "offline_index": offline_index.get_stats() if offline_index is not None else None,
+        }
+
+    stored = await asyncio.to_thread(_sqlite_stats)
+    return {
+        "connections": get_session_stats(),
+        "limiters": get_limiter_stats(),
+        "page_cache": stored["page_cache"],
+        "lookup_cache": get_lookup_cache().get_stats(),
+        "title_graph": stored["title_graph"],
+        "offline_index": stored["offline_index"],
+    }
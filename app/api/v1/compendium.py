@@ -1,13 +1,17 @@
 """Compendium endpoint `/compendium`.
 
 Receives either text or entity list (output of linker) and returns markdown compendium text.
+`/compendium/stream` returns the same content as server-sent events while it is generated.
 """
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 from enum import Enum
+import json
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from ...core import compendium as comp_core
@@ -53,7 +57,7 @@ class CompendiumResponse(BaseModel):
 
 
 @router.post("/compendium", response_model=CompendiumResponse)
-def compendium_endpoint(payload: CompendiumRequest) -> CompendiumResponse:
+async def compendium_endpoint(payload: CompendiumRequest) -> CompendiumResponse:
     """Generate comprehensive markdown compendium from text or linker output.
 
     This endpoint creates structured, educational compendium texts in Markdown format
@@ -121,15 +125,78 @@ def compendium_endpoint(payload: CompendiumRequest) -> CompendiumResponse:
 
     Alternatively, use direct text input for simple compendium generation.
     """
+    return await run_compendium(payload)
+
+
+def _validate_request(payload: CompendiumRequest) -> None:
     if payload.input_type == InputType.TEXT and not payload.text:
         raise HTTPException(status_code=400, detail="text required for input_type=text")
 
     if payload.input_type == InputType.LINKER_OUTPUT and not payload.linker_data:
         raise HTTPException(status_code=400, detail="linker_data required for input_type=linker_output")
 
+
+async def run_compendium(payload: CompendiumRequest) -> CompendiumResponse:
+    """Generate the compendium for *payload* in-process (shared by `/compendium` and `/pipeline`)."""
+    _validate_request(payload)
+
     if payload.input_type == InputType.TEXT:
-        md, bibliography, statistics = comp_core.generate_compendium_from_text(payload.text, payload.config)
+        md, bibliography, statistics = await comp_core.generate_compendium_from_text_async(payload.text, payload.config)
     elif payload.input_type == InputType.LINKER_OUTPUT:
-        md, bibliography, statistics = comp_core.generate_compendium(payload.linker_data, payload.config)
+        md, bibliography, statistics = await comp_core.generate_compendium_async(payload.linker_data, payload.config)
 
     return CompendiumResponse(markdown=md, bibliography=bibliography, statistics=statistics)
+
+
+@router.post("/compendium/stream")
+async def compendium_stream_endpoint(payload: CompendiumRequest) -> StreamingResponse:
+    """Stream the compendium as server-sent events.
+
+    Accepts the same request body as `/compendium`. The markdown is forwarded while
+    it is being generated, followed by the bibliography and the statistics:
+
+    ```
+    event: chunk
+    data: {"text": "## Albert Einstein ..."}
+
+    event: bibliography
+    data: {"text": "## Literaturverzeichnis ..."}
+
+    event: statistics
+    data: {"topic": "...", "output_length": 6123, ...}
+
+    event: done
+    data: {}
+    ```
+
+    If generation fails after the stream has started, an `error` event with
+    `{"detail": "..."}` is sent instead of the remaining events.
+    """
+    _validate_request(payload)
+
+    if payload.input_type == InputType.TEXT:
+        events = comp_core.stream_compendium(payload.config, text=payload.text)
+    else:
+        events = comp_core.stream_compendium(payload.config, linker_data=payload.linker_data)
+
+    async def event_source() -> AsyncIterator[str]:
+        async for event, data in events:
+            if event in ("chunk", "bibliography"):
+                data = {"text": data}
+            elif event == "error":
+                data = {"detail": data}
+            yield _format_sse(event, data)
+            if event == "error":
+                return
+        yield _format_sse("done", {})
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _format_sse(event: str, data: dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -1,14 +1,23 @@
-"""Linker endpoint (placeholder).
+"""Linker endpoints `/linker`, `/linker/stream` and `/linker/batch`.
 
-Implements `/linker` POST endpoint. For now returns mock response.
-Will integrate OpenAI-based entity extractor/generator and Wikipedia linking.
+Extracts or generates entities from text with OpenAI and links them to Wikipedia.
+`/linker/stream` sends every entity as a JSON line as soon as it is linked, and
+`/linker/batch` links many texts in one request.
 """
 
+from collections import Counter
+from collections.abc import AsyncIterator
+import json
 from typing import Literal
+import uuid
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from loguru import logger
 from pydantic import BaseModel, Field
 
+from ...core.settings import settings
+
 router = APIRouter(prefix="/v1", tags=["linker"])
 
 
@@ -18,6 +27,7 @@ class LinkerConfig(BaseModel):
     ALLOWED_ENTITY_TYPES: str | list[str] | Literal["auto"] = "auto"
     EDUCATIONAL_MODE: bool = False
     LANGUAGE: Literal["de", "en"] = "de"
+    WIKIPEDIA_FIELDS: list[Literal["categories", "coordinates", "internal_links", "thumbnail"]] | None = None
 
 
 class LinkerRequest(BaseModel):
@@ -108,6 +118,26 @@ class LinkerResponse(BaseModel):
     statistics: Statistics
 
 
+class LinkerBatchRequest(BaseModel):
+    """Several texts linked with one shared configuration."""
+
+    texts: list[str] = Field(..., min_length=1, description="Texts to process with the same configuration")
+    config: LinkerConfig = Field(default_factory=LinkerConfig)
+
+
+class LinkerBatchResult(LinkerResponse):
+    """Linker response for one text of a batch."""
+
+    error: str | None = None  # Set if entity extraction failed for this text
+
+
+class LinkerBatchResponse(BaseModel):
+    """Per-text results of a batch in request order, plus batch statistics."""
+
+    results: list[LinkerBatchResult]
+    statistics: dict
+
+
 @router.post("/linker", response_model=LinkerResponse)
 async def linker_endpoint(payload: LinkerRequest) -> LinkerResponse:
     """Extract or generate entities from text and link them to Wikipedia.
@@ -150,6 +180,12 @@ async def linker_endpoint(payload: LinkerRequest) -> LinkerResponse:
     - Affects the language of abstracts and preferred Wikipedia language versions
     - Both German and English labels/URLs are provided when available
 
+    **WIKIPEDIA_FIELDS** (list or null, default: null = all):
+    - Optional Wikipedia fields to fetch: "categories", "coordinates", "internal_links", "thumbnail"
+    - Labels, URLs, abstracts, Wikidata IDs and infobox types are always included
+    - Fields not listed stay empty and are not requested from Wikipedia, which keeps
+      the responses (and the link resolution) small. `internal_links` is by far the largest
+
     ## Response Structure:
 
     Returns enhanced entities with:
@@ -174,15 +210,10 @@ async def linker_endpoint(payload: LinkerRequest) -> LinkerResponse:
     }
     ```
     """
-    from collections import Counter
-    import uuid
+    return await run_linker(payload)
 
-    from loguru import logger
-    # Logging via loguru (see plan.md)
-
-    logger.info(f"Linker-Request erhalten (Text, Länge {len(payload.text)}): {payload.text[:100]}…")
-    logger.info(f"Linker-Konfiguration: {payload.config}")
 
+def _validate_request(payload: LinkerRequest) -> None:
     if not payload.text:
         raise HTTPException(status_code=400, detail="text is required")
 
@@ -190,6 +221,14 @@ async def linker_endpoint(payload: LinkerRequest) -> LinkerResponse:
     if payload.config.EDUCATIONAL_MODE and payload.config.MODE != "generate":
         raise HTTPException(status_code=400, detail="educational_mode can only be used with mode='generate'")
 
+
+async def run_linker(payload: LinkerRequest) -> LinkerResponse:
+    """Run the linker for *payload* in-process (shared by `/linker` and `/pipeline`)."""
+    logger.info(f"Linker-Request erhalten (Text, Länge {len(payload.text)}): {payload.text[:100]}…")
+    logger.info(f"Linker-Konfiguration: {payload.config}")
+
+    _validate_request(payload)
+
     from ...core import linker as linker_core  # relative import to avoid path issues
 
     logger.info("Starte Entity-Verarbeitung im Linker-Endpunkt…")
@@ -202,6 +241,7 @@ async def linker_endpoint(payload: LinkerRequest) -> LinkerResponse:
             language=payload.config.LANGUAGE,
             educational_mode=payload.config.EDUCATIONAL_MODE,
             allowed_entity_types=payload.config.ALLOWED_ENTITY_TYPES,
+            wikipedia_fields=payload.config.WIKIPEDIA_FIELDS,
         )
         logger.info(f"Successfully processed {len(entities)} entities")
 
@@ -211,94 +251,218 @@ async def linker_endpoint(payload: LinkerRequest) -> LinkerResponse:
             logger.debug(f"  wiki_url_de: {entity.wiki_url_de}")
             logger.debug(f"  wiki_url_en: {entity.wiki_url_en}")
 
-        # Convert entities to enhanced format
-        enhanced_entities = []
-        types_distribution = Counter()
-        wiki_categories_counter = Counter()
-        wiki_internal_links_counter = Counter()  # Add Counter for internal links
-        linked_wikipedia_count = 0
-        linked_wikidata_count = 0
-
-        for entity in entities:
-            # Count types
-            types_distribution[entity.type] += 1
-
-            # Create entity ID
-            entity_id = str(uuid.uuid4())
-
-            # Create EntityDetails
-            details = EntityDetails(
-                typ=entity.type,
-                citation=entity.label,
-            )
-
-            # Create WikipediaSource
-            # Determine status based on available data
-            wiki_status = "not_found"  # Default
-            if entity.wiki_url_de or entity.wiki_url_en or entity.wikidata_id:
-                wiki_status = "found"
-
-            wiki_source = WikipediaSource(
-                status=wiki_status,
-                label_de=entity.label,
-                label_en=entity.label_en,
-                url_de=entity.wiki_url_de,
-                url_en=entity.wiki_url_en,
-                extract=entity.abstract_de or entity.abstract_en,
-                categories=entity.categories,
-                internal_links=getattr(entity, "internal_links", []),
-                wikidata_id=entity.wikidata_id,
-                thumbnail_url=entity.image_url,
-                geo_lat=entity.geo_lat,
-                geo_lon=entity.geo_lon,
-                infobox_type=getattr(entity, "infobox_type", None),
-                dbpedia_uri=getattr(entity, "dbpedia_uri", None),
-                source="api",
-                needs_fallback=False,
-                fallback_attempts=0,
-            )
-
-            # Count categories for statistics
-            if entity.categories:
-                for cat in entity.categories:
-                    wiki_categories_counter[cat] += 1
-
-            # Track linked entities
-            if wiki_source.url_de or wiki_source.url_en:
-                linked_wikipedia_count += 1
-            if entity.wikidata_id:
-                linked_wikidata_count += 1
-
-            # Create EntitySources
-            sources = EntitySources(wikipedia=wiki_source)
-
-            # Create EnhancedEntity
-            enhanced_entity = EnhancedEntity(entity=entity.label, details=details, sources=sources, id=entity_id)
-
-            enhanced_entities.append(enhanced_entity)
-
-        # Calculate statistics
-        total_entities = len(enhanced_entities)
-
-        # Calculate percentages
-        wiki_percent = (linked_wikipedia_count / total_entities * 100) if total_entities > 0 else 0
-        wikidata_percent = (linked_wikidata_count / total_entities * 100) if total_entities > 0 else 0
-
-        # Create Statistics object
-        statistics = Statistics(
-            total_entities=total_entities,
-            top10={
-                "wikipedia_categories": dict(wiki_categories_counter.most_common(10)),
-                "wikipedia_internal_links": dict(wiki_internal_links_counter.most_common(10)),
-            },
-            types_distribution=dict(types_distribution),
-            linked={
-                "wikipedia": {"count": linked_wikipedia_count, "percent": wiki_percent},
-                "wikidata": {"count": linked_wikidata_count, "percent": wikidata_percent},
-            },
-        )
-
-        return LinkerResponse(original_text=payload.text, entities=enhanced_entities, statistics=statistics)
+        return build_linker_response(payload.text, entities)
     except Exception as e:
         logger.error(f"Fehler im Linker-Endpunkt: {e!s}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/linker/stream")
+async def linker_stream_endpoint(payload: LinkerRequest) -> StreamingResponse:
+    """Stream linked entities as newline-delimited JSON.
+
+    Accepts the same request body as `/linker`. Every entity is emitted as soon as
+    its Wikipedia resolution completes, so records arrive in completion order;
+    `index` is the entity's position in the extraction order. A final record
+    carries the statistics over all entities:
+
+    ```
+    {"type": "entity", "index": 2, "entity": {"entity": "Zugspitze", "details": {...}, "sources": {...}, "id": "..."}}
+    {"type": "entity", "index": 0, "entity": {...}}
+    {"type": "statistics", "statistics": {"total_entities": 2, ...}, "processing": {"entities_linked": 2, ...}}
+    ```
+
+    If processing fails after the stream has started, a `{"type": "error", "detail": "..."}`
+    record ends the stream.
+    """
+    _validate_request(payload)
+
+    from ...core import linker as linker_core
+
+    events = linker_core.process_text_stream(
+        text=payload.text,
+        mode=payload.config.MODE,
+        max_entities=payload.config.MAX_ENTITIES,
+        language=payload.config.LANGUAGE,
+        educational_mode=payload.config.EDUCATIONAL_MODE,
+        allowed_entity_types=payload.config.ALLOWED_ENTITY_TYPES,
+        wikipedia_fields=payload.config.WIKIPEDIA_FIELDS,
+    )
+
+    async def records() -> AsyncIterator[str]:
+        entities = []
+        try:
+            async for event, data in events:
+                if event == "entity":
+                    index, entity = data
+                    entities.append(entity)
+                    record = {"type": "entity", "index": index, "entity": to_enhanced_entity(entity).model_dump()}
+                else:
+                    record = {
+                        "type": "statistics",
+                        "statistics": build_statistics(entities).model_dump(),
+                        "processing": data,
+                    }
+                yield json.dumps(record, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logger.error(f"Fehler im Linker-Stream: {e!s}", exc_info=True)
+            yield json.dumps({"type": "error", "detail": str(e)}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(records(), media_type="application/x-ndjson")
+
+
+@router.post("/linker/batch", response_model=LinkerBatchResponse)
+async def linker_batch_endpoint(payload: LinkerBatchRequest) -> LinkerBatchResponse:
+    """Process many texts in one call.
+
+    Entities are extracted per text, then entity labels are deduplicated across the
+    whole batch so that every distinct entity is resolved against Wikipedia only
+    once, within a single Wikipedia session and cache. `results` holds one
+    `/linker`-style response per input text, in input order; a text whose entity
+    extraction failed gets an empty entity list and an `error` message.
+
+    `statistics` summarizes the batch (`documents`, `failed_documents`,
+    `entities_extracted`, `unique_labels`, `wikipedia_pages_fetched`, `resolution_seconds`).
+
+    ## Example Usage:
+
+    ```json
+    {
+        "texts": ["Die Zugspitze ist der höchste Berg Deutschlands.", "Garmisch liegt an der Zugspitze."],
+        "config": {"MODE": "extract", "MAX_ENTITIES": 5}
+    }
+    ```
+    """
+    if len(payload.texts) > settings.LINKER_BATCH_MAX_TEXTS:
+        raise HTTPException(
+            status_code=400, detail=f"at most {settings.LINKER_BATCH_MAX_TEXTS} texts per batch are allowed"
+        )
+    for text in payload.texts:
+        _validate_request(LinkerRequest(text=text, config=payload.config))
+
+    from ...core import linker as linker_core
+
+    logger.info(f"Linker-Batch erhalten ({len(payload.texts)} Texte), Konfiguration: {payload.config}")
+    try:
+        results, stats = await linker_core.process_texts_batch_async(
+            texts=payload.texts,
+            mode=payload.config.MODE,
+            max_entities=payload.config.MAX_ENTITIES,
+            language=payload.config.LANGUAGE,
+            educational_mode=payload.config.EDUCATIONAL_MODE,
+            allowed_entity_types=payload.config.ALLOWED_ENTITY_TYPES,
+            wikipedia_fields=payload.config.WIKIPEDIA_FIELDS,
+        )
+    except Exception as e:
+        logger.error(f"Fehler im Linker-Batch-Endpunkt: {e!s}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    return LinkerBatchResponse(
+        results=[
+            LinkerBatchResult(**build_linker_response(text, entities).model_dump(), error=doc_stats.get("error"))
+            for text, (entities, doc_stats) in zip(payload.texts, results, strict=True)
+        ],
+        statistics=stats,
+    )
+
+
+def build_linker_response(text: str, entities: list) -> LinkerResponse:
+    """Convert core linker entities into the `/linker` response model with statistics."""
+    return LinkerResponse(
+        original_text=text,
+        entities=[to_enhanced_entity(entity) for entity in entities],
+        statistics=build_statistics(entities),
+    )
+
+
+def to_enhanced_entity(entity) -> EnhancedEntity:
+    """Convert one core linker entity into the `/linker` response format."""
+    # Create entity ID
+    entity_id = str(uuid.uuid4())
+
+    # Create EntityDetails
+    details = EntityDetails(
+        typ=entity.type,
+        citation=entity.label,
+    )
+
+    # Create WikipediaSource
+    # Determine status based on available data
+    wiki_status = "not_found"  # Default
+    if entity.wiki_url_de or entity.wiki_url_en or entity.wikidata_id:
+        wiki_status = "found"
+
+    wiki_source = WikipediaSource(
+        status=wiki_status,
+        label_de=entity.label,
+        label_en=entity.label_en,
+        url_de=entity.wiki_url_de,
+        url_en=entity.wiki_url_en,
+        extract=entity.abstract_de or entity.abstract_en,
+        categories=entity.categories,
+        internal_links=getattr(entity, "internal_links", []),
+        wikidata_id=entity.wikidata_id,
+        thumbnail_url=entity.image_url,
+        geo_lat=entity.geo_lat,
+        geo_lon=entity.geo_lon,
+        infobox_type=getattr(entity, "infobox_type", None),
+        dbpedia_uri=getattr(entity, "dbpedia_uri", None),
+        source="api",
+        needs_fallback=False,
+        fallback_attempts=0,
+    )
+
+    # Create EntitySources
+    sources = EntitySources(wikipedia=wiki_source)
+
+    # Create EnhancedEntity
+    return EnhancedEntity(entity=entity.label, details=details, sources=sources, id=entity_id)
+
+
+def build_statistics(entities: list) -> Statistics:
+    """Compute the `/linker` statistics over core linker entities."""
+    types_distribution = Counter()
+    wiki_categories_counter = Counter()
+    wiki_internal_links_counter = Counter()
+    linked_wikipedia_count = 0
+    linked_wikidata_count = 0
+
+    for entity in entities:
+        # Count types
+        types_distribution[entity.type] += 1
+
+        # Count categories for statistics
+        if entity.categories:
+            for cat in entity.categories:
+                wiki_categories_counter[cat] += 1
+
+        # Count internal links
+        for link in getattr(entity, "internal_links", None) or []:
+            wiki_internal_links_counter[link] += 1
+
+        # Track linked entities
+        if entity.wiki_url_de or entity.wiki_url_en:
+            linked_wikipedia_count += 1
+        if entity.wikidata_id:
+            linked_wikidata_count += 1
+
+    # Calculate statistics
+    total_entities = len(entities)
+
+    # Calculate percentages
+    wiki_percent = (linked_wikipedia_count / total_entities * 100) if total_entities > 0 else 0
+    wikidata_percent = (linked_wikidata_count / total_entities * 100) if total_entities > 0 else 0
+
+    # Create Statistics object
+    return Statistics(
+        total_entities=total_entities,
+        top10={
+            "wikipedia_categories": dict(wiki_categories_counter.most_common(10)),
+            "wikipedia_internal_links": dict(wiki_internal_links_counter.most_common(10)),
+        },
+        types_distribution=dict(types_distribution),
+        linked={
+            "wikipedia": {"count": linked_wikipedia_count, "percent": wiki_percent},
+            "wikidata": {"count": linked_wikidata_count, "percent": wikidata_percent},
+        },
+    )
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Literal
+from collections.abc import Awaitable, Callable
+import time
+from typing import Any, Literal
 
 from fastapi import APIRouter, HTTPException
-import httpx
 from pydantic import BaseModel, Field
 
+from ...core import pipeline as pipeline_core
+from . import compendium as compendium_api
+from . import linker as linker_api
+from . import qa as qa_api
+
 router = APIRouter(prefix="/v1", tags=["pipeline"])
 
 
@@ -19,6 +25,7 @@ class LinkerConfig(BaseModel):
     ALLOWED_ENTITY_TYPES: str | list[str] | Literal["auto"] = "auto"
     EDUCATIONAL_MODE: bool = False
     LANGUAGE: Literal["de", "en"] = "de"
+    WIKIPEDIA_FIELDS: list[Literal["categories", "coordinates", "internal_links", "thumbnail"]] | None = None
 
 
 class CompendiumConfig(BaseModel):
@@ -50,6 +57,13 @@ class PipelineConfig(BaseModel):
     linker: LinkerConfig = Field(default_factory=LinkerConfig)
     compendium: CompendiumConfig = Field(default_factory=CompendiumConfig)
     qa: QAConfig = Field(default_factory=QAConfig)
+    dependency_mode: Literal["sequential", "parallel"] = Field(
+        "sequential",
+        description=(
+            "sequential: QA is generated from the compendium; "
+            "parallel: QA is generated from the linker abstracts while the compendium is written"
+        ),
+    )
 
 
 class PipelineRequest(BaseModel):
@@ -113,6 +127,11 @@ async def pipeline_endpoint(payload: PipelineRequest) -> PipelineResponse:
     - `level_property`: Educational level property name (optional)
     - `level_values`: List of educational levels (optional)
 
+    ### Dependency Mode (`dependency_mode`):
+    - `"sequential"` (default): Linker → Compendium → QA, QA is generated from the compendium
+    - `"parallel"`: QA is generated from the original text and the linker abstracts and runs
+      concurrently with the compendium, so total latency is roughly linker + max(compendium, QA)
+
     ## Educational Level Support:
 
     ### German Bildungsstufen (Default):
@@ -162,105 +181,97 @@ async def pipeline_endpoint(payload: PipelineRequest) -> PipelineResponse:
 
     ## Performance:
     - Typical processing time: 45-90 seconds for comprehensive content
+    - All steps run in-process (no HTTP round trips to the own API)
+    - `processing_times` holds the duration of each step, `total_processing_time` the wall-clock time
     - Automatic timeout handling and error recovery
     - Detailed processing statistics and educational level distribution metrics
     """
     if not payload.text.strip():
         raise HTTPException(status_code=400, detail="text is required")
 
-    pipeline_stats = {"total_steps": 3, "completed_steps": 0, "processing_times": {}, "errors": []}
+    config = payload.config
+    pipeline_stats = {
+        "total_steps": 3,
+        "completed_steps": 0,
+        "dependency_mode": config.dependency_mode,
+        "processing_times": {},
+        "errors": [],
+    }
 
+    async def linker_stage(_inputs: dict[str, Any]) -> dict:
+        request = linker_api.LinkerRequest(
+            text=payload.text, config=linker_api.LinkerConfig(**config.linker.model_dump())
+        )
+        return (await linker_api.run_linker(request)).model_dump()
+
+    async def compendium_stage(inputs: dict[str, Any]) -> dict:
+        request = compendium_api.CompendiumRequest(
+            input_type=compendium_api.InputType.LINKER_OUTPUT,
+            linker_data=inputs["linker"],
+            config=compendium_api.CompendiumConfig(**config.compendium.model_dump()),
+        )
+        return (await compendium_api.run_compendium(request)).model_dump()
+
+    async def qa_stage(inputs: dict[str, Any]) -> dict:
+        if "compendium" in inputs:
+            qa_text = inputs["compendium"]["markdown"]
+        else:
+            qa_text = pipeline_core.create_qa_source_from_linker_data(inputs["linker"])
+
+        request = qa_api.QARequest(
+            text=qa_text,
+            num_pairs=config.qa.num_pairs,
+            max_answer_length=config.qa.max_answer_length,
+        )
+
+        # Füge Bildungsstufen-Parameter hinzu, falls konfiguriert
+        if config.qa.level_property and config.qa.level_values:
+            request.level_property = config.qa.level_property
+            request.level_values = config.qa.level_values
+
+        return (await qa_api.run_qa(request)).model_dump()
+
+    # QA either waits for the compendium or runs next to it on the linker abstracts
+    qa_depends_on = ("linker",) if config.dependency_mode == "parallel" else ("compendium",)
+    stages = [
+        pipeline_core.Stage("linker", _reported(linker_stage, "Linker", pipeline_stats)),
+        pipeline_core.Stage("compendium", _reported(compendium_stage, "Compendium", pipeline_stats), ("linker",)),
+        pipeline_core.Stage("qa", _reported(qa_stage, "QA", pipeline_stats), qa_depends_on),
+    ]
+
+    start_time = time.perf_counter()
     try:
-        # Step 1: Linker
-        import time
-
-        start_time = time.time()
-
-        async with httpx.AsyncClient() as client:
-            linker_request = {
-                "text": payload.text,
-                "config": {
-                    "MODE": payload.config.linker.MODE,
-                    "MAX_ENTITIES": payload.config.linker.MAX_ENTITIES,
-                    "ALLOWED_ENTITY_TYPES": payload.config.linker.ALLOWED_ENTITY_TYPES,
-                    "EDUCATIONAL_MODE": payload.config.linker.EDUCATIONAL_MODE,
-                    "LANGUAGE": payload.config.linker.LANGUAGE,
-                },
-            }
-
-            linker_response = await client.post(
-                "http://localhost:8000/api/v1/linker", json=linker_request, timeout=60.0
-            )
-
-            if linker_response.status_code != 200:
-                raise HTTPException(status_code=500, detail=f"Linker step failed: {linker_response.text}")
-
-            linker_output = linker_response.json()
-            pipeline_stats["processing_times"]["linker"] = time.time() - start_time
-            pipeline_stats["completed_steps"] = 1
-
-            # Step 2: Compendium
-            start_time = time.time()
-
-            compendium_request = {
-                "input_type": "linker_output",
-                "linker_data": linker_output,
-                "config": {
-                    "length": payload.config.compendium.length,
-                    "enable_citations": payload.config.compendium.enable_citations,
-                    "educational_mode": payload.config.compendium.educational_mode,
-                    "language": payload.config.compendium.language,
-                },
-            }
-
-            compendium_response = await client.post(
-                "http://localhost:8000/api/v1/compendium", json=compendium_request, timeout=120.0
-            )
-
-            if compendium_response.status_code != 200:
-                raise HTTPException(status_code=500, detail=f"Compendium step failed: {compendium_response.text}")
-
-            compendium_output = compendium_response.json()
-            pipeline_stats["processing_times"]["compendium"] = time.time() - start_time
-            pipeline_stats["completed_steps"] = 2
-
-            # Step 3: QA
-            start_time = time.time()
-
-            qa_request = {
-                "text": compendium_output["markdown"],
-                "num_pairs": payload.config.qa.num_pairs,
-                "max_answer_length": payload.config.qa.max_answer_length,
-            }
-
-            # Füge Bildungsstufen-Parameter hinzu, falls konfiguriert
-            if payload.config.qa.level_property and payload.config.qa.level_values:
-                qa_request["level_property"] = payload.config.qa.level_property
-                qa_request["level_values"] = payload.config.qa.level_values
-
-            qa_response = await client.post("http://localhost:8000/api/v1/qa", json=qa_request, timeout=60.0)
-
-            if qa_response.status_code != 200:
-                raise HTTPException(status_code=500, detail=f"QA step failed: {qa_response.text}")
-
-            qa_output = qa_response.json()
-            pipeline_stats["processing_times"]["qa"] = time.time() - start_time
-            pipeline_stats["completed_steps"] = 3
-
-            # Calculate total processing time
-            pipeline_stats["total_processing_time"] = sum(pipeline_stats["processing_times"].values())
-
-            return PipelineResponse(
-                original_text=payload.text,
-                linker_output=linker_output,
-                compendium_output=compendium_output,
-                qa_output=qa_output,
-                pipeline_statistics=pipeline_stats,
-            )
-
-    except httpx.RequestError as e:
-        pipeline_stats["errors"].append(f"Network error: {e!s}")
-        raise HTTPException(status_code=503, detail=f"Pipeline communication error: {e!s}")
+        results, timings = await pipeline_core.run_stages(stages)
+    except HTTPException:
+        raise
     except Exception as e:
         pipeline_stats["errors"].append(f"Unexpected error: {e!s}")
-        raise HTTPException(status_code=500, detail=f"Pipeline execution failed: {e!s}")
+        raise HTTPException(status_code=500, detail=f"Pipeline execution failed: {e!s}") from e
+
+    pipeline_stats["processing_times"] = timings
+    pipeline_stats["completed_steps"] = len(timings)
+    # Wall-clock time; lower than the sum of the stage times when stages overlap
+    pipeline_stats["total_processing_time"] = time.perf_counter() - start_time
+
+    return PipelineResponse(
+        original_text=payload.text,
+        linker_output=results["linker"],
+        compendium_output=results["compendium"],
+        qa_output=results["qa"],
+        pipeline_statistics=pipeline_stats,
+    )
+
+
+def _reported(
+    run: Callable[[dict[str, Any]], Awaitable[Any]], label: str, pipeline_stats: dict
+) -> Callable[[dict[str, Any]], Awaitable[Any]]:
+    """Wrap a stage so that API errors surface as '<Stage> step failed'."""
+
+    async def _run(inputs: dict[str, Any]) -> Any:
+        try:
+            return await run(inputs)
+        except HTTPException as e:
+            pipeline_stats["errors"].append(f"{label}: {e.detail}")
+            raise HTTPException(status_code=500, detail=f"{label} step failed: {e.detail}") from e
+
+    return _run
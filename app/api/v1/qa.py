@@ -101,6 +101,11 @@ async def qa_endpoint(payload: QARequest) -> QAResponse:
     }
     ```
     """
+    return await run_qa(payload)
+
+
+async def run_qa(payload: QARequest) -> QAResponse:
+    """Generate QA pairs for *payload* in-process (shared by `/qa` and `/pipeline`)."""
     if not payload.text.strip():
         raise HTTPException(status_code=400, detail="text required")
 
@@ -110,7 +115,7 @@ async def qa_endpoint(payload: QARequest) -> QAResponse:
         # Prüfe ob Bildungsstufen-Konfiguration vollständig ist
         if payload.level_property and payload.level_values:
             # Generiere QA-Paare mit Bildungsstufen-Verteilung
-            pairs_with_levels = qa_core.generate_qa_pairs_with_levels(
+            pairs_with_levels = await qa_core.generate_qa_pairs_with_levels_async(
                 payload.text,
                 payload.num_pairs,
                 max_chars=payload.max_answer_length,
@@ -128,7 +133,9 @@ async def qa_endpoint(payload: QARequest) -> QAResponse:
             ]
         else:
             # Standard QA-Generierung ohne Bildungsstufen
-            pairs = qa_core.generate_qa_pairs(payload.text, payload.num_pairs, max_chars=payload.max_answer_length)
+            pairs = await qa_core.generate_qa_pairs_async(
+                payload.text, payload.num_pairs, max_chars=payload.max_answer_length
+            )
             qa_pairs = [QAPair(question=q, answer=a) for q, a in pairs]
 
         return QAResponse(original_text=payload.text, qa=qa_pairs)
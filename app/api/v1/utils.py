@@ -140,7 +140,7 @@ async def synonym_endpoint(payload: SynonymRequest) -> SynonymResponse:
 
     Returns a list of synonyms ordered by relevance and contextual appropriateness.
     """
-    synonyms = utils_core.generate_synonyms(payload.word, payload.max_synonyms, lang=payload.lang)
+    synonyms = await utils_core.generate_synonyms_async(payload.word, payload.max_synonyms, lang=payload.lang)
     return SynonymResponse(synonyms=synonyms)
 
 
@@ -194,5 +194,5 @@ async def translate_endpoint(payload: TranslateRequest) -> TranslateResponse:
 
     Returns the translated text maintaining the original meaning and context as accurately as possible.
     """
-    translation = utils_core.translate(payload.text, payload.target_lang)
+    translation = await utils_core.translate_async(payload.text, payload.target_lang)
     return TranslateResponse(translation=translation)
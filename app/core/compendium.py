@@ -6,6 +6,8 @@ with numbered bibliography. Integrates with OpenAI for content generation.
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+
 from loguru import logger
 
 from .compendium_prompts import (
@@ -14,7 +16,17 @@ from .compendium_prompts import (
     get_system_prompt_summary_de,
     get_system_prompt_summary_en,
 )
+from .llm_cache import complete, complete_async
 from .settings import settings
+from .token_budget import (
+    BudgetedContext,
+    Snippet,
+    count_message_tokens,
+    count_tokens,
+    counter_name,
+    fit_snippets,
+    truncate_to_tokens,
+)
 
 try:
     import openai  # type: ignore
@@ -23,6 +35,7 @@ except ImportError as exc:  # pragma: no cover – handled at runtime
     logger.warning("openai package not installed: %s", exc)
 
 MODEL_NAME: str = settings.OPENAI_MODEL
+_CONTEXT_HEADER = "\n\nKontext:\n"
 
 
 def extract_topic_from_text(text: str) -> str:
@@ -78,10 +91,11 @@ def extract_references_from_linker_data(linker_data: dict) -> list[str]:
     return unique_refs
 
 
-def create_entity_context(linker_data: dict) -> str:
-    """Create context text from entity extracts for compendium generation."""
-    context_parts = []
+def _entity_snippets(linker_data: dict) -> list[Snippet]:
+    """One snippet per entity extract, prioritized by how often the entity occurs in the original text."""
+    snippets = []
     entities = linker_data.get("entities", [])
+    original_text = linker_data.get("original_text", "").casefold()
 
     for entity in entities:
         entity_name = entity.get("entity", "")
@@ -90,9 +104,27 @@ def create_entity_context(linker_data: dict) -> str:
         extract = wikipedia.get("extract", "")
 
         if entity_name and extract:
-            context_parts.append(f"**{entity_name}**: {extract}")
+            priority = original_text.count(entity_name.casefold())
+            snippets.append(Snippet(f"**{entity_name}**: {extract}", priority))
+
+    return snippets
+
+
+def budget_entity_context(linker_data: dict, max_tokens: int) -> BudgetedContext:
+    """
+    Create the entity context within *max_tokens* tokens.
+
+    Entities mentioned most often in the original text are kept first; the
+    extract that no longer fits is shortened and the remaining ones are left out.
+    """
+    return fit_snippets(_entity_snippets(linker_data), max_tokens)
 
-    return "\n\n".join(context_parts)
+
+def create_entity_context(linker_data: dict, max_tokens: int | None = None) -> str:
+    """Create context text from entity extracts for compendium generation (limited to *max_tokens* if given)."""
+    if max_tokens is not None:
+        return budget_entity_context(linker_data, max_tokens).text
+    return "\n\n".join(snippet.text for snippet in _entity_snippets(linker_data))
 
 
 def create_bibliography(references: list[str]) -> str:
@@ -115,100 +147,267 @@ def _ensure_ready():
         raise RuntimeError("OPENAI_API_KEY not configured")
 
 
+def _system_prompt(topic: str, references: list[str], config) -> str:
+    # Choose appropriate prompt based on language and educational mode
+    if config.language == "de":
+        if config.educational_mode:
+            system_prompt = get_system_prompt_compendium_de(
+                topic, config.length, references, educational=True, enable_citations=config.enable_citations
+            )
+        else:
+            system_prompt = get_system_prompt_summary_de(topic, config.length, references)
+    else:
+        if config.educational_mode:
+            system_prompt = get_system_prompt_compendium_en(
+                topic, config.length, references, educational=True, enable_citations=config.enable_citations
+            )
+        else:
+            system_prompt = get_system_prompt_summary_en(topic, config.length, references)
+    return system_prompt
+
+
+def _messages(topic: str, context: str, references: list[str], config) -> list[dict[str, str]]:
+    system_prompt = _system_prompt(topic, references, config)
+
+    # Prepare user message with context
+    user_message = f"Thema: {topic}{_CONTEXT_HEADER}{context}" if context else f"Thema: {topic}"
+
+    return [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_message}]
+
+
+def _compendium_request(topic: str, context: str, references: list[str], config) -> dict:
+    """Build the ChatCompletion arguments for a compendium."""
+    messages = _messages(topic, context, references, config)
+
+    logger.debug(f"Generating compendium for topic: {topic}")
+    logger.debug(f"System prompt length: {len(messages[0]['content'])}")
+    logger.debug(f"User message length: {len(messages[1]['content'])}")
+
+    return {
+        "model": MODEL_NAME,
+        "messages": messages,
+        "temperature": 0.7,
+        "max_tokens": 4000,
+        "timeout": settings.OPENAI_TIMEOUT,
+    }
+
+
+def _generation_error(e: Exception) -> str:
+    logger.error(f"Error generating compendium with OpenAI: {e}")
+    return f"# Fehler bei der Generierung\n\nEs ist ein Fehler aufgetreten: {e!s}"
+
+
 def generate_compendium_with_openai(topic: str, context: str, references: list[str], config) -> str:
     """Generate compendium using OpenAI."""
     try:
         _ensure_ready()
-
-        # Choose appropriate prompt based on language and educational mode
-        if config.language == "de":
-            if config.educational_mode:
-                system_prompt = get_system_prompt_compendium_de(
-                    topic, config.length, references, educational=True, enable_citations=config.enable_citations
-                )
-            else:
-                system_prompt = get_system_prompt_summary_de(topic, config.length, references)
-        else:
-            if config.educational_mode:
-                system_prompt = get_system_prompt_compendium_en(
-                    topic, config.length, references, educational=True, enable_citations=config.enable_citations
-                )
-            else:
-                system_prompt = get_system_prompt_summary_en(topic, config.length, references)
-
-        # Prepare user message with context
-        user_message = f"Thema: {topic}\n\nKontext:\n{context}" if context else f"Thema: {topic}"
-
-        logger.debug(f"Generating compendium for topic: {topic}")
-        logger.debug(f"System prompt length: {len(system_prompt)}")
-        logger.debug(f"User message length: {len(user_message)}")
-
-        response = openai.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_message}],
-            temperature=0.7,
-            max_tokens=4000,
-            timeout=settings.OPENAI_TIMEOUT,
+        return complete(
+            "compendium",
+            _compendium_request(topic, context, references, config),
+            openai.chat.completions.create,
+            str.strip,
         )
+    except Exception as e:
+        return _generation_error(e)
 
-        return response.choices[0].message.content.strip()
 
+async def generate_compendium_with_openai_async(topic: str, context: str, references: list[str], config) -> str:
+    """Async variant of :func:`generate_compendium_with_openai` using the shared client."""
+    from .openai_wrapper import get_async_client
+
+    try:
+        client = get_async_client()
+        return await complete_async(
+            "compendium",
+            _compendium_request(topic, context, references, config),
+            client.chat.completions.create,
+            str.strip,
+        )
     except Exception as e:
-        logger.error(f"Error generating compendium with OpenAI: {e}")
-        return f"# Fehler bei der Generierung\n\nEs ist ein Fehler aufgetreten: {e!s}"
+        return _generation_error(e)
 
 
-def generate_compendium_from_text(text: str, config) -> tuple[str, str, dict]:
-    """Generate compendium from raw text input."""
+def _context_budget(topic: str, references: list[str], config) -> int:
+    """Tokens left for the context once the system prompt and the rest of the user message are counted."""
+    fixed = count_message_tokens(_messages(topic, "", references, config)) + count_tokens(_CONTEXT_HEADER)
+    return max(0, settings.COMPENDIUM_PROMPT_TOKEN_BUDGET - fixed)
+
+
+def _token_statistics(topic: str, context: BudgetedContext, references: list[str], config) -> dict:
+    return {
+        "counter": counter_name(),
+        "prompt_budget": settings.COMPENDIUM_PROMPT_TOKEN_BUDGET,
+        "prompt_tokens": count_message_tokens(_messages(topic, context.text, references, config)),
+        **context.to_stats(),
+    }
+
+
+def _prepare_from_text(text: str, config) -> tuple[str, str, list[str], dict]:
+    """Return (topic, context, references, token statistics) for raw text input."""
     topic = extract_topic_from_text(text)
 
     # For text input, we don't have Wikipedia references
     references = []
-    context = text
-
-    # Generate compendium
-    markdown = generate_compendium_with_openai(topic, context, references, config)
-    bibliography = create_bibliography(references)
-
-    statistics = {
+    budget = _context_budget(topic, references, config)
+    context = truncate_to_tokens(text, budget)
+    if context != text:
+        logger.info(f"Compendium input text shortened to the prompt budget of {budget} context tokens")
+    budgeted = BudgetedContext(
+        context, count_tokens(context), budget, included=int(bool(context)), trimmed=int(context != text)
+    )
+    return topic, context, references, _token_statistics(topic, budgeted, references, config)
+
+
+def _text_statistics(text: str, topic: str, output_length: int, references: list[str], config, tokens: dict) -> dict:
+    return {
         "topic": topic,
         "input_type": "text",
         "input_length": len(text),
-        "output_length": len(markdown),
+        "output_length": output_length,
         "references_count": len(references),
         "educational_mode": config.educational_mode,
         "citations_enabled": config.enable_citations,
+        "tokens": tokens,
     }
 
-    return markdown, bibliography, statistics
-
 
-def generate_compendium(linker_data: dict, config) -> tuple[str, str, dict]:
-    """Generate compendium from linker output data."""
+def _prepare_from_linker_data(linker_data: dict, config) -> tuple[str, str, list[str], dict]:
+    """Return (topic, context, references, token statistics) for linker output."""
     topic = extract_topic_from_linker_data(linker_data)
     references = extract_references_from_linker_data(linker_data)
-    context = create_entity_context(linker_data)
+    budget = _context_budget(topic, references, config)
 
-    # Add original text to context if available
+    # Add original text to context if available; it may take up to half of the budget
     original_text = linker_data.get("original_text", "")
+    prefix = ""
     if original_text:
-        context = f"Originaltext: {original_text}\n\nEntity-Informationen:\n{context}"
-
-    # Generate compendium
-    markdown = generate_compendium_with_openai(topic, context, references, config)
-    bibliography = create_bibliography(references)
-
-    statistics = {
+        original_text = truncate_to_tokens(original_text, budget // 2)
+        prefix = f"Originaltext: {original_text}\n\nEntity-Informationen:\n"
+
+    entity_context = budget_entity_context(linker_data, max(0, budget - count_tokens(prefix)))
+    if entity_context.trimmed or entity_context.dropped:
+        logger.info(
+            f"Compendium context fitted to {budget} tokens: {entity_context.trimmed} entity extracts shortened, "
+            f"{entity_context.dropped} left out"
+        )
+    context = prefix + entity_context.text
+    budgeted = BudgetedContext(
+        context,
+        count_tokens(context),
+        budget,
+        included=entity_context.included,
+        trimmed=entity_context.trimmed,
+        dropped=entity_context.dropped,
+    )
+    return topic, context, references, _token_statistics(topic, budgeted, references, config)
+
+
+def _linker_statistics(
+    linker_data: dict, topic: str, output_length: int, references: list[str], config, tokens: dict
+) -> dict:
+    return {
         "topic": topic,
         "input_type": "linker_output",
         "entities_count": len(linker_data.get("entities", [])),
-        "output_length": len(markdown),
+        "output_length": output_length,
         "references_count": len(references),
         "educational_mode": config.educational_mode,
         "citations_enabled": config.enable_citations,
+        "tokens": tokens,
     }
 
-    return markdown, bibliography, statistics
+
+def generate_compendium_from_text(text: str, config) -> tuple[str, str, dict]:
+    """Generate compendium from raw text input."""
+    topic, context, references, tokens = _prepare_from_text(text, config)
+
+    # Generate compendium
+    markdown = generate_compendium_with_openai(topic, context, references, config)
+    bibliography = create_bibliography(references)
+
+    return markdown, bibliography, _text_statistics(text, topic, len(markdown), references, config, tokens)
+
+
+async def generate_compendium_from_text_async(text: str, config) -> tuple[str, str, dict]:
+    """Async variant of :func:`generate_compendium_from_text`."""
+    topic, context, references, tokens = _prepare_from_text(text, config)
+
+    markdown = await generate_compendium_with_openai_async(topic, context, references, config)
+    bibliography = create_bibliography(references)
+
+    return markdown, bibliography, _text_statistics(text, topic, len(markdown), references, config, tokens)
+
+
+def generate_compendium(linker_data: dict, config) -> tuple[str, str, dict]:
+    """Generate compendium from linker output data."""
+    topic, context, references, tokens = _prepare_from_linker_data(linker_data, config)
+
+    # Generate compendium
+    markdown = generate_compendium_with_openai(topic, context, references, config)
+    bibliography = create_bibliography(references)
+
+    return markdown, bibliography, _linker_statistics(linker_data, topic, len(markdown), references, config, tokens)
+
+
+async def generate_compendium_async(linker_data: dict, config) -> tuple[str, str, dict]:
+    """Async variant of :func:`generate_compendium`."""
+    topic, context, references, tokens = _prepare_from_linker_data(linker_data, config)
+
+    markdown = await generate_compendium_with_openai_async(topic, context, references, config)
+    bibliography = create_bibliography(references)
+
+    return markdown, bibliography, _linker_statistics(linker_data, topic, len(markdown), references, config, tokens)
+
+
+async def stream_compendium_with_openai(topic: str, context: str, references: list[str], config) -> AsyncIterator[str]:
+    """Stream the compendium markdown from OpenAI chunk by chunk."""
+    from .openai_wrapper import get_async_client
+
+    client = get_async_client()
+    stream = await client.chat.completions.create(
+        **_compendium_request(topic, context, references, config), stream=True
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def stream_compendium(
+    config, *, text: str | None = None, linker_data: dict | None = None
+) -> AsyncIterator[tuple[str, object]]:
+    """
+    Generate a compendium as a stream of events.
+
+    Yields ``("chunk", str)`` for every markdown fragment as it arrives, then
+    ``("bibliography", str)`` and finally ``("statistics", dict)``. If generation
+    fails midway, an ``("error", str)`` event is yielded instead of the remaining ones.
+    The markdown is never accumulated; only its length is tracked for the statistics.
+
+    Args:
+        config: Compendium configuration
+        text: Raw text input (used when *linker_data* is not given)
+        linker_data: Linker output
+    """
+    if linker_data is not None:
+        topic, context, references, tokens = _prepare_from_linker_data(linker_data, config)
+    else:
+        topic, context, references, tokens = _prepare_from_text(text or "", config)
+
+    output_length = 0
+    try:
+        async for fragment in stream_compendium_with_openai(topic, context, references, config):
+            output_length += len(fragment)
+            yield "chunk", fragment
+    except Exception as e:
+        logger.error(f"Error streaming compendium with OpenAI: {e}")
+        yield "error", str(e)
+        return
+
+    yield "bibliography", create_bibliography(references)
+    if linker_data is not None:
+        yield "statistics", _linker_statistics(linker_data, topic, output_length, references, config, tokens)
+    else:
+        yield "statistics", _text_statistics(text or "", topic, output_length, references, config, tokens)
 
 
 # Legacy function for backward compatibility
@@ -1,12 +1,22 @@
 import asyncio
-from typing import Literal
+from collections.abc import AsyncIterator
+import copy
+import time
+from typing import Any, Literal
 
 from loguru import logger
 
-from app.core.openai_wrapper import extract_entities, generate_entities
+from app.core.openai_wrapper import extract_entities_async, generate_entities_async
+from app.core.settings import settings
+from app.core.utils import split_text
 from app.models.entity import Entity
 from app.models.entity_processing_context import EntityProcessingContext
+from app.services.wikipedia.cache import normalize_title
+from app.services.wikipedia.models import WikiPage
 from app.services.wikipedia.service import WikipediaService
+from app.services.wikipedia.utils.data_processor import WikipediaDataProcessor
+
+_FOUND_STATUSES = ("found", "found_from_prompt")
 
 
 async def process_text_async(
@@ -16,6 +26,7 @@ async def process_text_async(
     language: Literal["de", "en"] = "de",
     educational_mode: bool = False,
     allowed_entity_types: str | list[str] = "auto",
+    wikipedia_fields: list[str] | None = None,
 ) -> tuple[list[Entity], dict]:
     """
     Process text to extract entities and link them with Wikipedia data.
@@ -27,6 +38,8 @@ async def process_text_async(
         language: Target language for Wikipedia data
         educational_mode: Enable educational perspective (only for generate mode)
         allowed_entity_types: Restrict entity types (string, list, or "auto")
+        wikipedia_fields: Optional Wikipedia fields to fetch (categories, coordinates,
+            internal_links, thumbnail); None fetches all
 
     Returns:
         Tuple of (entities list, statistics dict)
@@ -56,37 +69,13 @@ async def process_text_async(
         # Step 2: Fetch Wikipedia data with prompt fallbacks
         logger.info(f"Fetching Wikipedia data for {len(contexts)} entities with prompt fallbacks")
 
-        async with WikipediaService() as wiki_service:
-            # Process each entity individually with prompt metadata
-            for ctx in contexts:
-                # Create metadata from context for prompt fallback
-                prompt_metadata = {
-                    "label_de": ctx.label,  # Use extracted label as German fallback
-                    "label_en": "",  # Will be filled by Wikipedia if available
-                    "wiki_url_de": "",  # Will be generated if Wikipedia data found
-                    "wiki_url_en": "",  # Will be generated if Wikipedia data found
-                }
-
-                # Add any existing metadata
-                if hasattr(ctx, "metadata") and ctx.metadata:
-                    prompt_metadata.update(ctx.metadata)
-
-                # Process entity with fallbacks
-                processed_ctx = await wiki_service.process_entity(
-                    EntityProcessingContext(label=ctx.label, type=ctx.type, metadata=prompt_metadata)
-                )
-
-                # Update original context with Wikipedia data
-                ctx.wikipedia_data = processed_ctx.wikipedia_data
-
-                if processed_ctx.wikipedia_data and processed_ctx.wikipedia_data.get("status") in [
-                    "found",
-                    "found_from_prompt",
-                ]:
-                    stats["wikipedia_pages_fetched"] += 1
-                    logger.debug(f"Successfully processed entity '{ctx.label}' with Wikipedia data")
-                else:
-                    logger.debug(f"No Wikipedia data found for entity '{ctx.label}'")
+        resolution_start = time.perf_counter()
+        async with WikipediaService(fields=wikipedia_fields) as wiki_service:
+            entity_timings = await _resolve_contexts(wiki_service, contexts)
+
+        stats["wikipedia_pages_fetched"] = sum(1 for timing in entity_timings if timing["status"] in _FOUND_STATUSES)
+        stats["resolution_seconds"] = round(time.perf_counter() - resolution_start, 3)
+        stats["entity_timings"] = entity_timings
 
         # Step 3: Convert contexts to Entity objects
         for ctx in contexts:
@@ -103,16 +92,272 @@ async def process_text_async(
         raise
 
 
+async def process_text_stream(
+    text: str,
+    mode: Literal["extract", "generate"] = "extract",
+    max_entities: int = 10,
+    language: Literal["de", "en"] = "de",
+    educational_mode: bool = False,
+    allowed_entity_types: str | list[str] = "auto",
+    wikipedia_fields: list[str] | None = None,
+) -> AsyncIterator[tuple[str, Any]]:
+    """
+    Streaming variant of :func:`process_text_async`.
+
+    Yields ``("entity", (index, Entity))`` as soon as the Wikipedia resolution of an
+    entity completes (in completion order; *index* is its position in the extraction
+    order), followed by one ``("statistics", stats)`` event.
+
+    Args:
+        text: Input text to process
+        mode: Processing mode (extract, generate)
+        max_entities: Maximum number of entities to extract
+        language: Target language for Wikipedia data
+        educational_mode: Enable educational perspective (only for generate mode)
+        allowed_entity_types: Restrict entity types (string, list, or "auto")
+        wikipedia_fields: Optional Wikipedia fields to fetch (categories, coordinates,
+            internal_links, thumbnail); None fetches all
+    """
+    stats = {
+        "entities_extracted": 0,
+        "wikipedia_pages_fetched": 0,
+        "entities_linked": 0,
+    }
+
+    contexts = await _extract_or_generate_entities(text, mode, max_entities, educational_mode, allowed_entity_types)
+    stats["entities_extracted"] = len(contexts)
+    logger.info(f"Extracted {len(contexts)} entities (streaming)")
+
+    if contexts:
+        entity_timings: list[dict] = [{}] * len(contexts)
+        resolution_start = time.perf_counter()
+        async with WikipediaService(fields=wikipedia_fields) as wiki_service:
+            async for index, timing in _resolve_contexts_as_completed(wiki_service, contexts):
+                entity_timings[index] = timing
+                entity = _context_to_entity(contexts[index], language)
+                if entity.status == "linked":
+                    stats["entities_linked"] += 1
+                yield "entity", (index, entity)
+
+        stats["wikipedia_pages_fetched"] = sum(1 for timing in entity_timings if timing["status"] in _FOUND_STATUSES)
+        stats["resolution_seconds"] = round(time.perf_counter() - resolution_start, 3)
+        stats["entity_timings"] = entity_timings
+
+    yield "statistics", stats
+
+
+async def process_texts_batch_async(
+    texts: list[str],
+    mode: Literal["extract", "generate"] = "extract",
+    max_entities: int = 10,
+    language: Literal["de", "en"] = "de",
+    educational_mode: bool = False,
+    allowed_entity_types: str | list[str] = "auto",
+    wikipedia_fields: list[str] | None = None,
+) -> tuple[list[tuple[list[Entity], dict]], dict]:
+    """
+    Process many texts at once, resolving each distinct entity label only once.
+
+    Entities are extracted per text (concurrently, bounded by
+    settings.LINKER_BATCH_EXTRACTION_CONCURRENCY). Labels are then deduplicated across the
+    whole batch and resolved in one WikipediaService session before the results are
+    distributed back to the documents. A failing extraction only affects its own document.
+
+    Args:
+        texts: Input texts to process
+        mode: Processing mode (extract, generate)
+        max_entities: Maximum number of entities to extract per text
+        language: Target language for Wikipedia data
+        educational_mode: Enable educational perspective (only for generate mode)
+        allowed_entity_types: Restrict entity types (string, list, or "auto")
+        wikipedia_fields: Optional Wikipedia fields to fetch (categories, coordinates,
+            internal_links, thumbnail); None fetches all
+
+    Returns:
+        Tuple of (per-text (entities, stats) in input order, batch statistics)
+    """
+    logger.info(f"Processing batch of {len(texts)} texts with mode='{mode}', max_entities={max_entities}")
+
+    semaphore = asyncio.Semaphore(settings.LINKER_BATCH_EXTRACTION_CONCURRENCY)
+
+    async def _extract(text: str) -> list[EntityProcessingContext]:
+        async with semaphore:
+            return await _extract_or_generate_entities(text, mode, max_entities, educational_mode, allowed_entity_types)
+
+    extracted = await asyncio.gather(*(_extract(text) for text in texts), return_exceptions=True)
+
+    doc_contexts: list[list[EntityProcessingContext]] = []
+    doc_stats: list[dict] = []
+    for index, result in enumerate(extracted):
+        stats = {"entities_extracted": 0, "wikipedia_pages_fetched": 0, "entities_linked": 0}
+        if isinstance(result, BaseException):
+            logger.error(f"Entity extraction failed for batch document {index}: {result}")
+            stats["error"] = str(result)
+            result = []
+        stats["entities_extracted"] = len(result)
+        doc_contexts.append(result)
+        doc_stats.append(stats)
+
+    # Deduplicate labels across the batch; the first occurrence is resolved for everybody
+    unique: dict[str, EntityProcessingContext] = {}
+    for contexts in doc_contexts:
+        for ctx in contexts:
+            unique.setdefault(normalize_title(ctx.label), ctx)
+
+    total_labels = sum(len(contexts) for contexts in doc_contexts)
+    logger.info(f"Resolving {len(unique)} distinct labels for {total_labels} extracted entities")
+
+    resolution_start = time.perf_counter()
+    entity_timings: list[dict] = []
+    if unique:
+        async with WikipediaService(fields=wikipedia_fields) as wiki_service:
+            entity_timings = await _resolve_contexts(wiki_service, list(unique.values()))
+    resolution_seconds = round(time.perf_counter() - resolution_start, 3)
+
+    results = []
+    for contexts, stats in zip(doc_contexts, doc_stats, strict=True):
+        entities = []
+        for ctx in contexts:
+            resolved = unique[normalize_title(ctx.label)]
+            if resolved is not ctx:
+                ctx.wikipedia_data = copy.deepcopy(resolved.wikipedia_data)
+            entities.append(_context_to_entity(ctx, language))
+
+        stats["wikipedia_pages_fetched"] = sum(
+            1 for ctx in contexts if (ctx.wikipedia_data or {}).get("status") in _FOUND_STATUSES
+        )
+        stats["entities_linked"] = len([e for e in entities if e.status == "linked"])
+        results.append((entities, stats))
+
+    batch_stats = {
+        "documents": len(texts),
+        "failed_documents": sum(1 for stats in doc_stats if "error" in stats),
+        "entities_extracted": total_labels,
+        "unique_labels": len(unique),
+        "wikipedia_pages_fetched": sum(1 for timing in entity_timings if timing["status"] in _FOUND_STATUSES),
+        "resolution_seconds": resolution_seconds,
+    }
+    logger.info(f"Batch processing complete: {batch_stats}")
+    return results, batch_stats
+
+
+async def _resolve_contexts(
+    wiki_service: WikipediaService,
+    contexts: list[EntityProcessingContext],
+    concurrency: int | None = None,
+) -> list[dict]:
+    """
+    Resolve all contexts against Wikipedia with bounded concurrency.
+
+    Contexts are updated in place; the returned timings keep the input order.
+
+    Args:
+        wiki_service: Open Wikipedia service shared by all entities
+        contexts: Entity contexts to resolve
+        concurrency: Max entities in flight (defaults to settings.LINKER_ENTITY_CONCURRENCY)
+
+    Returns:
+        List of per-entity timing dicts (label, status, seconds)
+    """
+    timings: list[dict] = [{}] * len(contexts)
+    async for index, timing in _resolve_contexts_as_completed(wiki_service, contexts, concurrency):
+        timings[index] = timing
+    return timings
+
+
+async def _resolve_contexts_as_completed(
+    wiki_service: WikipediaService,
+    contexts: list[EntityProcessingContext],
+    concurrency: int | None = None,
+) -> AsyncIterator[tuple[int, dict]]:
+    """
+    Resolve all contexts concurrently and yield (index, timing) as each one finishes.
+
+    Resolutions still running when the consumer stops iterating are cancelled.
+    """
+    # One batched query answers the direct lookup of every entity; only misses run the fallback chain
+    prefetched = await wiki_service.prefetch_direct([ctx.label for ctx in contexts])
+    if prefetched:
+        # Misses share one batched variation query; those still unresolved share one synonym LLM call
+        wiki_service.prefetch_synonyms(prefetched)
+
+    semaphore = asyncio.Semaphore(concurrency or settings.LINKER_ENTITY_CONCURRENCY)
+
+    async def _indexed(index: int, ctx: EntityProcessingContext) -> tuple[int, dict]:
+        return index, await _resolve_entity(wiki_service, ctx, semaphore, prefetched)
+
+    tasks = [asyncio.create_task(_indexed(index, ctx)) for index, ctx in enumerate(contexts)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _resolve_entity(
+    wiki_service: WikipediaService,
+    ctx: EntityProcessingContext,
+    semaphore: asyncio.Semaphore,
+    prefetched: dict[str, WikiPage | None] | None = None,
+) -> dict:
+    """Resolve a single context; failures are isolated to this entity."""
+    prefetched = prefetched or {}
+    # Create metadata from context for prompt fallback
+    prompt_metadata = {
+        "label_de": ctx.label,  # Use extracted label as German fallback
+        "label_en": "",  # Will be filled by Wikipedia if available
+        "wiki_url_de": "",  # Will be generated if Wikipedia data found
+        "wiki_url_en": "",  # Will be generated if Wikipedia data found
+    }
+
+    # Add any existing metadata
+    if hasattr(ctx, "metadata") and ctx.metadata:
+        prompt_metadata.update(ctx.metadata)
+
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            # Process entity with fallbacks
+            processed_ctx = await wiki_service.process_entity(
+                EntityProcessingContext(label=ctx.label, type=ctx.type, metadata=prompt_metadata),
+                prefetched=prefetched.get(ctx.label),
+                skip_direct=ctx.label in prefetched,
+            )
+            ctx.wikipedia_data = processed_ctx.wikipedia_data
+        except Exception as e:
+            logger.error(f"Wikipedia resolution failed for entity '{ctx.label}': {e}")
+            ctx.wikipedia_data = WikipediaDataProcessor.create_empty_wikipedia_data(ctx.label, "error", str(e))
+        elapsed = time.perf_counter() - start
+
+    status = (ctx.wikipedia_data or {}).get("status", "not_found")
+    if status in _FOUND_STATUSES:
+        logger.debug(f"Successfully processed entity '{ctx.label}' with Wikipedia data ({elapsed:.2f}s)")
+    else:
+        logger.debug(f"No Wikipedia data found for entity '{ctx.label}' ({elapsed:.2f}s)")
+
+    return {
+        "label": ctx.label,
+        "status": status,
+        "resolved_by": (ctx.wikipedia_data or {}).get("resolved_by"),
+        "seconds": round(elapsed, 3),
+    }
+
+
 async def _extract_or_generate_entities(
     text: str, mode: str, max_entities: int, educational_mode: bool, allowed_entity_types: str | list[str]
 ) -> list[EntityProcessingContext]:
     """Extract or generate entities based on mode."""
     raw_entities = []
 
-    if mode == "extract":
-        raw_entities = extract_entities(text, max_entities=max_entities, allowed_entity_types=allowed_entity_types)
+    if mode == "extract" and len(text) > settings.TEXT_SPLIT_THRESHOLD:
+        return await _extract_entities_chunked(text, max_entities, allowed_entity_types)
+    elif mode == "extract":
+        raw_entities = await extract_entities_async(
+            text, max_entities=max_entities, allowed_entity_types=allowed_entity_types
+        )
     elif mode == "generate":
-        raw_entities = generate_entities(
+        raw_entities = await generate_entities_async(
             text,
             max_entities=max_entities,
             educational_mode=educational_mode,
@@ -131,6 +376,73 @@ async def _extract_or_generate_entities(
     return contexts
 
 
+async def _extract_entities_chunked(
+    text: str, max_entities: int, allowed_entity_types: str | list[str]
+) -> list[EntityProcessingContext]:
+    """
+    Extract entities from a long text chunk by chunk and merge the results.
+
+    The text is split with :func:`split_text` (settings.TEXT_CHUNK_SIZE) and the chunks
+    are extracted concurrently, bounded by settings.LINKER_CHUNK_EXTRACTION_CONCURRENCY.
+    Entities are deduplicated by normalized label; the first mention keeps its type and
+    metadata, and ``metadata`` records ``mentions`` (case-insensitive occurrences of the
+    extracted labels in the text, at least the number of chunks naming the entity),
+    ``chunks`` (indices of the chunks naming it) and ``offset`` (first position in the
+    text, None if the label does not occur verbatim). The most frequently mentioned
+    entities are kept, in order of appearance. Failing chunks are skipped unless every
+    chunk fails.
+    """
+    chunks = split_text(text, settings.TEXT_CHUNK_SIZE)
+    logger.info(f"Extracting entities from {len(chunks)} chunks of a {len(text)} character text")
+
+    semaphore = asyncio.Semaphore(settings.LINKER_CHUNK_EXTRACTION_CONCURRENCY)
+
+    async def _extract(chunk: str) -> list[tuple[str, str, dict[str, Any]]]:
+        async with semaphore:
+            return await extract_entities_async(
+                chunk, max_entities=max_entities, allowed_entity_types=allowed_entity_types
+            )
+
+    results = await asyncio.gather(*(_extract(chunk) for chunk in chunks), return_exceptions=True)
+    failures = [result for result in results if isinstance(result, BaseException)]
+    if failures and len(failures) == len(results):
+        raise failures[0]
+    if failures:
+        logger.warning(f"Entity extraction failed for {len(failures)} of {len(chunks)} chunks")
+
+    merged: dict[str, EntityProcessingContext] = {}
+    surface_forms: dict[str, set[str]] = {}
+    extracted = 0
+    for index, result in enumerate(results):
+        if isinstance(result, BaseException):
+            continue
+        extracted += len(result)
+        for label, entity_type, metadata in result:
+            key = normalize_title(label)
+            ctx = merged.get(key)
+            if ctx is None:
+                position = text.find(label)
+                ctx = EntityProcessingContext(label=label, type=entity_type, metadata=dict(metadata or {}))
+                ctx.metadata.update({"chunks": [], "offset": position if position >= 0 else None})
+                merged[key] = ctx
+            surface_forms.setdefault(key, set()).add(label.casefold())
+            if index not in ctx.metadata["chunks"]:
+                ctx.metadata["chunks"].append(index)
+
+    # Count real occurrences in the text; a label the LLM reworded counts once per chunk naming it
+    folded = text.casefold()
+    for key, ctx in merged.items():
+        occurrences = sum(folded.count(form) for form in surface_forms[key] if form)
+        ctx.metadata["mentions"] = max(occurrences, len(ctx.metadata["chunks"]))
+
+    # Keep the most frequently mentioned entities, listed in order of appearance
+    ranked = sorted(merged.values(), key=lambda ctx: (-ctx.metadata["mentions"], ctx.metadata["chunks"][0]))
+    ranked = ranked[:max_entities]
+    contexts = sorted(ranked, key=lambda ctx: ctx.metadata["chunks"][0])
+    logger.info(f"Merged {extracted} entities from {len(chunks)} chunks into {len(contexts)}")
+    return contexts
+
+
 def _context_to_entity(ctx: EntityProcessingContext, language: str) -> Entity:
     """
     Convert EntityProcessingContext to Entity with Wikipedia data.
@@ -227,6 +539,9 @@ def process_text(
     language: Literal["de", "en"] = "de",
     educational_mode: bool = False,
     allowed_entity_types: str | list[str] = "auto",
+    wikipedia_fields: list[str] | None = None,
 ) -> tuple[list[Entity], dict]:
     """Synchronous wrapper for process_text_async."""
-    return asyncio.run(process_text_async(text, mode, max_entities, language, educational_mode, allowed_entity_types))
+    return asyncio.run(
+        process_text_async(text, mode, max_entities, language, educational_mode, allowed_entity_types, wikipedia_fields)
+    )
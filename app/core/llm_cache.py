@@ -0,0 +1,313 @@
+"""Content-addressed cache for OpenAI chat completions.
+
+Identical prompts (same model, messages, temperature, max_tokens and other
+generation options) return the same answer from the cache instead of being
+re-billed and re-waited. ``LLMResponseCache`` keeps the message contents in an
+in-memory LRU in front of a SQLite database under ``settings.CACHE_DIR``; every
+endpoint (``translate``, ``synonyms``, ``extract``, ``generate``, ``compendium``,
+``qa``) has its own TTL.
+
+Callers go through :func:`complete` / :func:`complete_async`. Responses are only
+cached once the caller's parser accepted them, so a malformed answer is retried
+on the next call. A request can opt out with :func:`bypass_llm_cache` (the API
+does this for requests sent with ``Cache-Control: no-cache``).
+
+Lookups never write to SQLite; :func:`complete_async` runs lookups and stores
+in a worker thread so cache I/O does not block the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, TypeVar
+
+from loguru import logger
+
+from .settings import settings
+
+# A TypeVar rather than PEP 695 type parameters: requires-python is >=3.11
+T = TypeVar("T")
+
+CACHE_FILENAME = "llm-responses.sqlite3"
+# Transport options that do not change the answer
+_NON_KEY_OPTIONS = frozenset({"timeout", "stream"})
+
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_llm_cache() -> Iterator[None]:
+    """Send every completion inside the block to OpenAI, neither reading nor writing the cache."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def request_key(request: dict[str, Any]) -> str:
+    """Return the content hash of a ChatCompletion request."""
+    payload = {name: value for name, value in request.items() if name not in _NON_KEY_OPTIONS}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """In-memory LRU in front of a SQLite store of completion contents, with per-endpoint TTLs."""
+
+    def __init__(
+        self,
+        path: str,
+        ttls: dict[str, int] | None = None,
+        default_ttl: int = 24 * 3600,
+        max_memory_entries: int = 1024,
+        max_entries: int = 20000,
+    ):
+        """Open or create the SQLite store at *path* (per-endpoint *ttls* override *default_ttl*)."""
+        self.path = path
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, tuple[str, float, str]] = OrderedDict()
+        self._stats: dict[str, dict[str, int]] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_created ON responses (created_at)")
+        self._conn.commit()
+
+    def ttl(self, endpoint: str) -> int:
+        """Return the lifetime of cached responses of *endpoint* (seconds)."""
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def _count(self, endpoint: str, event: str) -> None:
+        counters = self._stats.setdefault(
+            endpoint, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "bypassed": 0}
+        )
+        counters[event] += 1
+
+    def get(self, endpoint: str, key: str) -> str | None:
+        """Return the cached content for *key*, if present and fresh."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                _endpoint, created_at, content = entry
+                if now - created_at <= self.ttl(endpoint):
+                    self._memory.move_to_end(key)
+                    self._count(endpoint, "memory_hits")
+                    return content
+                del self._memory[key]
+
+            row = self._conn.execute("SELECT content, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                content, created_at = row
+                # Expired rows stay until the fresh answer replaces them or they age out
+                if now - created_at <= self.ttl(endpoint):
+                    self._remember(key, endpoint, created_at, content)
+                    self._count(endpoint, "disk_hits")
+                    return content
+
+            self._count(endpoint, "misses")
+            return None
+
+    def put(self, endpoint: str, key: str, content: str) -> None:
+        """Store *content* as the answer of the request *key*."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, endpoint, now, content)
+            self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, endpoint, content, now))
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE rowid IN "
+                    "(SELECT rowid FROM responses ORDER BY created_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+            self._conn.commit()
+            self._count(endpoint, "stores")
+
+    def _remember(self, key: str, endpoint: str, created_at: float, content: str) -> None:
+        """Put an entry into the memory tier (lock must be held)."""
+        if self.max_memory_entries <= 0:
+            return
+        self._memory[key] = (endpoint, created_at, content)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def count_bypass(self, endpoint: str) -> None:
+        """Record a request that opted out of the cache."""
+        with self._lock:
+            self._count(endpoint, "bypassed")
+
+    def clear(self, endpoint: str | None = None) -> int:
+        """
+        Remove cached responses.
+
+        Args:
+            endpoint: Only remove responses of this endpoint (all if None)
+
+        Returns:
+            Number of removed disk entries
+        """
+        with self._lock:
+            for key in [key for key, entry in self._memory.items() if endpoint is None or entry[0] == endpoint]:
+                del self._memory[key]
+            removed = self._conn.execute(
+                "DELETE FROM responses WHERE ? IS NULL OR endpoint = ?", (endpoint, endpoint)
+            ).rowcount
+            self._conn.commit()
+        logger.info(f"Removed {removed} cached LLM responses")
+        return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit statistics overall and per endpoint."""
+        with self._lock:
+            endpoints = {name: counters.copy() for name, counters in self._stats.items()}
+            (disk_entries,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            memory_entries = len(self._memory)
+
+        totals = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "bypassed": 0}
+        for counters in endpoints.values():
+            for name, value in counters.items():
+                totals[name] += value
+            counters["hit_rate"] = _hit_rate(counters)
+        return {
+            **totals,
+            "hit_rate": _hit_rate(totals),
+            "memory_entries": memory_entries,
+            "disk_entries": disk_entries,
+            "endpoints": endpoints,
+        }
+
+
+def _hit_rate(counters: dict[str, int]) -> float:
+    hits = counters["memory_hits"] + counters["disk_hits"]
+    lookups = hits + counters["misses"]
+    return round(hits / lookups, 3) if lookups else 0.0
+
+
+_caches: dict[str, LLMResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    """Return the process-wide LLM response cache for the configured CACHE_DIR (None if disabled)."""
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+
+    path = os.path.join(settings.CACHE_DIR, CACHE_FILENAME)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            try:
+                cache = LLMResponseCache(
+                    path,
+                    ttls=settings.LLM_CACHE_ENDPOINT_TTLS,
+                    default_ttl=settings.LLM_CACHE_TTL,
+                    max_memory_entries=settings.LLM_CACHE_MEMORY_ENTRIES,
+                    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                )
+            except sqlite3.Error as e:
+                logger.error(f"LLM response cache unavailable at {path}: {e}")
+                return None
+            _caches[path] = cache
+        return cache
+
+
+def _lookup(endpoint: str, request: dict[str, Any]) -> tuple[LLMResponseCache | None, str, str | None]:
+    """Return (cache to store into, request key, cached content) for *request*."""
+    cache = get_llm_cache()
+    if cache is None:
+        return None, "", None
+    if _bypass.get():
+        cache.count_bypass(endpoint)
+        return None, "", None
+    key = request_key(request)
+    content = cache.get(endpoint, key)
+    if content is not None:
+        logger.debug(f"LLM cache hit for {endpoint} request {key[:12]}")
+    return cache, key, content
+
+
+def _store(cache: LLMResponseCache | None, endpoint: str, key: str, content: str, parsed: Any) -> None:
+    # Empty parse results are treated like failures and asked again next time
+    empty = not parsed if isinstance(parsed, list | dict | str) else parsed is None
+    if cache is not None and not empty:
+        cache.put(endpoint, key, content)
+
+
+def complete(  # noqa: UP047 - PEP 695 syntax needs Python 3.12
+    endpoint: str,
+    request: dict[str, Any],
+    create: Callable[..., Any],
+    parse: Callable[[str], T],
+) -> T:
+    """
+    Return the parsed answer to a ChatCompletion *request*, served from the cache when possible.
+
+    Args:
+        endpoint: Cache namespace and TTL selector (e.g. ``"translate"``)
+        request: Keyword arguments for *create*
+        create: ``chat.completions.create`` of the OpenAI client
+        parse: Turns the message content into the caller's result; raising keeps the answer out of the cache
+
+    Returns:
+        The parsed answer
+    """
+    cache, key, content = _lookup(endpoint, request)
+    if content is not None:
+        return parse(content)
+
+    content = create(**request).choices[0].message.content
+    parsed = parse(content)
+    _store(cache, endpoint, key, content, parsed)
+    return parsed
+
+
+async def complete_async(  # noqa: UP047 - PEP 695 syntax needs Python 3.12
+    endpoint: str,
+    request: dict[str, Any],
+    create: Callable[..., Awaitable[Any]],
+    parse: Callable[[str], T],
+) -> T:
+    """Async variant of :func:`complete` for the shared ``AsyncOpenAI`` client (cache I/O runs in a thread)."""
+    cache, key, content = await asyncio.to_thread(_lookup, endpoint, request)
+    if content is not None:
+        return parse(content)
+
+    response = await create(**request)
+    content = response.choices[0].message.content
+    parsed = parse(content)
+    await asyncio.to_thread(_store, cache, endpoint, key, content, parsed)
+    return parsed
+
+
+__all__ = ["LLMResponseCache", "bypass_llm_cache", "complete", "complete_async", "get_llm_cache", "request_key"]
@@ -11,6 +11,8 @@ import json
 import logging
 from typing import Any
 
+from . import structured_outputs
+from .llm_cache import complete, complete_async
 from .settings import settings
 
 logger = logging.getLogger(__name__)
@@ -60,6 +62,36 @@ def get_educational_block_en() -> str:
     )
 
 
+def _entity_fields_instruction() -> str:
+    """Describe the entity objects the model returns (a JSON schema enforces them in structured mode)."""
+    fields = (
+        "For each entity, provide:\n"
+        "- label_de: The canonical German Wikipedia article title (exact format)\n"
+        "- label_en: The canonical English Wikipedia article title (exact format)\n"
+        "- type: The entity type (e.g. PERSON, LOCATION, ORGANIZATION)\n"
+        "- wikipedia_url_de: null (will be generated automatically)\n"
+        "- wikipedia_url_en: null (will be generated automatically)\n"
+        "- wikidata_id: null (will be fetched automatically)\n"
+    )
+    if structured_outputs.enabled():
+        return (
+            f"{fields}\nReturn a JSON object whose 'entities' array holds these objects. "
+            "Focus on using the EXACT canonical Wikipedia article titles."
+        )
+    return (
+        f"{fields}\n"
+        "Return a JSON array of objects with these keys. Focus on using the EXACT canonical Wikipedia article titles."
+    )
+
+
+def _with_entity_schema(request: dict[str, Any]) -> dict[str, Any]:
+    """Constrain an entity request to the :class:`~.structured_outputs.EntityList` schema in structured mode."""
+    if structured_outputs.enabled():
+        schema = structured_outputs.json_schema(structured_outputs.EntityList)
+        request["response_format"] = structured_outputs.response_format("entities", schema)
+    return request
+
+
 def _format_allowed_entity_types(allowed_entity_types) -> str:
     """Format allowed entity types for prompt inclusion."""
     if allowed_entity_types == "auto" or not allowed_entity_types:
@@ -87,11 +119,70 @@ def _ensure_ready() -> None:
         raise RuntimeError("OPENAI_API_KEY not set in environment")
 
 
+_async_client: Any = None
+
+
+def get_async_client() -> Any:
+    """Return the shared ``AsyncOpenAI`` client, creating it on first use.
+
+    All async helpers reuse this client so that completions share one pooled
+    HTTP connection set instead of opening new connections per call.
+    """
+    global _async_client
+    _ensure_ready()
+    if _async_client is None:
+        import httpx
+
+        _async_client = openai.AsyncOpenAI(  # type: ignore[attr-defined]
+            api_key=settings.OPENAI_API_KEY,
+            timeout=settings.OPENAI_TIMEOUT,
+            http_client=httpx.AsyncClient(
+                timeout=settings.OPENAI_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY,
+                ),
+            ),
+        )
+        logger.info("Created shared AsyncOpenAI client (max_connections=%d)", settings.OPENAI_MAX_CONNECTIONS)
+    return _async_client
+
+
+async def close_async_client() -> None:
+    """Close the shared ``AsyncOpenAI`` client (called on application shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
 # ---------------------------------------------------------------------------
 # Translation
 # ---------------------------------------------------------------------------
 
 
+def _translation_request(text: str, target_lang: str, source_lang: str | None) -> dict[str, Any]:
+    """Build the ChatCompletion arguments for a translation."""
+    system_prompt = (
+        "You are a translation engine. Translate the user text into "
+        f"{target_lang.upper()}. Do not add explanations, only the translated text."
+    )
+    if source_lang:
+        system_prompt += f"\nSource language is {source_lang.upper()}."
+
+    return {
+        "model": MODEL_NAME,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": text},
+        ],
+        "temperature": 0.0,
+        "timeout": settings.OPENAI_TIMEOUT,
+        "max_tokens": len(text) * 2 // 4 + 50,  # rough heuristic
+    }
+
+
 def translate_text(
     text: str,
     *,
@@ -101,25 +192,28 @@ def translate_text(
     """Translate *text* to *target_lang* using ChatCompletion."""
     _ensure_ready()
 
-    system_prompt = (
-        "You are a translation engine. Translate the user text into "
-        f"{target_lang.upper()}. Do not add explanations, only the translated text."
+    logger.debug("Calling OpenAI for translation (→%s)", target_lang)
+    return complete(
+        "translate",
+        _translation_request(text, target_lang, source_lang),
+        openai.chat.completions.create,  # type: ignore[attr-defined]
+        str.strip,
     )
-    if source_lang:
-        system_prompt += f"\nSource language is {source_lang.upper()}."
 
-    logger.debug("Calling OpenAI for translation (→%s)", target_lang)
-    response = openai.chat.completions.create(  # type: ignore[attr-defined]
-        model=MODEL_NAME,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": text},
-        ],
-        temperature=0.0,
-        timeout=settings.OPENAI_TIMEOUT,
-        max_tokens=len(text) * 2 // 4 + 50,  # rough heuristic
+
+async def translate_text_async(
+    text: str,
+    *,
+    target_lang: str = "en",
+    source_lang: str | None = None,
+) -> str:
+    """Async variant of :func:`translate_text` using the shared client."""
+    client = get_async_client()
+
+    logger.debug("Calling OpenAI (async) for translation (→%s)", target_lang)
+    return await complete_async(
+        "translate", _translation_request(text, target_lang, source_lang), client.chat.completions.create, str.strip
     )
-    return response.choices[0].message.content.strip()
 
 
 # ---------------------------------------------------------------------------
@@ -127,6 +221,37 @@ def translate_text(
 # ---------------------------------------------------------------------------
 
 
+def _synonyms_request(word: str, max_synonyms: int, lang: str) -> dict[str, Any]:
+    """Build the ChatCompletion arguments for a synonym lookup."""
+    sys_prompt = (
+        "You are a thesaurus assistant. For a given word, return a JSON array "
+        "containing distinct synonyms in the requested language. Do not output "
+        "anything except the JSON array."
+    )
+    user_prompt = f"LANGUAGE: {lang}\nWORD: {word}\nMAX: {max_synonyms}\nReturn synonyms now."
+    return {
+        "model": MODEL_NAME,
+        "messages": [
+            {"role": "system", "content": sys_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        "temperature": 0.3,
+        "timeout": settings.OPENAI_TIMEOUT,
+        "max_tokens": 100,
+    }
+
+
+def _parse_synonyms(content: str, max_synonyms: int) -> list[str]:
+    """Parse the JSON array returned for a synonym lookup."""
+    try:
+        data = json.loads(content)
+        if not isinstance(data, list):
+            raise ValueError("Expected JSON array")
+        return [str(w) for w in data][:max_synonyms]
+    except Exception as exc:  # pylint: disable=broad-except
+        raise RuntimeError(f"Invalid JSON from OpenAI: {exc}") from exc
+
+
 def generate_synonyms_llm(
     word: str,
     *,
@@ -136,63 +261,112 @@ def generate_synonyms_llm(
     """Return up to *max_synonyms* synonyms for *word* via ChatCompletion."""
     _ensure_ready()
 
+    logger.debug("Calling OpenAI for synonyms of '%s'", word)
+    return complete(
+        "synonyms",
+        _synonyms_request(word, max_synonyms, lang),
+        openai.chat.completions.create,  # type: ignore[attr-defined]
+        lambda content: _parse_synonyms(content, max_synonyms),
+    )
+
+
+async def generate_synonyms_llm_async(
+    word: str,
+    *,
+    max_synonyms: int = 5,
+    lang: str = "de",
+) -> list[str]:
+    """Async variant of :func:`generate_synonyms_llm` using the shared client."""
+    client = get_async_client()
+
+    logger.debug("Calling OpenAI (async) for synonyms of '%s'", word)
+    return await complete_async(
+        "synonyms",
+        _synonyms_request(word, max_synonyms, lang),
+        client.chat.completions.create,
+        lambda content: _parse_synonyms(content, max_synonyms),
+    )
+
+
+def _synonyms_batch_request(words: list[str], max_synonyms: int, lang: str) -> dict[str, Any]:
+    """Build the ChatCompletion arguments for synonyms of many words in one call."""
     sys_prompt = (
-        "You are a thesaurus assistant. For a given word, return a JSON array "
-        "containing distinct synonyms in the requested language. Do not output "
-        "anything except the JSON array."
+        "You are a thesaurus assistant. For every given term, list distinct synonyms or "
+        "alternative names (e.g. the full or the common name) in the requested language. "
+        "Return a JSON object that maps each term, exactly as given, to a JSON array of "
+        "synonyms. Do not output anything except the JSON object."
     )
-    user_prompt = f"LANGUAGE: {lang}\nWORD: {word}\nMAX: {max_synonyms}\nReturn synonyms now."
-    logger.debug("Calling OpenAI for synonyms of '%s'", word)
-    response = openai.chat.completions.create(  # type: ignore[attr-defined]
-        model=MODEL_NAME,
-        messages=[
+    user_prompt = (
+        f"LANGUAGE: {lang}\nMAX PER TERM: {max_synonyms}\nTERMS:\n"
+        + "\n".join(f"- {word}" for word in words)
+        + "\nReturn the JSON object now."
+    )
+    return {
+        "model": MODEL_NAME,
+        "messages": [
             {"role": "system", "content": sys_prompt},
             {"role": "user", "content": user_prompt},
         ],
-        temperature=0.3,
-        timeout=settings.OPENAI_TIMEOUT,
-        max_tokens=100,
-    )
-    content = response.choices[0].message.content
+        "temperature": 0.3,
+        "timeout": settings.OPENAI_TIMEOUT,
+        "max_tokens": 50 + 15 * max_synonyms * len(words),
+        "response_format": {"type": "json_object"},
+    }
+
+
+def _parse_synonym_map(content: str, words: list[str], max_synonyms: int) -> dict[str, list[str]]:
+    """Parse the JSON object of word -> synonyms returned for a batched lookup."""
     try:
         data = json.loads(content)
-        if not isinstance(data, list):
-            raise ValueError("Expected JSON array")
-        return [str(w) for w in data][:max_synonyms]
+        if not isinstance(data, dict):
+            raise ValueError("Expected JSON object")
     except Exception as exc:  # pylint: disable=broad-except
         raise RuntimeError(f"Invalid JSON from OpenAI: {exc}") from exc
 
+    # Models sometimes change the case or spacing of a term - match keys loosely
+    by_key = {str(key).strip().casefold(): value for key, value in data.items()}
+    synonyms = {}
+    for word in words:
+        value = data.get(word, by_key.get(word.strip().casefold()))
+        if isinstance(value, list):
+            synonyms[word] = [str(w) for w in value if str(w).strip() and str(w) != word][:max_synonyms]
+    return synonyms
+
+
+async def generate_synonyms_batch_llm_async(
+    words: list[str],
+    *,
+    max_synonyms: int = 3,
+    lang: str = "de",
+) -> dict[str, list[str]]:
+    """Return up to *max_synonyms* synonyms for each of *words* with a single ChatCompletion."""
+    words = list(dict.fromkeys(words))
+    if not words:
+        return {}
+    client = get_async_client()
+
+    logger.debug("Calling OpenAI (async) for synonyms of %d words", len(words))
+    return await complete_async(
+        "synonyms",
+        _synonyms_batch_request(words, max_synonyms, lang),
+        client.chat.completions.create,
+        lambda content: _parse_synonym_map(content, words, max_synonyms),
+    )
+
 
 # ---------------------------------------------------------------------------
 # Entity extraction / generation
 # ---------------------------------------------------------------------------
 
 
-def generate_entities(
+def _generation_request(
     text: str,
-    max_entities: int = 10,
-    language: str = "de",
-    educational_mode: bool = False,
-    allowed_entity_types="auto",
-) -> list[tuple[str, str, dict[str, Any]]]:
-    """Generate plausible entities related to *text*.
-
-    This is similar to :func:`extract_entities` but instructs the model to
-    think about *related* concepts that might not explicitly appear in the
-    text yet. The implementation is intentionally very similar to the
-    extraction helper to keep the surface consistent.
-
-    Args:
-        text: Input text to analyze
-        max_entities: Maximum number of entities to generate
-        language: Target language (de/en)
-        educational_mode: Enable educational perspective for entity generation
-        allowed_entity_types: Restrict entity types (string, list, or "auto")
-
-    Returns list of (label, TYPE, metadata) where metadata contains Wikipedia article titles.
-    """
-    _ensure_ready()
-
+    max_entities: int,
+    language: str,
+    educational_mode: bool,
+    allowed_entity_types,
+) -> dict[str, Any]:
+    """Build the ChatCompletion arguments for entity generation."""
     # Build entity type constraint
     entity_type_instruction = _format_allowed_entity_types(allowed_entity_types)
 
@@ -215,14 +389,7 @@ def generate_entities(
         f"- For Berlin: 'Berlin' (the city)\n"
         f"- For Germany: 'Germany' (the country)\n\n"
         f"{entity_type_instruction}\n\n"
-        f"For each entity, provide:\n"
-        f"- label_de: The canonical German Wikipedia article title (exact format)\n"
-        f"- label_en: The canonical English Wikipedia article title (exact format)\n"
-        f"- type: The entity type (e.g. PERSON, LOCATION, ORGANIZATION)\n"
-        f"- wikipedia_url_de: null (will be generated automatically)\n"
-        f"- wikipedia_url_en: null (will be generated automatically)\n"
-        f"- wikidata_id: null (will be fetched automatically)\n\n"
-        f"Return a JSON array of objects with these keys. Focus on using the EXACT canonical Wikipedia article titles."
+        f"{_entity_fields_instruction()}"
         f"{educational_instruction}"
     )
     user_prompt = (
@@ -238,17 +405,101 @@ def generate_entities(
         educational_mode,
     )
     logger.debug(f"[generate_entities] System prompt:\n{system_prompt}\nUser prompt:\n{user_prompt}")
-    response = openai.chat.completions.create(  # type: ignore[attr-defined]
-        model=MODEL_NAME,
-        messages=[
+    request = {
+        "model": MODEL_NAME,
+        "messages": [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
         ],
-        temperature=0.7,
-        timeout=settings.OPENAI_TIMEOUT,
-        max_tokens=800,  # Increased token limit for Wikipedia URLs
+        "temperature": 0.7,
+        "timeout": settings.OPENAI_TIMEOUT,
+        "max_tokens": 800,  # Increased token limit for Wikipedia URLs
+    }
+    return _with_entity_schema(request)
+
+
+def _extraction_request(
+    text: str,
+    max_entities: int,
+    language: str,
+    allowed_entity_types,
+) -> dict[str, Any]:
+    """Build the ChatCompletion arguments for entity extraction."""
+    # Build entity type constraint
+    entity_type_instruction = _format_allowed_entity_types(allowed_entity_types)
+
+    # Enhanced system prompt that instructs the model to extract exact Wikipedia article titles
+    system_prompt = (
+        f"You are an AI system for recognizing and linking entities. "
+        f"Your task is to identify up to {max_entities} important entities from the given text "
+        f"and provide their exact Wikipedia article titles.\n\n"
+        f"CRITICAL: Use the EXACT Wikipedia article title format. Examples:\n"
+        f"- For Goethe: 'Johann Wolfgang von Goethe' (not just 'Goethe')\n"
+        f"- For Einstein: 'Albert Einstein' (not 'Einstein')\n"
+        f"- For Berlin: 'Berlin' (the city)\n"
+        f"- For Germany: 'Germany' (the country)\n\n"
+        f"{entity_type_instruction}\n\n"
+        f"{_entity_fields_instruction()}"
     )
-    content = response.choices[0].message.content
+
+    user_prompt = (
+        f"TEXT (language={language}):\n{text}\n\n"
+        f"Extract up to {max_entities} distinct entities using EXACT Wikipedia article titles. JSON format only."
+    )
+
+    logger.debug("Calling OpenAI model %s for entity extraction with Wikipedia article titles", MODEL_NAME)
+    logger.debug(f"[extract_entities] System prompt:\n{system_prompt}\nUser prompt:\n{user_prompt}")
+    request = {
+        "model": MODEL_NAME,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        "temperature": 0.0,
+        "timeout": settings.OPENAI_TIMEOUT,
+        "max_tokens": 800,  # Increased token limit for Wikipedia URLs
+    }
+    return _with_entity_schema(request)
+
+
+def _entity_metadata(label_de: str, label_en: str | None, item: dict[str, Any]) -> dict[str, Any]:
+    # Collect metadata including Wikipedia article titles and both labels
+    return {
+        "label_de": label_de,
+        "label_en": label_en,
+        "wiki_url_de": item.get("wikipedia_url_de"),
+        "wiki_url_en": item.get("wikipedia_url_en"),
+        "wikidata_id": item.get("wikidata_id"),
+    }
+
+
+def _parse_structured_entities(content: str, *, generated: bool) -> list[tuple[str, str, dict[str, Any]]]:
+    """Validate the schema-constrained entity list returned in structured mode."""
+    kind = "generation" if generated else "extraction"
+    try:
+        items = structured_outputs.parse(structured_outputs.EntityList, content).entities
+    except ValueError as exc:
+        logger.error(f"Schema validation error in {kind}. Content: {content[:200]}...")
+        raise RuntimeError(f"Invalid structured output from OpenAI: {exc}") from exc
+
+    logger.debug(f"OpenAI {kind} returned {len(items)} items")
+    return [
+        (
+            item.label_de,
+            item.type.upper() or "UNKNOWN",
+            _entity_metadata(item.label_de, item.label_en, item.model_dump()),
+        )
+        for item in items
+        if item.label_de
+    ]
+
+
+def _parse_entities_response(content: str, *, generated: bool) -> list[tuple[str, str, dict[str, Any]]]:
+    """Parse the JSON entity list returned for generation (*generated*) or extraction."""
+    if structured_outputs.enabled():
+        return _parse_structured_entities(content, generated=generated)
+
+    kind = "generation" if generated else "extraction"
     try:
         # Clean content - remove markdown code blocks if present
         cleaned_content = content.strip()
@@ -261,13 +512,13 @@ def generate_entities(
         cleaned_content = cleaned_content.strip()
 
         items = json.loads(cleaned_content)
-        if isinstance(items, dict):
+        if generated and isinstance(items, dict):
             items = items.get("entities", [])
-        else:
-            items = items
+        if not isinstance(items, list):
+            raise ValueError("Expected JSON array")
 
         # Log the raw response for debugging
-        logger.debug(f"OpenAI generation returned {len(items)} items")
+        logger.debug(f"OpenAI {kind} returned {len(items)} items")
 
         entities = []
         for item in items:
@@ -275,137 +526,112 @@ def generate_entities(
             label_en = item.get("label_en")
             typ = str(item.get("type", "UNKNOWN")).upper()
 
-            # Collect metadata including Wikipedia article titles and both labels
-            metadata = {
-                "label_de": label_de,
-                "label_en": label_en,
-                "wiki_url_de": item.get("wikipedia_url_de"),
-                "wiki_url_en": item.get("wikipedia_url_en"),
-                "wikidata_id": item.get("wikidata_id"),
-            }
-
             if label_de:
+                metadata = _entity_metadata(label_de, label_en, item)
                 entities.append((label_de, typ, metadata))
                 logger.debug(
-                    f"Generated entity: {label_de} ({typ}) [EN: {label_en}] with URLs: "
-                    f"DE: {metadata.get('wiki_url_de')}, EN: {metadata.get('wiki_url_en')}"
+                    f"{'Generated' if generated else 'Extracted'} entity: {label_de} ({typ}) [EN: {label_en}] "
+                    f"with URLs: DE: {metadata.get('wiki_url_de')}, EN: {metadata.get('wiki_url_en')}"
                 )
 
         return entities
     except json.JSONDecodeError as exc:
         # Log the raw content to help debug JSON parsing issues
-        logger.error(f"JSON parsing error in generation. Content: {content[:200]}...")
+        logger.error(f"JSON parsing error in {kind}. Content: {content[:200]}...")
         raise RuntimeError(f"Invalid JSON from OpenAI: {exc}") from exc
     except Exception as exc:  # pylint: disable=broad-except
-        raise RuntimeError(f"Error processing OpenAI response in generation: {exc}") from exc
+        raise RuntimeError(f"Error processing OpenAI response in {kind}: {exc}") from exc
 
 
-# ---------------------------------------------------------------------------
-# Entity extraction
-# ---------------------------------------------------------------------------
-
-
-def extract_entities(
+def generate_entities(
     text: str,
     max_entities: int = 10,
     language: str = "de",
+    educational_mode: bool = False,
     allowed_entity_types="auto",
 ) -> list[tuple[str, str, dict[str, Any]]]:
-    """Extract up to *max_entities* entities from *text*.
+    """Generate plausible entities related to *text*.
+
+    This is similar to :func:`extract_entities` but instructs the model to
+    think about *related* concepts that might not explicitly appear in the
+    text yet. The implementation is intentionally very similar to the
+    extraction helper to keep the surface consistent.
 
     Args:
         text: Input text to analyze
-        max_entities: Maximum number of entities to extract
+        max_entities: Maximum number of entities to generate
         language: Target language (de/en)
+        educational_mode: Enable educational perspective for entity generation
         allowed_entity_types: Restrict entity types (string, list, or "auto")
 
     Returns list of (label, TYPE, metadata) where metadata contains Wikipedia article titles.
     """
     _ensure_ready()
 
-    # Build entity type constraint
-    entity_type_instruction = _format_allowed_entity_types(allowed_entity_types)
-
-    # Enhanced system prompt that instructs the model to extract exact Wikipedia article titles
-    system_prompt = (
-        f"You are an AI system for recognizing and linking entities. "
-        f"Your task is to identify up to {max_entities} important entities from the given text "
-        f"and provide their exact Wikipedia article titles.\n\n"
-        f"CRITICAL: Use the EXACT Wikipedia article title format. Examples:\n"
-        f"- For Goethe: 'Johann Wolfgang von Goethe' (not just 'Goethe')\n"
-        f"- For Einstein: 'Albert Einstein' (not 'Einstein')\n"
-        f"- For Berlin: 'Berlin' (the city)\n"
-        f"- For Germany: 'Germany' (the country)\n\n"
-        f"{entity_type_instruction}\n\n"
-        f"For each entity, provide:\n"
-        f"- label_de: The canonical German Wikipedia article title (exact format)\n"
-        f"- label_en: The canonical English Wikipedia article title (exact format)\n"
-        f"- type: The entity type (e.g. PERSON, LOCATION, ORGANIZATION)\n"
-        f"- wikipedia_url_de: null (will be generated automatically)\n"
-        f"- wikipedia_url_en: null (will be generated automatically)\n"
-        f"- wikidata_id: null (will be fetched automatically)\n\n"
-        f"Return a JSON array of objects with these keys. Focus on using the EXACT canonical Wikipedia article titles."
+    return complete(
+        "generate",
+        _generation_request(text, max_entities, language, educational_mode, allowed_entity_types),
+        openai.chat.completions.create,  # type: ignore[attr-defined]
+        lambda content: _parse_entities_response(content, generated=True),
     )
 
-    user_prompt = f"TEXT (language={language}):\n{text}\n\nExtract up to {max_entities} distinct entities using EXACT Wikipedia article titles. JSON format only."
 
-    logger.debug("Calling OpenAI model %s for entity extraction with Wikipedia article titles", MODEL_NAME)
-    logger.debug(f"[extract_entities] System prompt:\n{system_prompt}\nUser prompt:\n{user_prompt}")
-    response = openai.chat.completions.create(  # type: ignore[attr-defined]
-        model=MODEL_NAME,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        temperature=0.0,
-        timeout=settings.OPENAI_TIMEOUT,
-        max_tokens=800,  # Increased token limit for Wikipedia URLs
+async def generate_entities_async(
+    text: str,
+    max_entities: int = 10,
+    language: str = "de",
+    educational_mode: bool = False,
+    allowed_entity_types="auto",
+) -> list[tuple[str, str, dict[str, Any]]]:
+    """Async variant of :func:`generate_entities` using the shared client."""
+    client = get_async_client()
+
+    return await complete_async(
+        "generate",
+        _generation_request(text, max_entities, language, educational_mode, allowed_entity_types),
+        client.chat.completions.create,
+        lambda content: _parse_entities_response(content, generated=True),
     )
-    content = response.choices[0].message.content
-    try:
-        # Clean content - remove markdown code blocks if present
-        cleaned_content = content.strip()
-        if cleaned_content.startswith("```json"):
-            cleaned_content = cleaned_content[7:]  # Remove ```json
-        if cleaned_content.startswith("```"):
-            cleaned_content = cleaned_content[3:]   # Remove ```
-        if cleaned_content.endswith("```"):
-            cleaned_content = cleaned_content[:-3]  # Remove trailing ```
-        cleaned_content = cleaned_content.strip()
 
-        items = json.loads(cleaned_content)
-        if not isinstance(items, list):
-            raise ValueError("Expected JSON array")
 
-        # Log the raw response for debugging
-        logger.debug(f"OpenAI extraction returned {len(items)} items")
+def extract_entities(
+    text: str,
+    max_entities: int = 10,
+    language: str = "de",
+    allowed_entity_types="auto",
+) -> list[tuple[str, str, dict[str, Any]]]:
+    """Extract up to *max_entities* entities from *text*.
 
-        entities = []
-        for item in items:
-            label_de = item.get("label_de") or item.get("label", "").strip()
-            label_en = item.get("label_en")
-            typ = str(item.get("type", "UNKNOWN")).upper()
+    Args:
+        text: Input text to analyze
+        max_entities: Maximum number of entities to extract
+        language: Target language (de/en)
+        allowed_entity_types: Restrict entity types (string, list, or "auto")
 
-            # Collect metadata including Wikipedia article titles and both labels
-            metadata = {
-                "label_de": label_de,
-                "label_en": label_en,
-                "wiki_url_de": item.get("wikipedia_url_de"),
-                "wiki_url_en": item.get("wikipedia_url_en"),
-                "wikidata_id": item.get("wikidata_id"),
-            }
+    Returns list of (label, TYPE, metadata) where metadata contains Wikipedia article titles.
+    """
+    _ensure_ready()
 
-            if label_de:
-                entities.append((label_de, typ, metadata))
-                logger.debug(
-                    f"Extracted entity: {label_de} ({typ}) [EN: {label_en}] with URLs: "
-                    f"DE: {metadata.get('wiki_url_de')}, EN: {metadata.get('wiki_url_en')}"
-                )
+    return complete(
+        "extract",
+        _extraction_request(text, max_entities, language, allowed_entity_types),
+        openai.chat.completions.create,  # type: ignore[attr-defined]
+        lambda content: _parse_entities_response(content, generated=False),
+    )
 
-        return entities
-    except json.JSONDecodeError as exc:
-        # Log the raw content to help debug JSON parsing issues
-        logger.error(f"JSON parsing error. Content: {content[:200]}...")
-        raise RuntimeError(f"Invalid JSON from OpenAI: {exc}") from exc
-    except Exception as exc:  # pylint: disable=broad-except
-        raise RuntimeError(f"Error processing OpenAI response: {exc}") from exc
+
+async def extract_entities_async(
+    text: str,
+    max_entities: int = 10,
+    language: str = "de",
+    allowed_entity_types="auto",
+) -> list[tuple[str, str, dict[str, Any]]]:
+    """Async variant of :func:`extract_entities` using the shared client."""
+    client = get_async_client()
+
+    return await complete_async(
+        "extract",
+        _extraction_request(text, max_entities, language, allowed_entity_types),
+        client.chat.completions.create,
+        lambda content: _parse_entities_response(content, generated=False),
+    )
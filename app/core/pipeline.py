@@ -0,0 +1,87 @@
+"""Core logic for the `/pipeline` orchestrator.
+
+The pipeline is modeled as a small DAG of named stages. Every stage starts as
+soon as the stages it depends on have finished, so independent stages (e.g.
+compendium generation and QA over the linker abstracts) overlap instead of
+running strictly one after another.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import time
+from typing import Any
+
+from loguru import logger
+
+from .compendium import create_entity_context
+
+
+@dataclass
+class Stage:
+    """One pipeline stage.
+
+    ``run`` receives the results of the stages listed in ``depends_on``, keyed by stage name.
+    """
+
+    name: str
+    run: Callable[[dict[str, Any]], Awaitable[Any]]
+    depends_on: tuple[str, ...] = field(default_factory=tuple)
+
+
+async def run_stages(stages: list[Stage]) -> tuple[dict[str, Any], dict[str, float]]:
+    """
+    Run *stages* concurrently, respecting their dependencies.
+
+    Stages must be listed in dependency order (every dependency before its dependents).
+    If a stage fails, all stages still running are cancelled and the error is re-raised.
+
+    Args:
+        stages: Stages to run
+
+    Returns:
+        Tuple of (results keyed by stage name, own duration of each stage in seconds)
+    """
+    known: set[str] = set()
+    for stage in stages:
+        unknown = [dep for dep in stage.depends_on if dep not in known]
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown or later stages: {unknown}")
+        if stage.name in known:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        known.add(stage.name)
+
+    tasks: dict[str, asyncio.Task] = {}
+    timings: dict[str, float] = {}
+
+    async def _run(stage: Stage) -> Any:
+        inputs = {dep: await tasks[dep] for dep in stage.depends_on}
+        start_time = time.perf_counter()
+        result = await stage.run(inputs)
+        timings[stage.name] = time.perf_counter() - start_time
+        logger.debug(f"Pipeline stage '{stage.name}' finished in {timings[stage.name]:.2f}s")
+        return result
+
+    for stage in stages:
+        tasks[stage.name] = asyncio.create_task(_run(stage), name=f"pipeline-{stage.name}")
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+
+    return {name: task.result() for name, task in tasks.items()}, timings
+
+
+def create_qa_source_from_linker_data(linker_data: dict) -> str:
+    """Create the QA input text from linker output (original text plus entity abstracts)."""
+    context = create_entity_context(linker_data)
+    original_text = linker_data.get("original_text", "")
+    if not context:
+        return original_text
+    return f"{original_text}\n\n{context}" if original_text else context
@@ -5,8 +5,23 @@ from __future__ import annotations
 import logging
 import re
 
+from . import structured_outputs
+from .llm_cache import complete, complete_async
+
 logger = logging.getLogger(__name__)
 
+# Deutsche Bildungssystem-Standards als Standardwerte
+DEFAULT_LEVEL_VALUES = [
+    "Elementarbereich",
+    "Primarstufe",
+    "Sekundarstufe I",
+    "Sekundarstufe II",
+    "Hochschule",
+    "Berufliche Bildung",
+    "Erwachsenenbildung",
+    "Förderschule"
+]
+
 
 def generate_qa_pairs(
     markdown: str, num_pairs: int = 5, topic: str | None = None, max_chars: int | None = None
@@ -34,27 +49,7 @@ def generate_qa_pairs(
     logger.info(f"[generate_qa_pairs] Called with num_pairs={num_pairs}, max_chars={max_chars}")
 
     try:
-        # Einfacher Prompt für Semikolon-Format
-        prompt = (
-            "Du bist ein Assistent, der Lernfragen erstellt. "
-            f"Erstelle basierend auf dem folgenden Text GENAU {num_pairs} verschiedene Frage-Antwort-Paare. "
-            "WICHTIG: Antworte NUR mit den Frage-Antwort-Paaren im folgenden Format:\n\n"
-            "Frage 1;Antwort 1\n"
-            "Frage 2;Antwort 2\n"
-            "Frage 3;Antwort 3\n\n"
-            "Jedes Paar in eine neue Zeile, getrennt durch Semikolon. "
-            "Keine zusätzlichen Erklärungen, keine Nummerierung, keine Markdown-Formatierung.\n"
-            f"ANZAHL PAARE: {num_pairs}\n"
-        )
-
-        if topic:
-            prompt += f"SCHWERPUNKT: {topic}\n"
-
-        if max_chars:
-            prompt += f"MAX ANTWORTLÄNGE: {max_chars} Zeichen\n"
-
-        prompt += f"\nTEXT:\n{markdown}\n\n"
-        prompt += f"Erstelle nun {num_pairs} Frage-Antwort-Paare:"
+        prompt = _create_qa_prompt(markdown, num_pairs, topic, max_chars)
 
         logger.debug(f"[generate_qa_pairs] Calling OpenAI with prompt length: {len(prompt)}")
 
@@ -76,6 +71,88 @@ def generate_qa_pairs(
             raise RuntimeError(f"QA generation failed: {exc}") from exc
 
 
+async def generate_qa_pairs_async(
+    markdown: str, num_pairs: int = 5, topic: str | None = None, max_chars: int | None = None
+) -> list[tuple[str, str]]:
+    """Async variant of :func:`generate_qa_pairs` using the shared OpenAI client."""
+    logger.info(f"[generate_qa_pairs_async] Called with num_pairs={num_pairs}, max_chars={max_chars}")
+
+    try:
+        prompt = _create_qa_prompt(markdown, num_pairs, topic, max_chars)
+        pairs = await _call_openai_generate_async(prompt, num_pairs, max_chars)
+        if pairs:
+            logger.info(f"[generate_qa_pairs_async] OpenAI returned {len(pairs)} QA pairs")
+            return pairs
+        logger.error("[generate_qa_pairs_async] OpenAI returned empty result")
+        raise ValueError("OpenAI returned empty or invalid response for QA generation")
+
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.error(f"[generate_qa_pairs_async] OpenAI QA generation failed: {type(exc).__name__}: {exc}")
+        if isinstance(exc, RuntimeError | ValueError):
+            raise
+        raise RuntimeError(f"QA generation failed: {exc}") from exc
+
+
+def _create_qa_prompt(markdown: str, num_pairs: int, topic: str | None = None, max_chars: int | None = None) -> str:
+    """Create prompt for standard QA generation (JSON schema or semicolon format)."""
+    prompt = (
+        "Du bist ein Assistent, der Lernfragen erstellt. "
+        f"Erstelle basierend auf dem folgenden Text GENAU {num_pairs} verschiedene Frage-Antwort-Paare. "
+    )
+    if structured_outputs.enabled():
+        # Das Format erzwingt das JSON-Schema der Anfrage
+        prompt += (
+            "Gib ein JSON-Objekt zurück, dessen Liste 'pairs' für jedes Paar 'question' und 'answer' enthält. "
+            "Keine Nummerierung in den Fragen.\n"
+        )
+    else:
+        # Einfacher Prompt für Semikolon-Format
+        prompt += (
+            "WICHTIG: Antworte NUR mit den Frage-Antwort-Paaren im folgenden Format:\n\n"
+            "Frage 1;Antwort 1\n"
+            "Frage 2;Antwort 2\n"
+            "Frage 3;Antwort 3\n\n"
+            "Jedes Paar in eine neue Zeile, getrennt durch Semikolon. "
+            "Keine zusätzlichen Erklärungen, keine Nummerierung, keine Markdown-Formatierung.\n"
+        )
+    prompt += f"ANZAHL PAARE: {num_pairs}\n"
+
+    if topic:
+        prompt += f"SCHWERPUNKT: {topic}\n"
+
+    if max_chars:
+        prompt += f"MAX ANTWORTLÄNGE: {max_chars} Zeichen\n"
+
+    prompt += f"\nTEXT:\n{markdown}\n\n"
+    prompt += f"Erstelle nun {num_pairs} Frage-Antwort-Paare:"
+    return prompt
+
+
+def _qa_request(prompt: str, max_tokens: int, schema: dict | None = None) -> dict:
+    """Build the ChatCompletion arguments for a QA prompt (constrained to *schema* in structured mode)."""
+    from . import openai_wrapper
+
+    request = {
+        "model": openai_wrapper.MODEL_NAME,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.3,  # Etwas mehr Kreativität
+        "max_tokens": max_tokens,
+    }
+    if structured_outputs.enabled() and schema is not None:
+        request["response_format"] = structured_outputs.response_format("qa_pairs", schema)
+    return request
+
+
+def _qa_schema() -> dict:
+    return structured_outputs.json_schema(structured_outputs.QAPairList)
+
+
+def _clip_answer(answer: str, max_chars: int | None) -> str:
+    if max_chars and len(answer) > max_chars:
+        return answer[: max_chars - 3] + "..."
+    return answer
+
+
 def _call_openai_generate(prompt: str, num_pairs: int, max_chars: int | None = None) -> list[tuple[str, str]]:
     """Direct OpenAI chat call wrapped for QA generation."""
     from . import openai_wrapper  # reuse ensure_ready & openai import
@@ -85,14 +162,37 @@ def _call_openai_generate(prompt: str, num_pairs: int, max_chars: int | None = N
     openai_wrapper._ensure_ready()  # type: ignore
     openai = openai_wrapper.openai  # type: ignore
 
-    response = openai.chat.completions.create(  # type: ignore[attr-defined]
-        model=openai_wrapper.MODEL_NAME,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.3,  # Etwas mehr Kreativität
-        max_tokens=2000,  # Mehr Tokens für mehrere Paare
+    return complete(
+        "qa",
+        _qa_request(prompt, max_tokens=2000, schema=_qa_schema()),  # Mehr Tokens für mehrere Paare
+        openai.chat.completions.create,  # type: ignore[attr-defined]
+        lambda content: _parse_qa_pairs(content, num_pairs, max_chars),
     )
 
-    content = response.choices[0].message.content  # type: ignore[index]
+
+async def _call_openai_generate_async(
+    prompt: str, num_pairs: int, max_chars: int | None = None
+) -> list[tuple[str, str]]:
+    """Async OpenAI chat call for QA generation using the shared client."""
+    from . import openai_wrapper
+
+    logger.debug(f"[_call_openai_generate_async] Starting OpenAI call for {num_pairs} pairs")
+
+    client = openai_wrapper.get_async_client()
+    return await complete_async(
+        "qa",
+        _qa_request(prompt, max_tokens=2000, schema=_qa_schema()),
+        client.chat.completions.create,
+        lambda content: _parse_qa_pairs(content, num_pairs, max_chars),
+    )
+
+
+def _parse_qa_pairs(content: str, num_pairs: int, max_chars: int | None = None) -> list[tuple[str, str]]:
+    """Parse the question/answer pairs (validated JSON in structured mode, semicolon separated lines otherwise)."""
+    if structured_outputs.enabled():
+        pairs = structured_outputs.parse(structured_outputs.QAPairList, content).pairs
+        return [(p.question, _clip_answer(p.answer, max_chars)) for p in pairs if p.question and p.answer]
+
     logger.debug(f"[_call_openai_generate] OpenAI raw response: {content}")
 
     try:
@@ -117,8 +217,7 @@ def _call_openai_generate(prompt: str, num_pairs: int, max_chars: int | None = N
                     a = a.strip()
 
                     if q and a:  # Beide müssen vorhanden sein
-                        if max_chars and len(a) > max_chars:
-                            a = a[: max_chars - 3] + "..."
+                        a = _clip_answer(a, max_chars)
                         pairs.append((q, a))
                         logger.debug(f"[_call_openai_generate] Added pair: '{q}' -> '{a[:50]}...'")
 
@@ -168,17 +267,7 @@ def generate_qa_pairs_with_levels(
         If OpenAI returns invalid or empty response
     """
     if not level_values:
-        # Deutsche Bildungssystem-Standards als Standardwerte
-        level_values = [
-            "Elementarbereich",
-            "Primarstufe",
-            "Sekundarstufe I",
-            "Sekundarstufe II",
-            "Hochschule",
-            "Berufliche Bildung",
-            "Erwachsenenbildung",
-            "Förderschule"
-        ]
+        level_values = DEFAULT_LEVEL_VALUES
 
     logger.info(
         f"[generate_qa_pairs_with_levels] Called with num_pairs={num_pairs}, "
@@ -220,6 +309,49 @@ def generate_qa_pairs_with_levels(
             raise RuntimeError(f"Educational levels QA generation failed: {exc}") from exc
 
 
+async def generate_qa_pairs_with_levels_async(
+    markdown: str,
+    num_pairs: int = 5,
+    topic: str | None = None,
+    max_chars: int | None = None,
+    level_property: str = "Bildungsstufe",
+    level_values: list[str] | None = None
+) -> list[tuple[str, str, str, str]]:
+    """Async variant of :func:`generate_qa_pairs_with_levels` using the shared OpenAI client."""
+    level_values = level_values or DEFAULT_LEVEL_VALUES
+
+    logger.info(
+        f"[generate_qa_pairs_with_levels_async] Called with num_pairs={num_pairs}, "
+        f"level_property='{level_property}', level_values={level_values}"
+    )
+
+    try:
+        pairs_per_level = _distribute_pairs_across_levels(num_pairs, level_values)
+        prompt = _create_educational_levels_prompt(
+            markdown, num_pairs, level_property, level_values,
+            pairs_per_level, topic, max_chars
+        )
+
+        pairs_with_levels = await _call_openai_generate_with_levels_async(
+            prompt, num_pairs, level_property, level_values, max_chars
+        )
+        if pairs_with_levels:
+            logger.info(
+                f"[generate_qa_pairs_with_levels_async] OpenAI returned {len(pairs_with_levels)} QA pairs with levels"
+            )
+            return pairs_with_levels
+        logger.error("[generate_qa_pairs_with_levels_async] OpenAI returned empty result")
+        raise ValueError("OpenAI returned empty or invalid response for educational levels QA generation")
+
+    except Exception as exc:
+        logger.error(
+            f"[generate_qa_pairs_with_levels_async] OpenAI QA generation failed: {type(exc).__name__}: {exc}"
+        )
+        if isinstance(exc, RuntimeError | ValueError):
+            raise
+        raise RuntimeError(f"Educational levels QA generation failed: {exc}") from exc
+
+
 def _distribute_pairs_across_levels(num_pairs: int, level_values: list[str]) -> dict[str, int]:
     """Distribute QA pairs evenly across educational levels."""
     base_pairs = num_pairs // len(level_values)
@@ -232,6 +364,15 @@ def _distribute_pairs_across_levels(num_pairs: int, level_values: list[str]) ->
     return distribution
 
 
+def _levels_format_instruction() -> str:
+    if structured_outputs.enabled():
+        return (
+            "WICHTIGES FORMAT: Gib ein JSON-Objekt zurück, dessen Liste 'pairs' für jedes Paar "
+            "'question', 'answer' und 'level' (die Bildungsstufe) enthält.\n\n"
+        )
+    return "WICHTIGES FORMAT: Jede Zeile muss folgendes Format haben:\nFrage;Antwort;Bildungsstufe\n\n"
+
+
 def _create_educational_levels_prompt(
     markdown: str, num_pairs: int, level_property: str, level_values: list[str],
     pairs_per_level: dict[str, int], topic: str | None = None, max_chars: int | None = None
@@ -241,8 +382,7 @@ def _create_educational_levels_prompt(
         "Du bist ein Bildungsexperte, der Lernfragen für verschiedene Bildungsstufen erstellt. "
         f"Erstelle basierend auf dem folgenden Text GENAU {num_pairs} verschiedene Frage-Antwort-Paare "
         f"und verteile sie gleichmäßig auf die angegebenen {level_property}-Stufen.\n\n"
-        "WICHTIGES FORMAT: Jede Zeile muss folgendes Format haben:\n"
-        "Frage;Antwort;Bildungsstufe\n\n"
+        f"{_levels_format_instruction()}"
         "WICHTIGE REGELN:\n"
         "- KEINE Nummerierungen oder Aufzählungszeichen in den Fragen verwenden\n"
         "- Fragen beginnen direkt mit dem Fragewort (Was, Wie, Warum, etc.)\n"
@@ -316,14 +456,51 @@ def _call_openai_generate_with_levels(
     openai_wrapper._ensure_ready()
     openai = openai_wrapper.openai
 
-    response = openai.chat.completions.create(
-        model=openai_wrapper.MODEL_NAME,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.3,
-        max_tokens=3000,  # Mehr Tokens für Bildungsstufen-Informationen
+    return complete(
+        "qa",
+        # Mehr Tokens für Bildungsstufen-Informationen
+        _qa_request(prompt, max_tokens=3000, schema=structured_outputs.qa_levels_schema(level_values)),
+        openai.chat.completions.create,
+        lambda content: _parse_qa_pairs_with_levels(content, num_pairs, level_property, level_values, max_chars),
+    )
+
+
+async def _call_openai_generate_with_levels_async(
+    prompt: str, num_pairs: int, level_property: str,
+    level_values: list[str], max_chars: int | None = None
+) -> list[tuple[str, str, str, str]]:
+    """Async OpenAI call for educational levels QA generation using the shared client."""
+    from . import openai_wrapper
+
+    logger.debug(f"[_call_openai_generate_with_levels_async] Starting OpenAI call for {num_pairs} pairs with levels")
+
+    client = openai_wrapper.get_async_client()
+    return await complete_async(
+        "qa",
+        _qa_request(prompt, max_tokens=3000, schema=structured_outputs.qa_levels_schema(level_values)),
+        client.chat.completions.create,
+        lambda content: _parse_qa_pairs_with_levels(content, num_pairs, level_property, level_values, max_chars),
     )
 
-    content = response.choices[0].message.content
+
+def _parse_qa_pairs_with_levels(
+    content: str, num_pairs: int, level_property: str,
+    level_values: list[str], max_chars: int | None = None
+) -> list[tuple[str, str, str, str]]:
+    """Parse question/answer/level triples (validated JSON in structured mode, semicolon separated lines otherwise)."""
+    if structured_outputs.enabled():
+        pairs = structured_outputs.parse(structured_outputs.QALevelPairList, content).pairs
+        return [
+            (
+                p.question,
+                _clip_answer(p.answer, max_chars),
+                level_property,
+                p.level if p.level in level_values else _find_closest_level(p.level, level_values),
+            )
+            for p in pairs
+            if p.question and p.answer and p.level
+        ]
+
     logger.debug(f"[_call_openai_generate_with_levels] OpenAI raw response: {content}")
 
     try:
@@ -353,8 +530,7 @@ def _call_openai_generate_with_levels(
                             # Versuche ähnliche Bildungsstufe zu finden
                             level = _find_closest_level(level, level_values)
 
-                        if max_chars and len(a) > max_chars:
-                            a = a[:max_chars - 3] + "..."
+                        a = _clip_answer(a, max_chars)
 
                         pairs_with_levels.append((q, a, level_property, level))
                         logger.debug(
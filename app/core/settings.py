@@ -28,14 +28,110 @@ class _Settings(BaseSettings):
         description="Default model name used for ChatCompletion calls.",
     )
     OPENAI_TIMEOUT: int = Field(120, ge=10, description="Timeout for OpenAI requests (seconds)")
+    OPENAI_MAX_CONNECTIONS: int = Field(50, ge=1, description="Connection pool size of the shared async OpenAI client")
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = Field(20, ge=0, description="Idle connections kept open for reuse")
+    OPENAI_KEEPALIVE_EXPIRY: float = Field(30.0, ge=0, description="Seconds an idle OpenAI connection is kept alive")
+    OPENAI_STRUCTURED_OUTPUTS: bool = Field(
+        True, description="Constrain entity and QA responses to a JSON schema and validate them with pydantic"
+    )
 
     # Wikipedia
     WIKIPEDIA_TIMEOUT: int = Field(30, ge=1, description="HTTP timeout for Wikipedia API requests (seconds)")
     WIKIPEDIA_MAX_CONCURRENCY: int = Field(5, ge=1, description="Max simultaneous Wikipedia requests")
     WIKIPEDIA_BATCH_SIZE: int = Field(10, ge=1, description="Number of entities to process in a batch")
+    WIKIPEDIA_CONNECTIONS_PER_HOST: int = Field(
+        20, ge=1, description="Pooled keep-alive connections per Wikipedia host in the shared session"
+    )
+    WIKIPEDIA_KEEPALIVE_TIMEOUT: float = Field(
+        30.0, ge=0, description="Seconds an idle Wikipedia connection is kept open for reuse"
+    )
+    WIKIPEDIA_LIMITER_MAX: int = Field(
+        20,
+        ge=1,
+        description="Max in-flight requests per Wikipedia host; the adaptive window starts here and shrinks "
+        "(capped at WIKIPEDIA_CONNECTIONS_PER_HOST)",
+    )
+    WIKIPEDIA_HEDGED_FALLBACKS: bool = Field(
+        True, description="Run fallback strategies concurrently and keep the first complete page"
+    )
+    WIKIPEDIA_HEDGE_DELAY: float = Field(
+        0.25, ge=0, description="Seconds before the next fallback strategy is started while earlier ones still run"
+    )
+    WIKIPEDIA_MAX_LINKS_PER_PAGE: int = Field(
+        500, ge=1, description="Max internal links kept per Wikipedia page (continuations stop once reached)"
+    )
+    WIKIPEDIA_MAX_CATEGORIES_PER_PAGE: int = Field(
+        100, ge=1, description="Max categories kept per Wikipedia page (continuations stop once reached)"
+    )
+    WIKIPEDIA_MAX_CONTINUATIONS: int = Field(
+        10, ge=0, description="Max follow-up requests per prop to complete a batch MediaWiki truncated (0 disables)"
+    )
+
+    # Linker
+    LINKER_ENTITY_CONCURRENCY: int = Field(
+        8, ge=1, description="Max entities resolved against Wikipedia at the same time per request"
+    )
+    LINKER_BATCH_MAX_TEXTS: int = Field(500, ge=1, description="Max texts accepted by one /linker/batch request")
+    LINKER_BATCH_EXTRACTION_CONCURRENCY: int = Field(
+        8, ge=1, description="Max concurrent LLM extraction calls within one /linker/batch request"
+    )
+    LINKER_CHUNK_EXTRACTION_CONCURRENCY: int = Field(
+        4, ge=1, description="Max concurrent LLM extraction calls for the chunks of one text above TEXT_SPLIT_THRESHOLD"
+    )
+
+    # Compendium
+    COMPENDIUM_PROMPT_TOKEN_BUDGET: int = Field(
+        12000,
+        ge=1000,
+        description="Max prompt tokens of a compendium request; entity abstracts are ranked and trimmed to fit",
+    )
 
     # Cache
     CACHE_DIR: str = Field("./cache", description="Directory for caching service responses")
+    WIKIPEDIA_CACHE_ENABLED: bool = Field(True, description="Persist fetched Wikipedia pages under CACHE_DIR")
+    WIKIPEDIA_CACHE_TTL: int = Field(7 * 24 * 3600, ge=60, description="Lifetime of cached Wikipedia pages (seconds)")
+    WIKIPEDIA_CACHE_MAX_ENTRIES: int = Field(
+        50000, ge=100, description="Max cached Wikipedia titles before least recently used ones are evicted"
+    )
+    WIKIPEDIA_NEGATIVE_CACHE_TTL: int = Field(
+        6 * 3600, ge=0, description="Lifetime of cached 'not found' results for entity labels (seconds, 0 disables)"
+    )
+    WIKIPEDIA_LOOKUP_CACHE_SIZE: int = Field(
+        2048, ge=0, description="Entries in the in-process entity lookup cache (0 disables it)"
+    )
+    WIKIPEDIA_LOOKUP_CACHE_TTL: int = Field(3600, ge=1, description="Lifetime of in-process entity lookups (seconds)")
+    WIKIPEDIA_TITLE_GRAPH_TTL: int = Field(
+        30 * 24 * 3600, ge=60, description="Lifetime of learned redirect and langlink edges (seconds)"
+    )
+    WIKIPEDIA_OFFLINE_INDEX: str = Field(
+        "", description="Path of an offline index built from Wikipedia dumps (empty disables it)"
+    )
+    WIKIPEDIA_RESOLVERS: str = Field(
+        "offline,cache,live",
+        description="Comma-separated Wikipedia lookup tiers in order (offline, cache, replay, live)",
+    )
+    WIKIPEDIA_REPLAY_FIXTURE: str = Field(
+        "", description="JSON fixture answered by the 'replay' resolver tier (recorded when followed by 'live')"
+    )
+
+    LLM_CACHE_ENABLED: bool = Field(True, description="Cache OpenAI completions of identical requests under CACHE_DIR")
+    LLM_CACHE_TTL: int = Field(24 * 3600, ge=0, description="Lifetime of cached LLM responses (seconds)")
+    LLM_CACHE_ENDPOINT_TTLS: dict[str, int] = Field(
+        {"translate": 30 * 24 * 3600, "synonyms": 30 * 24 * 3600, "extract": 7 * 24 * 3600},
+        description="Per-endpoint lifetimes overriding LLM_CACHE_TTL "
+        "(translate, synonyms, extract, generate, compendium, qa)",
+    )
+    LLM_CACHE_MEMORY_ENTRIES: int = Field(
+        1024, ge=0, description="LLM responses kept in the in-process LRU in front of the disk cache"
+    )
+    LLM_CACHE_MAX_ENTRIES: int = Field(
+        20000, ge=100, description="Max LLM responses on disk before the oldest ones are evicted"
+    )
+
+    # Admin
+    ADMIN_API_KEY: str = Field(
+        "", description="Value admin endpoints require in the X-Admin-Key header (empty disables the endpoints)"
+    )
 
     # Rate limiting
     RATE_LIMIT: int = Field(60, ge=1, description="Max requests per minute per IP")
@@ -0,0 +1,131 @@
+"""JSON-schema constrained responses for entity and QA generation.
+
+With ``settings.OPENAI_STRUCTURED_OUTPUTS`` enabled, entity and QA requests
+carry a ``response_format`` of type ``json_schema`` in strict mode, so the
+model can only answer with JSON matching the response models below. The
+answer is validated in one pass with ``model_validate_json`` instead of
+stripping code fences and scanning lines; a response that does not validate
+raises and is therefore never cached.
+"""
+
+from __future__ import annotations
+
+import copy
+from functools import cache
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+from .settings import settings
+
+# A TypeVar rather than PEP 695 type parameters: requires-python is >=3.11
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class _ResponseModel(BaseModel):
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+
+class EntityItem(_ResponseModel):
+    """One extracted or generated entity (link fields are null unless the model knows them)."""
+
+    label_de: str
+    label_en: str | None
+    type: str
+    wikipedia_url_de: str | None = None
+    wikipedia_url_en: str | None = None
+    wikidata_id: str | None = None
+
+
+class EntityList(_ResponseModel):
+    """Response of an entity extraction or generation request."""
+
+    entities: list[EntityItem]
+
+
+class QAPair(_ResponseModel):
+    """One question/answer pair."""
+
+    question: str
+    answer: str
+
+
+class QAPairList(_ResponseModel):
+    """Response of a QA generation request."""
+
+    pairs: list[QAPair]
+
+
+class QALevelPair(QAPair):
+    """Question/answer pair assigned to an educational level."""
+
+    level: str
+
+
+class QALevelPairList(_ResponseModel):
+    """Response of a QA generation request with educational levels."""
+
+    pairs: list[QALevelPair]
+
+
+def enabled() -> bool:
+    """Whether entity and QA requests use JSON-schema constrained responses."""
+    return settings.OPENAI_STRUCTURED_OUTPUTS
+
+
+def _strict_schema(node: Any) -> Any:
+    """Adapt a pydantic JSON schema to OpenAI's strict mode (closed objects, all properties required)."""
+    if isinstance(node, list):
+        return [_strict_schema(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    node = {key: value for key, value in node.items() if key not in ("title", "default")}
+    if "properties" in node:
+        node["properties"] = {name: _strict_schema(value) for name, value in node["properties"].items()}
+        node["required"] = list(node["properties"])
+        node["additionalProperties"] = False
+    if "$defs" in node:
+        node["$defs"] = {name: _strict_schema(value) for name, value in node["$defs"].items()}
+    for key in ("items", "anyOf"):
+        if key in node:
+            node[key] = _strict_schema(node[key])
+    return node
+
+
+@cache
+def json_schema(model: type[BaseModel]) -> dict[str, Any]:
+    """Return the strict-mode JSON schema of *model*."""
+    return _strict_schema(model.model_json_schema())
+
+
+def response_format(name: str, schema: dict[str, Any]) -> dict[str, Any]:
+    """Return the ``response_format`` argument constraining the answer to *schema*."""
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
+
+def qa_levels_schema(level_values: list[str]) -> dict[str, Any]:
+    """Return the schema of :class:`QALevelPairList` with ``level`` restricted to *level_values*."""
+    schema = copy.deepcopy(json_schema(QALevelPairList))
+    schema["$defs"]["QALevelPair"]["properties"]["level"]["enum"] = list(level_values)
+    return schema
+
+
+def parse(model: type[ModelT], content: str) -> ModelT:  # noqa: UP047 - PEP 695 syntax needs Python 3.12
+    """Validate *content* against *model* (raises ``pydantic.ValidationError``, a ``ValueError``)."""
+    return model.model_validate_json(content)
+
+
+__all__ = [
+    "EntityItem",
+    "EntityList",
+    "QALevelPair",
+    "QALevelPairList",
+    "QAPair",
+    "QAPairList",
+    "enabled",
+    "json_schema",
+    "parse",
+    "qa_levels_schema",
+    "response_format",
+]
@@ -0,0 +1,206 @@
+"""Token counting and budgeting for LLM prompts.
+
+Prompts that embed retrieved context (e.g. one Wikipedia abstract per linked
+entity) grow with the input, and so do latency and cost. ``fit_snippets``
+keeps such context within a token budget: snippets are taken in order of
+priority, the first one that no longer fits is shortened to its leading
+sentences, and the rest are dropped.
+
+Tokens are counted with ``tiktoken`` when it is installed. Otherwise a
+conservative character-based estimate is used, so budgets still hold (with
+some headroom wasted) without the optional dependency.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+import math
+import re
+from typing import Any
+
+from loguru import logger
+
+from .settings import settings
+
+try:
+    import tiktoken  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None  # type: ignore
+
+# Estimate without tiktoken; German text averages ~4 chars per token, so this overestimates slightly
+_CHARS_PER_TOKEN = 3.5
+# Fixed tokens every chat message adds for its role and delimiters, plus the reply primer
+_TOKENS_PER_MESSAGE = 4
+_REPLY_TOKENS = 3
+# Shortening a snippet below this many tokens leaves nothing useful, so it is dropped instead
+MIN_SNIPPET_TOKENS = 24
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str) -> Any:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        logger.debug(f"No tiktoken encoding registered for {model}, using cl100k_base")
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def counter_name() -> str:
+    """Name of the token counter in use (``"tiktoken"`` or ``"heuristic"``)."""
+    return "heuristic" if tiktoken is None else "tiktoken"
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    """Return the number of tokens of *text* for *model* (default: ``settings.OPENAI_MODEL``)."""
+    if not text:
+        return 0
+    encoding = _encoding(model or settings.OPENAI_MODEL)
+    if encoding is None:
+        return math.ceil(len(text) / _CHARS_PER_TOKEN)
+    # User text may contain special-token markup such as "<|endoftext|>"; count it as plain text
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: list[dict[str, str]], model: str | None = None) -> int:
+    """Return the prompt tokens of a ChatCompletion *messages* list, including per-message overhead."""
+    return _REPLY_TOKENS + sum(_TOKENS_PER_MESSAGE + count_tokens(m.get("content", ""), model) for m in messages)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str | None = None) -> str:
+    """
+    Shorten *text* to at most *max_tokens* tokens.
+
+    Whole leading sentences are kept where possible; a first sentence that is
+    too long on its own is cut at a word boundary. Shortened text ends in "…".
+
+    Args:
+        text: Text to shorten
+        max_tokens: Token limit
+        model: Model whose tokenizer counts
+
+    Returns:
+        *text* itself if it fits, otherwise its shortened prefix ("" if nothing fits)
+    """
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    # Reserve room for the ellipsis
+    limit = max_tokens - count_tokens(" …", model)
+    if limit <= 0:
+        return ""
+
+    kept: list[str] = []
+    for sentence in _SENTENCE_END.split(text):
+        if count_tokens(" ".join([*kept, sentence]), model) > limit:
+            break
+        kept.append(sentence)
+    if kept:
+        return " ".join(kept) + " …"
+
+    # Not even the first sentence fits: cut it at a word boundary
+    prefix = text[: int(limit * _CHARS_PER_TOKEN)]
+    while prefix and count_tokens(prefix, model) > limit:
+        prefix = prefix[: int(len(prefix) * 0.9)]
+    prefix = prefix.rsplit(" ", 1)[0] if " " in prefix else prefix
+    return f"{prefix} …" if prefix else ""
+
+
+@dataclass
+class Snippet:
+    """One piece of prompt context competing for the token budget."""
+
+    text: str
+    priority: float = 0.0
+
+
+@dataclass
+class BudgetedContext:
+    """Context assembled within a token budget, with what it took to get there."""
+
+    text: str
+    tokens: int
+    budget: int
+    included: int = 0
+    trimmed: int = 0
+    dropped: int = 0
+
+    def to_stats(self) -> dict[str, Any]:
+        """Return the counts for statistics output."""
+        return {
+            "context_tokens": self.tokens,
+            "context_budget": self.budget,
+            "snippets_included": self.included,
+            "snippets_trimmed": self.trimmed,
+            "snippets_dropped": self.dropped,
+        }
+
+
+def fit_snippets(
+    snippets: list[Snippet], max_tokens: int, *, separator: str = "\n\n", model: str | None = None
+) -> BudgetedContext:
+    """
+    Join the most important *snippets* into a context of at most *max_tokens* tokens.
+
+    Snippets are considered by descending priority (ties keep their order).
+    Those that fit are kept whole, the first one that does not is shortened
+    to what is left (if that is at least ``MIN_SNIPPET_TOKENS``), and all
+    remaining ones are dropped. Kept snippets stay in their original order.
+
+    Args:
+        snippets: Context pieces in reading order
+        max_tokens: Token budget for the joined context
+        separator: Text placed between snippets
+        model: Model whose tokenizer counts
+
+    Returns:
+        The joined context and its token accounting
+    """
+    separator_tokens = count_tokens(separator, model)
+    ranked = sorted(range(len(snippets)), key=lambda i: -snippets[i].priority)
+
+    chosen: dict[int, str] = {}
+    used = 0
+    trimmed = 0
+    for position, index in enumerate(ranked):
+        cost = separator_tokens if chosen else 0
+        remaining = max_tokens - used - cost
+        text = snippets[index].text
+        tokens = count_tokens(text, model)
+        if tokens > remaining:
+            text = truncate_to_tokens(text, remaining, model) if remaining >= MIN_SNIPPET_TOKENS else ""
+            if text:
+                chosen[index] = text
+                used += cost + count_tokens(text, model)
+                trimmed = 1
+            dropped = len(ranked) - position - trimmed
+            break
+        chosen[index] = text
+        used += cost + tokens
+    else:
+        dropped = 0
+
+    joined = separator.join(chosen[index] for index in sorted(chosen))
+    return BudgetedContext(
+        text=joined,
+        tokens=count_tokens(joined, model),
+        budget=max_tokens,
+        included=len(chosen),
+        trimmed=trimmed,
+        dropped=dropped,
+    )
+
+
+__all__ = [
+    "MIN_SNIPPET_TOKENS",
+    "BudgetedContext",
+    "Snippet",
+    "count_message_tokens",
+    "count_tokens",
+    "counter_name",
+    "fit_snippets",
+    "truncate_to_tokens",
+]
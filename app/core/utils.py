@@ -11,8 +11,11 @@ import re
 from loguru import logger
 
 # Import functions that will be used later
+from .openai_wrapper import generate_synonyms_batch_llm_async as _synonyms_batch_llm_async
 from .openai_wrapper import generate_synonyms_llm as _synonyms_llm
+from .openai_wrapper import generate_synonyms_llm_async as _synonyms_llm_async
 from .openai_wrapper import translate_text as _translate_text
+from .openai_wrapper import translate_text_async as _translate_text_async
 
 # Logging via loguru (see plan.md for style)
 
@@ -153,6 +156,52 @@ def generate_synonyms(word: str, max_synonyms: int = 5, *, lang: str = "de") ->
     return fallback_syns
 
 
+async def generate_synonyms_async(
+    word: str, max_synonyms: int = 5, *, lang: str = "de", strict: bool = False
+) -> list[str]:
+    """
+    Async variant of :func:`generate_synonyms` that does not block the event loop.
+
+    With *strict*, OpenAI errors are raised instead of answered from the local dict.
+    """
+    logger.info(f"[generate_synonyms_async] Called with word='{word}', max_synonyms={max_synonyms}, lang='{lang}'")
+    try:
+        syns = await _synonyms_llm_async(word, max_synonyms=max_synonyms, lang=lang)
+        if syns:
+            logger.info(f"[generate_synonyms_async] Found {len(syns)} synonyms via OpenAI for '{word}'")
+            return syns
+    except Exception as exc:
+        if strict:
+            raise
+        logger.warning(f"[generate_synonyms_async] OpenAI fallback for word '{word}': {exc}")
+    fallback_syns = _simple_synonyms.get(word, [])[:max_synonyms]
+    logger.info(f"[generate_synonyms_async] Returning {len(fallback_syns)} fallback synonyms for '{word}'")
+    return fallback_syns
+
+
+async def generate_synonyms_batch_async(
+    words: list[str], max_synonyms: int = 3, *, lang: str = "de", strict: bool = False
+) -> dict[str, list[str]]:
+    """
+    Return synonyms for many words with one OpenAI call - fallback to local dict.
+
+    With *strict*, OpenAI errors are raised instead of answered from the local dict.
+    """
+    logger.info(f"[generate_synonyms_batch_async] Called with {len(words)} words, max_synonyms={max_synonyms}")
+    try:
+        synonyms = await _synonyms_batch_llm_async(words, max_synonyms=max_synonyms, lang=lang)
+        logger.info(f"[generate_synonyms_batch_async] Found synonyms via OpenAI for {len(synonyms)} words")
+    except Exception as exc:
+        if strict:
+            raise
+        logger.warning(f"[generate_synonyms_batch_async] OpenAI fallback for {len(words)} words: {exc}")
+        synonyms = {}
+    for word in words:
+        if not synonyms.get(word) and word in _simple_synonyms:
+            synonyms[word] = _simple_synonyms[word][:max_synonyms]
+    return synonyms
+
+
 def translate(text: str, target_lang: str = "en", source_lang: str | None = None) -> str:
     """Translate text using OpenAI API."""
     logger.info(f"[translate] Called with target_lang='{target_lang}', source_lang='{source_lang}'")
@@ -191,3 +240,23 @@ def translate(text: str, target_lang: str = "en", source_lang: str | None = None
     except Exception as exc:  # Catch any exception for robustness
         logger.warning(f"[translate] OpenAI fallback for target_lang='{target_lang}': {exc}")
         return f"[{target_lang} translation of]: {text}"
+
+
+async def translate_async(text: str, target_lang: str = "en", source_lang: str | None = None) -> str:
+    """Async variant of :func:`translate` that does not block the event loop."""
+    logger.info(f"[translate_async] Called with target_lang='{target_lang}', source_lang='{source_lang}'")
+    try:
+        kwargs = {"target_lang": target_lang}
+        if source_lang:
+            kwargs["source_lang"] = source_lang
+
+        out = await _translate_text_async(text, **kwargs)
+
+        if out and out.strip() != text.strip():  # Check for actual translation
+            logger.info(f"[translate_async] Successfully translated text to '{target_lang}'")
+            return out
+        logger.info(f"[translate_async] No translation performed, returning fallback for '{target_lang}'")
+        return f"[{target_lang} translation of]: {text}"
+    except Exception as exc:  # Catch any exception for robustness
+        logger.warning(f"[translate_async] OpenAI fallback for target_lang='{target_lang}': {exc}")
+        return f"[{target_lang} translation of]: {text}"
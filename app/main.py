@@ -31,9 +31,15 @@ def create_app() -> FastAPI:
 
     @asynccontextmanager
     async def lifespan(_: FastAPI):
+        from app.core.openai_wrapper import close_async_client
+        from app.services.wikipedia.api.session import close_shared_session, open_shared_session
+
+        await open_shared_session()
         logger.info("Backend started and ready to accept requests")
         yield
         logger.info("Shutting down backend")
+        await close_shared_session()
+        await close_async_client()
 
     # --- LOGGING CONFIG ---
     log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "logs")
@@ -66,6 +72,7 @@ def create_app() -> FastAPI:
     )
 
     # Mount v1 routers
+    from app.api.v1 import admin as admin_v1
     from app.api.v1 import compendium as compendium_v1
     from app.api.v1 import linker as linker_v1
     from app.api.v1 import pipeline as pipeline_v1
@@ -77,6 +84,7 @@ def create_app() -> FastAPI:
     api_router.include_router(qa_v1.router)
     api_router.include_router(utils_v1.router)
     api_router.include_router(pipeline_v1.router)
+    api_router.include_router(admin_v1.router)
 
     # Add rate limiter middleware
     from app.middleware.ratelimiter import RateLimitMiddleware
@@ -87,6 +95,11 @@ def create_app() -> FastAPI:
         window=settings.RATE_WINDOW,
     )
 
+    # Let clients opt out of the LLM response cache per request
+    from app.middleware.llm_cache import LLMCacheControlMiddleware
+
+    app.add_middleware(LLMCacheControlMiddleware)
+
     # Health check endpoint
     @app.get("/health")
     async def health_check():
@@ -0,0 +1,38 @@
+"""Per-request opt-out of the LLM response cache.
+
+Requests sent with ``Cache-Control: no-cache`` (or ``no-store``) bypass the
+cache for every OpenAI call made while handling them, so clients can force
+fresh completions without disabling the cache globally.
+"""
+
+from __future__ import annotations
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.llm_cache import bypass_llm_cache
+
+_BYPASS_DIRECTIVES = frozenset({"no-cache", "no-store"})
+
+
+class LLMCacheControlMiddleware:
+    """ASGI middleware that bypasses the LLM response cache for ``Cache-Control: no-cache/no-store`` requests."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap the ASGI *app*."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle the request, inside :func:`~app.core.llm_cache.bypass_llm_cache` if it asks for it."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cache_control = Request(scope).headers.get("cache-control", "")
+        directives = {directive.strip().lower() for directive in cache_control.split(",")}
+        if directives.isdisjoint(_BYPASS_DIRECTIVES):
+            await self.app(scope, receive, send)
+            return
+
+        with bypass_llm_cache():
+            await self.app(scope, receive, send)
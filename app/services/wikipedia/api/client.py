@@ -3,22 +3,53 @@
 import asyncio
 import json
 import random
+import time
 from typing import Any
+from urllib.parse import urlparse
 
 import aiohttp
 from loguru import logger
 
-from ..constants import MAX_RETRIES, RETRY_DELAY, WIKIPEDIA_API_URL, PageDataMap, RedirectMap
-from ..exceptions import WikipediaAPIError, WikipediaAPITimeoutError
+from app.core.settings import settings
+
+from ..cache import WikipediaPageCache, get_page_cache
+from ..constants import (
+    ALL_PROPS,
+    CONTINUE_PARAMS,
+    MAX_RETRIES,
+    RETRY_DELAY,
+    WIKIPEDIA_API_URL,
+    PageData,
+    PageDataMap,
+    RedirectMap,
+    props_key,
+)
+from ..exceptions import WikipediaAPIError, WikipediaAPITimeoutError, WikipediaRateLimitError
+from ..offline_index import OfflineIndex, get_offline_index
+from ..resolvers import PageResolver, build_resolver_chain
+from ..title_graph import TitleGraph, get_title_graph
+from .limiter import get_host_limiter, get_limiter_stats
+from .session import create_session, get_session_stats, get_shared_session
 
 
 class WikipediaAPIClient:
     """Client for making requests to the Wikipedia API."""
 
-    def __init__(self, timeout: float = 30.0):
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        cache: WikipediaPageCache | None = None,
+        offline_index: OfflineIndex | None = None,
+        title_graph: TitleGraph | None = None,
+    ):
         self._session: aiohttp.ClientSession | None = None
+        self._owns_session = False
         self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._cache = cache if cache is not None else get_page_cache()
+        self._offline_index = offline_index if offline_index is not None else get_offline_index()
+        self._title_graph = title_graph if title_graph is not None else get_title_graph()
         self._stats = {"requests": 0, "successes": 0, "failures": 0}
+        self.resolver: PageResolver = build_resolver_chain(self, cache=self._cache, offline_index=self._offline_index)
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -30,25 +61,21 @@ class WikipediaAPIClient:
         await self.close()
 
     async def _ensure_session(self):
-        """Ensure HTTP session is created."""
+        """Ensure HTTP session is available (the shared application session if open)."""
         if self._session is None or self._session.closed:
-            connector = aiohttp.TCPConnector(
-                limit=100,
-                limit_per_host=20,
-                ttl_dns_cache=300,
-                use_dns_cache=True,
-            )
-            self._session = aiohttp.ClientSession(
-                connector=connector,
-                timeout=self._timeout,
-                headers={"User-Agent": "EntityExtractorBatch/1.0 (https://github.com/example/entityextractor)"},
-            )
+            shared = get_shared_session()
+            if shared is not None:
+                self._session = shared
+                self._owns_session = False
+            else:
+                self._session = create_session(self._timeout.total)
+                self._owns_session = True
 
     async def close(self):
-        """Close the HTTP session."""
-        if self._session and not self._session.closed:
+        """Close the HTTP session (the shared session is left open for other clients)."""
+        if self._session and self._owns_session and not self._session.closed:
             await self._session.close()
-            self._session = None
+        self._session = None
 
     def _update_stats(self, success: bool):
         """Update request statistics."""
@@ -58,55 +85,102 @@ class WikipediaAPIClient:
         else:
             self._stats["failures"] += 1
 
-    def get_stats(self) -> dict[str, int]:
-        """Get current request statistics."""
+    @property
+    def cache(self) -> WikipediaPageCache | None:
+        """Persistent page cache used by this client (None if disabled)."""
+        return self._cache
+
+    @property
+    def title_graph(self) -> TitleGraph | None:
+        """Redirect and langlink edges learned from API responses (None if disabled)."""
+        return self._title_graph
+
+    @property
+    def request_stats(self) -> dict[str, int]:
+        """Counts of live API request attempts."""
         return self._stats.copy()
 
+    def get_stats(self) -> dict[str, Any]:
+        """Get current request statistics."""
+        stats: dict[str, Any] = self._stats.copy()
+        stats["resolver"] = self.resolver.get_stats()
+        stats["limiters"] = get_limiter_stats()
+        stats["connections"] = get_session_stats()
+        return stats
+
     async def fetch_pages_batch(
-        self, titles: list[str], lang: str = "de", max_retries: int = MAX_RETRIES, base_delay: float = RETRY_DELAY
+        self, titles: list[str], lang: str = "de", props: frozenset[str] = ALL_PROPS
     ) -> tuple[PageDataMap, RedirectMap]:
         """
-        Fetch Wikipedia pages in batch with retry logic.
+        Fetch Wikipedia pages in batch through the configured resolver chain.
+
+        By default titles are looked up in the offline index first, then in the
+        page cache; only the remaining titles are requested from the live API.
 
         Args:
             titles: List of page titles to fetch
             lang: Language code ('de' or 'en')
-            max_retries: Maximum number of retry attempts
-            base_delay: Base delay for exponential backoff
+            props: MediaWiki props to fetch (see ``constants.props_for_fields``)
 
         Returns:
             Tuple of (pages_data, redirects_map)
         """
         if not titles:
             return {}, {}
+        return await self.resolver.resolve(titles, lang, props)
+
+    async def fetch_pages_live(
+        self,
+        titles: list[str],
+        lang: str = "de",
+        max_retries: int = MAX_RETRIES,
+        base_delay: float = RETRY_DELAY,
+        props: frozenset[str] = ALL_PROPS,
+    ) -> tuple[PageDataMap, RedirectMap]:
+        """
+        Fetch Wikipedia pages from the MediaWiki API with retry logic.
 
+        MediaWiki truncates prop results per request (e.g. 20 extracts, 500 links
+        across all pages of the batch) and returns ``continue`` tokens for the
+        rest. These are followed, one chain per prop in parallel, until every page
+        is complete or reached its link/category cap, so the result does not
+        depend on the batch size.
+        """
         await self._ensure_session()
 
-        # Prepare API parameters
         base_url = WIKIPEDIA_API_URL.format(lang=lang)
-        params = {
-            "action": "query",
-            "format": "json",
-            "formatversion": "2",
-            "titles": "|".join(titles),
-            "prop": "extracts|pageprops|categories|coordinates|langlinks|links|pageimages",
-            "exintro": "true",
-            "explaintext": "true",
-            "exsectionformat": "plain",
-            "redirects": "true",
-            "coprimary": "all",
-            "cllimit": "max",
-            "lllimit": "max",
-            "pllimit": "max",
-            "piprop": "thumbnail",  # Include thumbnail information
-            "pithumbsize": "300",  # Thumbnail size in pixels
-        }
+        data = await self._get_json(base_url, self._query_params(titles, props), max_retries, base_delay)
+        if data is None:
+            # Gracefully skip this batch and return empty results
+            return {}, {}
 
+        pages_data, redirects_map = self._process_api_response(data)
+        if data.get("continue") and pages_data:
+            await self._follow_continuations(base_url, data["continue"], pages_data, max_retries, base_delay)
+        self._cap_page_lists(pages_data)
+
+        # Remember the redirect and langlink edges of the response
+        if self._title_graph is not None:
+            await asyncio.to_thread(self._title_graph.learn, lang, pages_data, redirects_map)
+        return pages_data, redirects_map
+
+    async def _get_json(
+        self, base_url: str, params: dict[str, str], max_retries: int, base_delay: float
+    ) -> dict[str, Any] | None:
+        """Send one query with retries; return the response or None if it has no pages."""
         last_exception = None
+        limiter = get_host_limiter(urlparse(base_url).netloc)
+        kind, size = _request_kind(params)
+        retry_after = 0
 
         # Retry loop with exponential backoff
         for attempt in range(max_retries + 1):
             try:
+                if retry_after:
+                    # Honour Retry-After outside the concurrency window
+                    await asyncio.sleep(retry_after)
+                    retry_after = 0
+
                 if attempt > 0:
                     # Calculate delay with exponential backoff and jitter
                     delay = min(
@@ -116,73 +190,81 @@ class WikipediaAPIClient:
                     logger.warning("Attempt %d/%d failed, retrying in %.1fs...", attempt, max_retries + 1, delay)
                     await asyncio.sleep(delay)
 
-                # Make the API request
-                async with self._session.get(base_url, params=params) as response:
-                    self._update_stats(success=True)
-                    logger.debug("Received response with status: %d", response.status)
-
-                    # Handle rate limiting (429 Too Many Requests)
-                    if response.status == 429:
-                        retry_after = int(response.headers.get("Retry-After", "5"))
-                        logger.warning("Rate limited. Waiting %d seconds before retry...", retry_after)
-                        await asyncio.sleep(retry_after)
-                        continue
-
-                    # Handle other error status codes
-                    if response.status >= 400:
-                        error_text = await response.text()
-                        logger.error(
-                            "Wikipedia API error: HTTP %d - %s",
-                            response.status,
-                            error_text[:500],  # Limit error text length
-                        )
-
-                        # Don't retry on client errors (4xx) except 429
-                        if 400 <= response.status < 500 and response.status != 429:
+                # Make the API request within the adaptive concurrency window of the host
+                async with limiter:
+                    request_start = time.perf_counter()
+                    async with self._session.get(base_url, params=params, timeout=self._timeout) as response:
+                        logger.debug("Received response with status: %d", response.status)
+
+                        # Handle rate limiting (429 Too Many Requests)
+                        if response.status == 429:
+                            retry_after = int(response.headers.get("Retry-After", "5"))
+                            self._update_stats(success=False)
+                            last_exception = WikipediaRateLimitError(retry_after, url=str(response.url))
+                            limiter.on_overload("HTTP 429")
+                            logger.warning("Rate limited. Waiting %d seconds before retry...", retry_after)
+                            continue
+
+                        # Handle other error status codes
+                        if response.status >= 400:
+                            error_text = await response.text()
+                            logger.error(
+                                "Wikipedia API error: HTTP %d - %s",
+                                response.status,
+                                error_text[:500],  # Limit error text length
+                            )
+
+                            # Don't retry on client errors (4xx) except 429
+                            if 400 <= response.status < 500 and response.status != 429:
+                                raise WikipediaAPIError(
+                                    f"Client error: {response.status} {response.reason}",
+                                    status_code=response.status,
+                                    response={"status": response.status, "text": error_text},
+                                    url=str(response.url),
+                                    method="GET",
+                                )
+
+                            # For server errors, raise to trigger retry
+                            response.raise_for_status()
+
+                        limiter.on_success(time.perf_counter() - request_start, kind, size)
+
+                        # Parse and validate the response
+                        try:
+                            data = await response.json()
+                            self._update_stats(success=True)
+                            logger.debug("Successfully parsed JSON response")
+
+                            # Manual validation of the API response structure
+                            if not isinstance(data, dict) or "query" not in data or "pages" not in data["query"]:
+                                logger.error(
+                                    "Wikipedia API response missing 'query' or 'pages'. Raw response (truncated): %s",
+                                    json.dumps(data)[:2000] if isinstance(data, dict) else str(data)[:2000],
+                                )
+                                return None
+
+                            return data
+
+                        except json.JSONDecodeError as e:
+                            error_text = await response.text()
+                            logger.error(
+                                "Failed to decode JSON response. Status: %d. Response: %.500s",
+                                response.status,
+                                error_text,
+                            )
                             raise WikipediaAPIError(
-                                f"Client error: {response.status} {response.reason}",
+                                f"Invalid JSON response: {e}",
                                 status_code=response.status,
                                 response={"status": response.status, "text": error_text},
                                 url=str(response.url),
                                 method="GET",
                             )
 
-                        # For server errors, raise to trigger retry
-                        response.raise_for_status()
-
-                    # Parse and validate the response
-                    try:
-                        data = await response.json()
-                        logger.debug("Successfully parsed JSON response")
-
-                        # Manual validation of the API response structure
-                        if not isinstance(data, dict) or "query" not in data or "pages" not in data["query"]:
-                            logger.error(
-                                "Wikipedia API response missing 'query' or 'pages'. Raw response (truncated): %s",
-                                json.dumps(data)[:2000] if isinstance(data, dict) else str(data)[:2000],
-                            )
-                            # Gracefully skip this batch and return empty results
-                            return {}, {}
-
-                        # Process the response
-                        return self._process_api_response(data)
-
-                    except json.JSONDecodeError as e:
-                        error_text = await response.text()
-                        logger.error(
-                            "Failed to decode JSON response. Status: %d. Response: %.500s", response.status, error_text
-                        )
-                        raise WikipediaAPIError(
-                            f"Invalid JSON response: {e}",
-                            status_code=response.status,
-                            response={"status": response.status, "text": error_text},
-                            url=str(response.url),
-                            method="GET",
-                        )
-
             except aiohttp.ClientResponseError as e:
                 self._update_stats(success=False)
                 last_exception = e
+                if e.status in (429, 503):
+                    limiter.on_overload(f"HTTP {e.status}")
 
                 # Don't retry on client errors (4xx) except 429
                 if 400 <= e.status < 500 and e.status != 429:
@@ -200,6 +282,8 @@ class WikipediaAPIClient:
             except (TimeoutError, aiohttp.ClientError) as e:
                 self._update_stats(success=False)
                 last_exception = e
+                if isinstance(e, TimeoutError):
+                    limiter.on_overload("timeout")
                 logger.warning("Network error (attempt %d/%d): %s", attempt + 1, max_retries + 1, str(e))
 
             except Exception as e:
@@ -219,6 +303,135 @@ class WikipediaAPIClient:
         else:
             raise WikipediaAPIError("Unknown error occurred during API request")
 
+    @classmethod
+    def _query_params(cls, titles: list[str], props: frozenset[str]) -> dict[str, str]:
+        """Build the query parameters, including the per-prop options only for requested props."""
+        return {
+            "action": "query",
+            "format": "json",
+            "formatversion": "2",
+            "titles": "|".join(titles),
+            "prop": props_key(props),
+            "redirects": "true",
+            **cls._prop_options(props),
+        }
+
+    @staticmethod
+    def _prop_options(props: frozenset[str]) -> dict[str, str]:
+        """Return the module options of the requested props."""
+        options = {}
+        if "extracts" in props:
+            options.update({"exintro": "true", "explaintext": "true", "exsectionformat": "plain"})
+        if "langlinks" in props:
+            options["lllimit"] = "max"
+        if "categories" in props:
+            options["cllimit"] = "max"
+        if "coordinates" in props:
+            options["coprimary"] = "all"
+        if "links" in props:
+            options["pllimit"] = "max"
+        if "pageimages" in props:
+            options.update({"piprop": "thumbnail", "pithumbsize": "300"})  # Thumbnail size in pixels
+        return options
+
+    async def _follow_continuations(
+        self,
+        base_url: str,
+        tokens: dict[str, str],
+        pages_data: PageDataMap,
+        max_retries: int,
+        base_delay: float,
+    ) -> None:
+        """
+        Complete the props MediaWiki truncated, following one continuation chain per prop concurrently.
+
+        A failing chain only leaves its prop incomplete; the pages are still returned.
+
+        Args:
+            base_url: API endpoint of the batch
+            tokens: ``continue`` object of the batch response
+            pages_data: Pages of the batch, completed in place
+            max_retries: Retries per continuation request
+            base_delay: Base delay for exponential backoff
+        """
+        pages_by_id = {page["pageid"]: page for page in pages_data.values() if "pageid" in page}
+        chains = {
+            param: self._continue_prop(
+                base_url, param, token, tokens.get("continue", "||"), pages_by_id, max_retries, base_delay
+            )
+            for param, token in tokens.items()
+            if param in CONTINUE_PARAMS
+        }
+        results = await asyncio.gather(*chains.values(), return_exceptions=True)
+        for param, result in zip(chains, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Wikipedia continuation {param} failed, keeping partial page data: {result}")
+
+    async def _continue_prop(
+        self,
+        base_url: str,
+        param: str,
+        token: str,
+        continue_value: str,
+        pages_by_id: dict[int, PageData],
+        max_retries: int,
+        base_delay: float,
+    ) -> None:
+        """Follow the continuation chain of one prop, merging each response into *pages_by_id*."""
+        prop = CONTINUE_PARAMS[param]
+        cap = _page_list_caps().get(prop)
+        pageids = sorted(pages_by_id)
+        resume: str | None = token
+
+        for _ in range(settings.WIKIPEDIA_MAX_CONTINUATIONS):
+            if cap is not None and resume is not None:
+                # Results are ordered by page id and the token names the page being continued.
+                # Once that page is full, restart the prop for the pages after it instead.
+                resume_id = _resume_pageid(resume)
+                page = pages_by_id.get(resume_id)
+                if page is not None and len(page.get(prop) or []) >= cap:
+                    pageids = [pageid for pageid in pageids if pageid > resume_id]
+                    resume = None
+                    if not pageids:
+                        return
+
+            params = {
+                "action": "query",
+                "format": "json",
+                "formatversion": "2",
+                "pageids": "|".join(map(str, pageids)),
+                "prop": prop,
+                **self._prop_options(frozenset({prop})),
+            }
+            if resume is not None:
+                params.update({param: resume, "continue": continue_value})
+
+            data = await self._get_json(base_url, params, max_retries, base_delay)
+            if data is None:
+                return
+            pages = data["query"]["pages"]
+            for page in pages.values() if isinstance(pages, dict) else pages:
+                target = pages_by_id.get(page.get("pageid"))
+                if target is not None:
+                    _merge_page(target, page)
+
+            next_tokens = data.get("continue") or {}
+            resume = next_tokens.get(param)
+            if resume is None:
+                return
+            continue_value = next_tokens.get("continue", continue_value)
+
+        logger.warning(f"Stopped following {param} after {settings.WIKIPEDIA_MAX_CONTINUATIONS} continuations")
+
+    @staticmethod
+    def _cap_page_lists(pages_data: PageDataMap) -> None:
+        """Truncate link and category lists to the configured per-page caps."""
+        caps = _page_list_caps()
+        for page in pages_data.values():
+            for key, cap in caps.items():
+                if len(page.get(key) or []) > cap:
+                    page[key] = page[key][:cap]
+
     def _process_api_response(self, data: dict[str, Any]) -> tuple[PageDataMap, RedirectMap]:
         """Process Wikipedia API response data."""
         pages_data: PageDataMap = {}
@@ -233,6 +446,16 @@ class WikipediaAPIClient:
                     redirects_map[from_title] = to_title
                     logger.debug("Redirect: %s → %s", from_title, to_title)
 
+        # Handle title normalization (e.g. "zugspitze" → "Zugspitze") so that callers can map the
+        # requested title to the final page title with a single lookup, even across a redirect.
+        normalized = data.get("query", {}).get("normalized") or []
+        for entry in normalized:
+            if isinstance(entry, dict) and "from" in entry and "to" in entry:
+                from_title = str(entry["from"])
+                to_title = str(entry["to"])
+                redirects_map[from_title] = redirects_map.get(to_title, to_title)
+                logger.debug("Normalized: %s → %s", from_title, to_title)
+
         # Process pages
         pages = data["query"]["pages"]
         # Handle both dict and list for 'pages'
@@ -277,3 +500,32 @@ class WikipediaAPIClient:
 
         logger.info("Successfully processed %d pages and %d redirects", len(pages_data), len(redirects_map))
         return pages_data, redirects_map
+
+
+def _page_list_caps() -> dict[str, int]:
+    """Per-page caps of the list props, keyed by prop (which is also the page key)."""
+    return {"links": settings.WIKIPEDIA_MAX_LINKS_PER_PAGE, "categories": settings.WIKIPEDIA_MAX_CATEGORIES_PER_PAGE}
+
+
+def _request_kind(params: dict[str, str]) -> tuple[str, int]:
+    """Return the latency class of a query (props, continuation or not) and the number of pages it asks for."""
+    kind = params.get("prop", "")
+    if "continue" in params:
+        kind += "+continue"
+    targets = params.get("titles") or params.get("pageids") or ""
+    return kind, max(1, targets.count("|") + 1)
+
+
+def _resume_pageid(token: str) -> int | None:
+    """Return the page id a ``pageid|...`` continuation token resumes at (None for offset tokens)."""
+    head, _, rest = str(token).partition("|")
+    return int(head) if rest and head.isdigit() else None
+
+
+def _merge_page(target: PageData, page: PageData) -> None:
+    """Merge a continuation response for one page into the page data collected so far."""
+    for key, value in page.items():
+        if isinstance(value, list):
+            target.setdefault(key, []).extend(value)
+        else:
+            target.setdefault(key, value)
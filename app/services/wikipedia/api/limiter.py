@@ -0,0 +1,180 @@
+"""Adaptive (AIMD) concurrency limiter for Wikipedia API hosts.
+
+Each host gets one limiter shared by all clients in the process. The window of
+requests allowed in flight grows by one slot per window of healthy responses
+(additive increase) and is halved on 429/503 responses, timeouts or when the
+latency keeps rising well above its moving average (multiplicative decrease).
+
+Windows start at their maximum (``WIKIPEDIA_LIMITER_MAX``, capped at the
+connector's ``WIKIPEDIA_CONNECTIONS_PER_HOST`` so requests never queue for a
+pooled connection inside the window) and only shrink once the host pushes
+back. Latency is tracked per request kind (the props queried, continuation or
+not) and per title, so a 50-title batch or a continuation follow-up is not
+compared with single-title lookups; a decrease needs several consecutive slow
+responses, not one outlier.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import threading
+import time
+from typing import Any
+
+from loguru import logger
+
+from app.core.settings import settings
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limiter for the number of concurrent requests against one host."""
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: int | None = None,
+        latency_tolerance: float = 2.0,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+        slow_samples: int = 3,
+    ):
+        """Create a window of *max_limit* slots (or *initial_limit*) that never shrinks below *min_limit*."""
+        self.max_limit = max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.slow_samples = slow_samples
+        self._limit = float(initial_limit if initial_limit is not None else self.max_limit)
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        # Moving average of the latency per title, per request kind
+        self._latency_ewma: dict[str, float] = {}
+        self._slow_streak = 0
+        self._last_decrease = float("-inf")
+        self._stats = {"requests": 0, "increases": 0, "decreases": 0}
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency window."""
+        return int(self._limit)
+
+    async def acquire(self) -> None:
+        """Wait for a free slot in the current window."""
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            self._stats["requests"] += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation - pass it on
+                self.release()
+            else:
+                self._waiters.remove(future)
+            raise
+        self._stats["requests"] += 1
+
+    def release(self) -> None:
+        """Free a slot acquired with :meth:`acquire`."""
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    async def __aenter__(self) -> AdaptiveConcurrencyLimiter:
+        """Wait for a slot in the window."""
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Release the slot."""
+        self.release()
+
+    def on_success(self, latency: float, kind: str = "query", size: int = 1) -> None:
+        """
+        Record a healthy response; grows the window unless latency keeps rising.
+
+        Args:
+            latency: Seconds the request took
+            kind: Request kind whose latencies are comparable (e.g. the props queried)
+            size: Number of titles or page ids the request asked for
+        """
+        per_title = latency / max(size, 1)
+        average = self._latency_ewma.get(kind)
+        if average is not None and per_title > average * self.latency_tolerance:
+            self._slow_streak += 1
+            if self._slow_streak >= self.slow_samples:
+                self._slow_streak = 0
+                self._decrease(f"{kind} latency {per_title:.2f}s/title above average {average:.2f}s/title")
+        else:
+            self._slow_streak = 0
+            if self._limit < self.max_limit:
+                # One extra slot per full window of successful requests
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+                self._stats["increases"] += 1
+                self._wake_waiters()
+
+        self._latency_ewma[kind] = per_title if average is None else 0.9 * average + 0.1 * per_title
+
+    def on_overload(self, reason: str = "throttled") -> None:
+        """Record a 429/503 response or timeout; shrinks the window."""
+        self._decrease(reason)
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        # Responses of one overloaded window arrive together - shrink only once per cooldown
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        self._stats["decreases"] += 1
+        logger.warning(f"Wikipedia concurrency window {previous} -> {self.limit} ({reason})")
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self._in_flight += 1
+                future.set_result(None)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get limiter statistics including the current window."""
+        return {
+            **self._stats,
+            "limit": self.limit,
+            "max_limit": self.max_limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "latency_ewma_ms_per_title": {kind: round(ewma * 1000, 1) for kind, ewma in self._latency_ewma.items()},
+        }
+
+
+_limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_host_limiter(host: str) -> AdaptiveConcurrencyLimiter:
+    """Return the process-wide limiter for *host* (max window from WIKIPEDIA_LIMITER_MAX)."""
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            # Waiting for a pooled connection would count as latency, so the window stays within the pool
+            max_limit = min(settings.WIKIPEDIA_LIMITER_MAX, settings.WIKIPEDIA_CONNECTIONS_PER_HOST)
+            limiter = AdaptiveConcurrencyLimiter(max_limit=max_limit)
+            _limiters[host] = limiter
+        return limiter
+
+
+def get_limiter_stats() -> dict[str, dict[str, Any]]:
+    """Get the statistics of every host limiter."""
+    with _limiters_lock:
+        return {host: limiter.get_stats() for host, limiter in _limiters.items()}
+
+
+__all__ = ["AdaptiveConcurrencyLimiter", "get_host_limiter", "get_limiter_stats"]
@@ -0,0 +1,114 @@
+"""Process-wide HTTP session for Wikipedia traffic.
+
+The FastAPI lifespan opens one ``aiohttp.ClientSession`` with a keep-alive
+connection pool that every ``WikipediaAPIClient`` reuses, so requests skip the
+TCP/TLS handshake and DNS lookup once a connection to the host exists. Clients
+created outside the application (scripts, tests) fall back to a private session.
+
+aiohttp speaks HTTP/1.1 without request pipelining: concurrency per host is
+bounded by the number of pooled connections (``WIKIPEDIA_CONNECTIONS_PER_HOST``),
+each carrying one request at a time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from loguru import logger
+
+from app.core.settings import settings
+
+USER_AGENT = "EntityExtractorBatch/1.0 (https://github.com/example/entityextractor)"
+
+_stats = {
+    "requests": 0,
+    "connections_created": 0,
+    "connections_reused": 0,
+    "dns_cache_hits": 0,
+    "dns_cache_misses": 0,
+}
+
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _count(key: str):
+    async def _handler(_session: aiohttp.ClientSession, _context: SimpleNamespace, _params: Any) -> None:
+        _stats[key] += 1
+
+    return _handler
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    """Trace hooks feeding the connection-level metrics."""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_count("requests"))
+    trace_config.on_connection_create_end.append(_count("connections_created"))
+    trace_config.on_connection_reuseconn.append(_count("connections_reused"))
+    trace_config.on_dns_cache_hit.append(_count("dns_cache_hits"))
+    trace_config.on_dns_cache_miss.append(_count("dns_cache_misses"))
+    return trace_config
+
+
+def create_session(timeout: float | None = None) -> aiohttp.ClientSession:
+    """Create a Wikipedia session with keep-alive pooling and connection tracing."""
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=settings.WIKIPEDIA_CONNECTIONS_PER_HOST,
+        keepalive_timeout=settings.WIKIPEDIA_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=300,
+        use_dns_cache=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout or settings.WIKIPEDIA_TIMEOUT),
+        headers={"User-Agent": USER_AGENT},
+        trace_configs=[_trace_config()],
+    )
+
+
+async def open_shared_session() -> aiohttp.ClientSession:
+    """Open the shared session (called from the application lifespan)."""
+    global _session, _session_loop
+    if _session is None or _session.closed:
+        _session = create_session()
+        _session_loop = asyncio.get_running_loop()
+        logger.info(
+            f"Opened shared Wikipedia session (connections per host: {settings.WIKIPEDIA_CONNECTIONS_PER_HOST})"
+        )
+    return _session
+
+
+async def close_shared_session() -> None:
+    """Close the shared session (called on application shutdown)."""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
+def get_shared_session() -> aiohttp.ClientSession | None:
+    """Return the shared session if it is open and belongs to the running event loop."""
+    if _session is None or _session.closed:
+        return None
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return _session if loop is _session_loop else None
+
+
+def get_session_stats() -> dict[str, Any]:
+    """Get connection-level metrics of all Wikipedia sessions."""
+    stats: dict[str, Any] = dict(_stats)
+    opened = stats["connections_created"] + stats["connections_reused"]
+    stats["reuse_ratio"] = round(stats["connections_reused"] / opened, 3) if opened else None
+    stats["shared_session_open"] = _session is not None and not _session.closed
+    return stats
+
+
+__all__ = ["close_shared_session", "create_session", "get_session_stats", "get_shared_session", "open_shared_session"]
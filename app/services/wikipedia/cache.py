@@ -0,0 +1,435 @@
+"""Wikipedia caches.
+
+``WikipediaPageCache`` stores parsed MediaWiki page data and the redirect mapping
+per (language, title) in a small SQLite database under ``settings.CACHE_DIR``.
+Entries expire after a TTL and the least recently used ones are evicted once the
+size cap is reached. Every entry remembers the MediaWiki props it was fetched with
+and only answers requests that need no more than those. The same database keeps a
+negative cache of labels that no fallback strategy could resolve, with its own
+(shorter) TTL.
+
+Lookups are read-only: the access times that drive LRU eviction are collected in
+memory and written together with the next store (or once enough have piled up),
+so a cache hit costs no write transaction. The methods are blocking; async
+callers run them in a worker thread (``asyncio.to_thread``) so SQLite I/O never
+stalls the event loop.
+
+``EntityLookupCache`` is the in-process L1 in front of the fallback chain: an LRU
+of resolved pages keyed by (label, language) that also coalesces concurrent
+lookups of the same key into a single fetch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+import copy
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from loguru import logger
+
+from app.core.settings import settings
+
+from .constants import ALL_PROPS, PageDataMap, RedirectMap, props_key
+from .models import WikiPage
+
+CACHE_FILENAME = "wikipedia.sqlite3"
+# Pending access times written in one transaction once this many have accumulated
+_TOUCH_FLUSH_SIZE = 256
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_title(title: str) -> str:
+    """Return the cache key for *title* (MediaWiki treats the first letter case-insensitively)."""
+    normalized = _WHITESPACE_RE.sub(" ", title.replace("_", " ")).strip()
+    return normalized[:1].upper() + normalized[1:]
+
+
+class WikipediaPageCache:
+    """SQLite-backed page cache with TTL expiry and LRU eviction."""
+
+    def __init__(self, path: str, ttl: int = 7 * 24 * 3600, max_entries: int = 50000, negative_ttl: int = 6 * 3600):
+        """Open or create the SQLite cache at *path* (*negative_ttl* 0 disables the negative cache)."""
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._touched: dict[tuple[str, str], float] = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0,
+            "negative_hits": 0,
+            "negative_stores": 0,
+        }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                lang TEXT NOT NULL,
+                title_key TEXT NOT NULL,
+                final_title TEXT NOT NULL,
+                page_json TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                props TEXT NOT NULL,
+                PRIMARY KEY (lang, title_key)
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pages)")}
+        if "props" not in columns:
+            # Caches written before prop selection hold pages fetched with every prop
+            self._conn.execute(f"ALTER TABLE pages ADD COLUMN props TEXT NOT NULL DEFAULT '{props_key(ALL_PROPS)}'")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at)")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS negative (
+                lang TEXT NOT NULL,
+                label_key TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (lang, label_key)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def lookup(
+        self, titles: list[str], lang: str, props: frozenset[str] = ALL_PROPS
+    ) -> tuple[PageDataMap, RedirectMap, list[str]]:
+        """
+        Look up *titles* in the cache.
+
+        Args:
+            titles: Requested page titles
+            lang: Language code
+            props: MediaWiki props the caller needs (entries fetched with fewer props miss)
+
+        Returns:
+            Tuple of (pages_data keyed by final title, redirects from requested to final title,
+            titles that were not cached)
+        """
+        pages_data: PageDataMap = {}
+        redirects: RedirectMap = {}
+        missing: list[str] = []
+        now = time.time()
+
+        with self._lock:
+            for title in titles:
+                title_key = normalize_title(title)
+                row = self._conn.execute(
+                    "SELECT final_title, page_json, created_at, props FROM pages WHERE lang = ? AND title_key = ?",
+                    (lang, title_key),
+                ).fetchone()
+                if row is None or not props <= set(row[3].split("|")):
+                    self._stats["misses"] += 1
+                    missing.append(title)
+                    continue
+
+                final_title, page_json, created_at, _props = row
+                if now - created_at > self.ttl:
+                    # Left in place: the refetched page replaces it, or eviction drops it
+                    self._stats["expired"] += 1
+                    self._stats["misses"] += 1
+                    missing.append(title)
+                    continue
+
+                self._touched[(lang, title_key)] = now
+                self._stats["hits"] += 1
+                pages_data[final_title] = json.loads(page_json)
+                if final_title != title:
+                    redirects[title] = final_title
+            if len(self._touched) >= _TOUCH_FLUSH_SIZE:
+                self._flush_touched()
+                self._conn.commit()
+
+        return pages_data, redirects, missing
+
+    def store(
+        self,
+        titles: list[str],
+        lang: str,
+        pages_data: PageDataMap,
+        redirects: RedirectMap,
+        props: frozenset[str] = ALL_PROPS,
+    ) -> None:
+        """
+        Store the result of a batch query for *titles*.
+
+        Args:
+            titles: Titles that were requested from the API
+            lang: Language code
+            pages_data: Pages keyed by final title
+            redirects: Redirect map from requested to final title
+            props: MediaWiki props the pages were fetched with
+        """
+        now = time.time()
+        stored_props = props_key(props)
+        rows = []
+        for title in titles:
+            final_title = redirects.get(title, title)
+            page = pages_data.get(final_title)
+            if page is None:
+                continue
+            page_json = json.dumps(page, ensure_ascii=False)
+            rows.append((lang, normalize_title(title), final_title, page_json, now, now, stored_props))
+            if normalize_title(final_title) != normalize_title(title):
+                rows.append((lang, normalize_title(final_title), final_title, page_json, now, now, stored_props))
+
+        if not rows:
+            return
+
+        with self._lock:
+            self._flush_touched()
+            self._conn.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._stats["stores"] += len(rows)
+            self._evict()
+            self._conn.commit()
+
+    def _flush_touched(self) -> None:
+        """Write the pending access times of cache hits (lock must be held, caller commits)."""
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE pages SET accessed_at = ? WHERE lang = ? AND title_key = ?",
+            [(accessed_at, lang, title_key) for (lang, title_key), accessed_at in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries above the size cap (lock must be held)."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM pages WHERE rowid IN (SELECT rowid FROM pages ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+            self._stats["evictions"] += overflow
+            logger.debug(f"Evicted {overflow} least recently used Wikipedia cache entries")
+
+    def is_known_miss(self, label: str, lang: str) -> bool:
+        """Return True if *label* recently failed every fallback strategy."""
+        if self.negative_ttl <= 0:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at FROM negative WHERE lang = ? AND label_key = ?", (lang, normalize_title(label))
+            ).fetchone()
+            if row is None or time.time() - row[0] > self.negative_ttl:
+                return False
+            self._stats["negative_hits"] += 1
+            return True
+
+    def known_misses(self, labels: list[str], lang: str) -> set[str]:
+        """Return the labels of *labels* that recently failed every fallback strategy."""
+        return {label for label in labels if self.is_known_miss(label, lang)}
+
+    def store_miss(self, label: str, lang: str) -> None:
+        """Remember that *label* could not be resolved in *lang*."""
+        if self.negative_ttl <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            # Expired entries are only read as misses, so they are purged here
+            self._conn.execute("DELETE FROM negative WHERE created_at < ?", (now - self.negative_ttl,))
+            self._conn.execute("INSERT OR REPLACE INTO negative VALUES (?, ?, ?)", (lang, normalize_title(label), now))
+            self._stats["negative_stores"] += 1
+            self._conn.commit()
+
+    def invalidate_misses(self, label: str | None = None, lang: str | None = None) -> int:
+        """
+        Forget negative results.
+
+        Args:
+            label: Only forget this label (all labels if None)
+            lang: Only forget entries of this language (all languages if None)
+
+        Returns:
+            Number of removed entries
+        """
+        label_key = normalize_title(label) if label is not None else None
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM negative WHERE (? IS NULL OR label_key = ?) AND (? IS NULL OR lang = ?)",
+                (label_key, label_key, lang, lang),
+            ).rowcount
+            self._conn.commit()
+        logger.info(f"Removed {removed} negative Wikipedia cache entries")
+        return removed
+
+    def clear(self) -> None:
+        """Remove all cached pages and negative results."""
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM negative")
+            self._conn.commit()
+
+    def get_stats(self) -> dict[str, int]:
+        """Get cache statistics."""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+            (negative_entries,) = self._conn.execute("SELECT COUNT(*) FROM negative").fetchone()
+        return {**self._stats, "entries": entries, "negative_entries": negative_entries}
+
+
+class EntityLookupCache:
+    """In-memory LRU of resolved pages with request coalescing for in-flight lookups."""
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 3600.0):
+        """Keep up to *max_entries* resolved pages for *ttl* seconds each."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str, str], tuple[float, WikiPage]] = OrderedDict()
+        self._in_flight: dict[tuple[str, str, str], asyncio.Future] = {}
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    @staticmethod
+    def _key(label: str, lang: str, variant: str) -> tuple[str, str, str]:
+        return normalize_title(label), lang, variant
+
+    def get(self, label: str, lang: str, variant: str = "") -> WikiPage | None:
+        """Return a copy of the cached page for (label, lang, variant), if present and fresh."""
+        key = self._key(label, lang, variant)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, page = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(page)
+
+    def put(self, label: str, lang: str, page: WikiPage, variant: str = "") -> None:
+        """Cache a resolved page for (label, lang, variant)."""
+        if self.max_entries <= 0:
+            return
+        key = self._key(label, lang, variant)
+        self._entries[key] = (time.monotonic(), copy.deepcopy(page))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_fetch(
+        self, label: str, lang: str, fetch: Callable[[], Awaitable[WikiPage | None]], variant: str = ""
+    ) -> WikiPage | None:
+        """
+        Return the cached page for (label, lang, variant) or resolve it with *fetch*.
+
+        Concurrent callers for the same key share one in-flight fetch. Only found
+        pages are cached; misses and errors are returned to every waiting caller.
+
+        Args:
+            label: Entity label
+            lang: Language code
+            fetch: Coroutine factory performing the actual lookup
+            variant: Distinguishes lookups of the same label with different field selections
+
+        Returns:
+            WikiPage if found, None otherwise
+        """
+        page = self.get(label, lang, variant)
+        if page is not None:
+            self._stats["hits"] += 1
+            return page
+
+        key = self._key(label, lang, variant)
+        loop = asyncio.get_running_loop()
+        pending = self._in_flight.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            self._stats["coalesced"] += 1
+            try:
+                return copy.deepcopy(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The owning lookup was cancelled - resolve the key ourselves
+
+        self._stats["misses"] += 1
+        future = loop.create_future()
+        self._in_flight[key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # mark as retrieved when nobody else is waiting
+            raise
+        else:
+            future.set_result(result)
+            if result is not None:
+                self.put(label, lang, result, variant)
+            return result
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def clear(self) -> None:
+        """Drop all cached lookups."""
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        """Get cache statistics."""
+        return {**self._stats, "entries": len(self._entries), "in_flight": len(self._in_flight)}
+
+
+_lookup_cache: EntityLookupCache | None = None
+
+
+def get_lookup_cache() -> EntityLookupCache:
+    """Return the process-wide entity lookup cache."""
+    global _lookup_cache
+    if _lookup_cache is None:
+        _lookup_cache = EntityLookupCache(
+            max_entries=settings.WIKIPEDIA_LOOKUP_CACHE_SIZE, ttl=settings.WIKIPEDIA_LOOKUP_CACHE_TTL
+        )
+    return _lookup_cache
+
+
+_caches: dict[str, WikipediaPageCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_page_cache() -> WikipediaPageCache | None:
+    """Return the process-wide page cache for the configured CACHE_DIR (None if disabled)."""
+    if not settings.WIKIPEDIA_CACHE_ENABLED:
+        return None
+
+    path = os.path.join(settings.CACHE_DIR, CACHE_FILENAME)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            try:
+                cache = WikipediaPageCache(
+                    path,
+                    ttl=settings.WIKIPEDIA_CACHE_TTL,
+                    max_entries=settings.WIKIPEDIA_CACHE_MAX_ENTRIES,
+                    negative_ttl=settings.WIKIPEDIA_NEGATIVE_CACHE_TTL,
+                )
+            except sqlite3.Error as e:
+                logger.error(f"Wikipedia page cache unavailable at {path}: {e}")
+                return None
+            _caches[path] = cache
+        return cache
+
+
+__all__ = ["EntityLookupCache", "WikipediaPageCache", "get_lookup_cache", "get_page_cache", "normalize_title"]
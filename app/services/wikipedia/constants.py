@@ -1,5 +1,6 @@
 """Wikipedia service constants and type definitions."""
 
+from collections.abc import Iterable
 from typing import Any, TypeVar
 
 # Constants
@@ -9,8 +10,44 @@ JITTER = 0.2  # Random jitter to prevent thundering herd
 CHUNK_SIZE = 40  # Keep under 50 (Wikipedia API limit)
 WIKIPEDIA_API_URL = "https://{lang}.wikipedia.org/w/api.php"
 
+# MediaWiki props: always needed for linking (title, abstract, Wikidata id, infobox, other language)
+BASE_PROPS = frozenset({"extracts", "pageprops", "langlinks"})
+# Optional output fields and the MediaWiki prop each one needs
+FIELD_PROPS = {
+    "categories": "categories",
+    "coordinates": "coordinates",
+    "internal_links": "links",
+    "thumbnail": "pageimages",
+}
+ALL_PROPS = BASE_PROPS | frozenset(FIELD_PROPS.values())
+# Continuation parameter of each prop module (MediaWiki truncates prop results per request)
+CONTINUE_PARAMS = {
+    "excontinue": "extracts",
+    "ppcontinue": "pageprops",
+    "llcontinue": "langlinks",
+    "clcontinue": "categories",
+    "cocontinue": "coordinates",
+    "plcontinue": "links",
+    "picontinue": "pageimages",
+}
+
 # Type Aliases
 T = TypeVar("T")
 PageData = dict[str, Any]
 PageDataMap = dict[str, PageData]
 RedirectMap = dict[str, str]
+
+
+def props_for_fields(fields: Iterable[str] | None) -> frozenset[str]:
+    """Return the MediaWiki props needed for the optional output *fields* (all props if None)."""
+    if fields is None:
+        return ALL_PROPS
+    unknown = set(fields) - FIELD_PROPS.keys()
+    if unknown:
+        raise ValueError(f"Unknown Wikipedia fields {sorted(unknown)}, expected some of {sorted(FIELD_PROPS)}")
+    return BASE_PROPS | frozenset(FIELD_PROPS[field] for field in fields)
+
+
+def props_key(props: Iterable[str]) -> str:
+    """Return a stable string for a prop set (used in cache keys and the ``prop`` parameter)."""
+    return "|".join(sorted(props))
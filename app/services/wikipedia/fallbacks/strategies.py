@@ -1,17 +1,38 @@
 """Fallback strategies for Wikipedia entity linking."""
 
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any
+
 from loguru import logger
 
+from app.core.settings import settings
+
+from ..constants import ALL_PROPS, CHUNK_SIZE, PageDataMap, RedirectMap
 from ..models import WikiPage
+from ..resolvers import PageResolver
 from ..utils.data_processor import WikipediaDataProcessor
 
 
 class WikipediaFallbackStrategies:
     """Collection of fallback strategies for Wikipedia entity linking."""
 
-    def __init__(self, api_client):
-        self.api_client = api_client
+    def __init__(
+        self,
+        resolver: PageResolver,
+        hedged: bool | None = None,
+        hedge_delay: float | None = None,
+        props: frozenset[str] = ALL_PROPS,
+    ):
+        self.resolver = resolver
+        self.props = props
         self.data_processor = WikipediaDataProcessor()
+        self.hedged = settings.WIKIPEDIA_HEDGED_FALLBACKS if hedged is None else hedged
+        self.hedge_delay = settings.WIKIPEDIA_HEDGE_DELAY if hedge_delay is None else hedge_delay
+        self._stats: dict[str, Any] = {"wins": Counter(), "unresolved": 0, "cancelled": 0, "synonym_batches": 0}
+        # (lang, entity name) -> running batched synonym lookup covering that name
+        self._synonym_batches: dict[tuple[str, str], asyncio.Task] = {}
 
     def is_page_complete(self, page: WikiPage) -> bool:
         """Check if a WikiPage has sufficient data for linking."""
@@ -28,31 +49,67 @@ class WikipediaFallbackStrategies:
             lang: Language to search in ('de' or 'en')
 
         Returns:
-            WikiPage if found, None otherwise
+            WikiPage if found, None otherwise (lookup errors propagate to the fallback chain)
         """
         logger.debug(f"[DIRECT] Looking up '{entity_name}' in {lang}")
 
-        try:
-            # Fetch single page using API client
-            pages_data, redirects = await self.api_client.fetch_pages_batch([entity_name], lang=lang)
-
-            # Check if we found data
-            final_title = redirects.get(entity_name, entity_name)
-            if final_title in pages_data:
-                # Create WikiPage and merge data
-                wiki_page = WikiPage()
-                self.data_processor.merge_page_data(wiki_page, pages_data[final_title], lang)
-
-                logger.debug(f"[DIRECT] Found '{entity_name}' -> '{final_title}' in {lang}")
-                return wiki_page
-            else:
-                logger.debug(f"[DIRECT] No data found for '{entity_name}' in {lang}")
-                return None
+        # Fetch single page through the resolver chain
+        pages_data, redirects = await self.resolver.resolve([entity_name], lang, self.props)
+        return self._page_from_batch(entity_name, pages_data, redirects, lang)
 
-        except Exception as e:
-            logger.error(f"[DIRECT] Error in direct lookup for '{entity_name}': {e}")
+    async def direct_lookup_batch(
+        self, entity_names: list[str], lang: str, strict: bool = False
+    ) -> dict[str, WikiPage | None]:
+        """
+        Direct lookup for many entities with one MediaWiki query per chunk of titles.
+
+        Args:
+            entity_names: Entity names to search for
+            lang: Language to search in ('de' or 'en')
+            strict: Raise the error of a failing chunk instead of omitting its names
+
+        Returns:
+            Mapping of every requested name to its WikiPage (None if not found)
+        """
+        unique_names = [name for name in dict.fromkeys(entity_names) if name and name.strip()]
+        if not unique_names:
+            return {}
+
+        logger.debug(f"[DIRECT] Batch lookup of {len(unique_names)} titles in {lang}")
+        chunks = [unique_names[i : i + CHUNK_SIZE] for i in range(0, len(unique_names), CHUNK_SIZE)]
+        responses = await asyncio.gather(
+            *(self.resolver.resolve(chunk, lang, self.props) for chunk in chunks), return_exceptions=True
+        )
+
+        results: dict[str, WikiPage | None] = {}
+        for chunk, response in zip(chunks, responses, strict=True):
+            if isinstance(response, BaseException):
+                if strict:
+                    raise response
+                logger.error(f"[DIRECT] Batch lookup failed for {len(chunk)} titles: {response}")
+                continue
+            pages_data, redirects = response
+            for name in chunk:
+                results[name] = self._page_from_batch(name, pages_data, redirects, lang)
+
+        return results
+
+    def _page_from_batch(
+        self, entity_name: str, pages_data: PageDataMap, redirects: RedirectMap, lang: str
+    ) -> WikiPage | None:
+        """Build the WikiPage for *entity_name* from a batch response, following redirects."""
+        final_title = redirects.get(entity_name, entity_name)
+        if final_title not in pages_data:
+            logger.debug(f"[DIRECT] No data found for '{entity_name}' in {lang}")
             return None
 
+        # Create WikiPage and merge data
+        wiki_page = WikiPage()
+        self.data_processor.merge_page_data(wiki_page, pages_data[final_title], lang)
+
+        logger.debug(f"[DIRECT] Found '{entity_name}' -> '{final_title}' in {lang}")
+        return wiki_page
+
     async def language_fallback(self, entity_name: str, lang: str) -> WikiPage | None:
         """
         Try to find the entity in the specified language.
@@ -66,12 +123,8 @@ class WikipediaFallbackStrategies:
         """
         logger.debug(f"[FALLBACK] Language fallback for '{entity_name}' in {lang}")
 
-        try:
-            # Use direct lookup in the fallback language
-            return await self.direct_lookup(entity_name, lang)
-        except Exception as e:
-            logger.error(f"Language fallback failed for '{entity_name}': {e}")
-            return None
+        # Use direct lookup in the fallback language
+        return await self.direct_lookup(entity_name, lang)
 
     async def opensearch_fallback(self, entity_name: str, lang: str) -> WikiPage | None:
         """
@@ -86,36 +139,25 @@ class WikipediaFallbackStrategies:
         """
         logger.debug(f"[FALLBACK] OpenSearch fallback for '{entity_name}' in {lang}")
 
-        try:
-            # For now, try a simple capitalization fix as basic "search"
-            # This could be extended to use the actual OpenSearch API
-            capitalized = entity_name.title()
-            if capitalized != entity_name:
-                logger.debug(f"[FALLBACK] Trying capitalized version: '{capitalized}'")
-                page = await self.direct_lookup(capitalized, lang)
-                if page and self.is_page_complete(page):
-                    logger.info(f"[FALLBACK] Found '{entity_name}' via capitalization '{capitalized}'")
-                    return page
-
-            # Try lowercase version
-            lowercase = entity_name.lower()
-            if lowercase != entity_name:
-                logger.debug(f"[FALLBACK] Trying lowercase version: '{lowercase}'")
-                page = await self.direct_lookup(lowercase, lang)
-                if page and self.is_page_complete(page):
-                    logger.info(f"[FALLBACK] Found '{entity_name}' via lowercase '{lowercase}'")
-                    return page
-
-            logger.debug(f"[FALLBACK] OpenSearch fallback found nothing for '{entity_name}'")
-            return None
-        except Exception as e:
-            logger.error(f"OpenSearch fallback failed for '{entity_name}': {e}")
-            return None
+        # For now, try simple capitalization fixes as basic "search" (one batched query)
+        # This could be extended to use the actual OpenSearch API
+        candidates = [name for name in (entity_name.title(), entity_name.lower()) if name != entity_name]
+        page, candidate = await self._first_complete(candidates, lang)
+        if page:
+            logger.info(f"[FALLBACK] Found '{entity_name}' via case variant '{candidate}'")
+            return page
+
+        logger.debug(f"[FALLBACK] OpenSearch fallback found nothing for '{entity_name}'")
+        return None
 
     async def synonym_fallback(self, entity_name: str, lang: str) -> WikiPage | None:
         """
         Try common variations and synonyms of the entity name.
 
+        All simple variations are resolved with one batched query; only if none
+        matches are LLM synonyms generated and resolved with a second batched query.
+        Names covered by :meth:`prefetch_synonyms` take their result from that batch.
+
         Args:
             entity_name: Entity name to search for
             lang: Language to search in
@@ -125,39 +167,151 @@ class WikipediaFallbackStrategies:
         """
         logger.debug(f"[FALLBACK] Synonym fallback for '{entity_name}' in {lang}")
 
-        try:
-            # First try simple variations (fast)
-            variations = self._generate_name_variations(entity_name)
-
-            for variation in variations:
-                logger.debug(f"[FALLBACK] Trying variation: '{variation}'")
-                page = await self.direct_lookup(variation, lang)
-                if page and self.is_page_complete(page):
-                    logger.info(f"[FALLBACK] Found '{entity_name}' via variation '{variation}'")
-                    return page
-
-            # If simple variations failed, try intelligent synonyms (slower but more effective)
-            logger.debug(f"[FALLBACK] Trying intelligent synonym generation for '{entity_name}'")
-            try:
-                from app.core.utils import generate_synonyms
+        batch = self._synonym_batches.get((lang, entity_name))
+        if batch is not None:
+            # Answered by the batched synonym stage; shielded so a cancelled hedge does not stop the batch
+            results = await asyncio.shield(batch)
+            if entity_name in results:
+                page, candidate = results[entity_name]
+                if page:
+                    logger.info(f"[FALLBACK] Found '{entity_name}' via batched candidate '{candidate}'")
+                return page
 
-                intelligent_synonyms = generate_synonyms(entity_name, max_synonyms=3, lang=lang)
+        # First try simple variations (fast)
+        variations = self._generate_name_variations(entity_name)
+        logger.debug(f"[FALLBACK] Trying {len(variations)} variations: {variations}")
+        page, variation = await self._first_complete(variations, lang)
+        if page:
+            logger.info(f"[FALLBACK] Found '{entity_name}' via variation '{variation}'")
+            return page
 
-                for synonym in intelligent_synonyms:
-                    logger.debug(f"[FALLBACK] Trying intelligent synonym: '{synonym}'")
-                    page = await self.direct_lookup(synonym, lang)
-                    if page and self.is_page_complete(page):
-                        logger.info(f"[FALLBACK] Found '{entity_name}' via intelligent synonym '{synonym}'")
-                        return page
+        # If simple variations failed, try intelligent synonyms (slower but more effective)
+        logger.debug(f"[FALLBACK] Trying intelligent synonym generation for '{entity_name}'")
+        from app.core.utils import generate_synonyms_async
 
-            except Exception as e:
-                logger.warning(f"[FALLBACK] Intelligent synonym generation failed for '{entity_name}': {e}")
+        intelligent_synonyms = await generate_synonyms_async(entity_name, max_synonyms=3, lang=lang, strict=True)
 
-            logger.debug(f"[FALLBACK] No variations or synonyms found for '{entity_name}'")
+        candidates = [synonym for synonym in intelligent_synonyms if synonym not in variations]
+        page, synonym = await self._first_complete(candidates, lang)
+        if page:
+            logger.info(f"[FALLBACK] Found '{entity_name}' via intelligent synonym '{synonym}'")
+            return page
+
+        logger.debug(f"[FALLBACK] No variations or synonyms found for '{entity_name}'")
+        return None
+
+    def prefetch_synonyms(self, entity_names: list[str], lang: str) -> asyncio.Task | None:
+        """
+        Start one batched variation and synonym lookup for many entities.
+
+        The simple variations of every name are resolved with one batched query;
+        a single LLM call then returns the synonyms of the names no variation
+        matched, and those are resolved with a second batched query.
+        ``synonym_fallback`` of these names waits for this batch instead of
+        running both passes per entity.
+
+        Args:
+            entity_names: Entity names the direct lookup could not resolve
+            lang: Language to search in
+
+        Returns:
+            The running batch (None if every name is already covered)
+        """
+        names = [
+            name
+            for name in dict.fromkeys(entity_names)
+            if name and name.strip() and (lang, name) not in self._synonym_batches
+        ]
+        if not names:
             return None
+
+        task = asyncio.create_task(self._resolve_synonym_batch(names, lang), name="synonym-batch")
+        for name in names:
+            self._synonym_batches[(lang, name)] = task
+        self._stats["synonym_batches"] += 1
+        return task
+
+    async def _resolve_synonym_batch(
+        self, entity_names: list[str], lang: str
+    ) -> dict[str, tuple[WikiPage | None, str | None]]:
+        """Resolve the variations of all *entity_names*, then the LLM synonyms of those still unresolved."""
+        from app.core.utils import generate_synonyms_batch_async
+
+        variations = {name: self._generate_name_variations(name) for name in entity_names}
+        try:
+            pages = await self.direct_lookup_batch(
+                [v for options in variations.values() for v in options], lang, strict=True
+            )
         except Exception as e:
-            logger.error(f"Synonym fallback failed for '{entity_name}': {e}")
-            return None
+            # Names missing from the result fall back to the per-entity passes
+            logger.warning(f"[FALLBACK] Batched variation lookup failed for {len(entity_names)} entities: {e}")
+            return {}
+
+        results: dict[str, tuple[WikiPage | None, str | None]] = {}
+        unresolved: list[str] = []
+        for name, options in variations.items():
+            page, variation = self._pick_complete(options, pages)
+            if page:
+                results[name] = (page, variation)
+            else:
+                unresolved.append(name)
+        logger.debug(
+            f"[FALLBACK] Batched variations resolved {len(results)} of {len(entity_names)} entities; "
+            f"{len(unresolved)} go to the synonym LLM call"
+        )
+        if not unresolved:
+            return results
+
+        try:
+            synonyms = await generate_synonyms_batch_async(unresolved, max_synonyms=3, lang=lang, strict=True)
+            candidates = {
+                name: [synonym for synonym in synonyms.get(name, []) if synonym not in variations[name]]
+                for name in unresolved
+            }
+            pages = await self.direct_lookup_batch(
+                [c for options in candidates.values() for c in options], lang, strict=True
+            )
+        except Exception as e:
+            # Names missing from the result fall back to per-entity synonym generation
+            logger.warning(f"[FALLBACK] Batched synonym lookup failed for {len(unresolved)} entities: {e}")
+            return results
+
+        for name, options in candidates.items():
+            results[name] = self._pick_complete(options, pages)
+        return results
+
+    async def close(self) -> None:
+        """Cancel batched synonym lookups that are still running."""
+        pending = {task for task in self._synonym_batches.values() if not task.done()}
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._synonym_batches.clear()
+
+    async def _first_complete(self, candidates: list[str], lang: str) -> tuple[WikiPage | None, str | None]:
+        """
+        Resolve all *candidates* with one batched lookup and pick the preferred one.
+
+        Args:
+            candidates: Candidate titles in order of preference
+            lang: Language to search in
+
+        Returns:
+            Tuple of (first complete page in candidate order, the candidate that produced it)
+        """
+        if not candidates:
+            return None, None
+        return self._pick_complete(candidates, await self.direct_lookup_batch(candidates, lang, strict=True))
+
+    def _pick_complete(
+        self, candidates: list[str], pages: dict[str, WikiPage | None]
+    ) -> tuple[WikiPage | None, str | None]:
+        """Return the first complete page of *candidates* in *pages* and the candidate that produced it."""
+        for candidate in candidates:
+            page = pages.get(candidate)
+            if page and self.is_page_complete(page):
+                return page, candidate
+        return None, None
 
     async def beautifulsoup_fallback(self, entity_name: str, lang: str) -> WikiPage | None:
         """
@@ -181,69 +335,149 @@ class WikipediaFallbackStrategies:
             return None
 
     async def fetch_with_fallbacks(
-        self, entity_name: str, lang: str = "de", enable_fallbacks: bool = True
-    ) -> WikiPage | None:
+        self, entity_name: str, lang: str = "de", enable_fallbacks: bool = True, skip_direct: bool = False
+    ) -> tuple[WikiPage | None, bool]:
         """
         Fetch Wikipedia page with multiple fallback strategies.
 
+        In hedged mode the strategies run concurrently: the next one starts after
+        ``hedge_delay`` seconds or as soon as all running ones came back empty, the
+        first complete page wins and the remaining strategies are cancelled.
+        Otherwise they run strictly one after another in chain order.
+
         Args:
             entity_name: Entity name to search for
             lang: Primary language to search in
             enable_fallbacks: Whether to use fallback strategies
+            skip_direct: Skip the direct lookup (already answered by a batched query)
 
         Returns:
-            WikiPage if found, None otherwise
+            Tuple of (WikiPage if found, ``resolved_by`` naming the winning strategy;
+            whether every strategy finished without an error). Only a missing page
+            with every strategy finished means the entity is unresolvable.
         """
-        logger.debug(f"Fetching '{entity_name}' with fallbacks enabled: {enable_fallbacks}")
+        logger.debug(f"Fetching '{entity_name}' with fallbacks enabled: {enable_fallbacks} (hedged: {self.hedged})")
+
+        chain = self._strategy_chain(entity_name, lang, enable_fallbacks, skip_direct)
+        if self.hedged and len(chain) > 1:
+            page, exhausted = await self._run_hedged(entity_name, chain)
+        else:
+            page, exhausted = await self._run_sequential(entity_name, chain)
+
+        if page is None:
+            self._stats["unresolved"] += 1
+            logger.warning(f"All fallback strategies failed for '{entity_name}' (all finished: {exhausted})")
+        return page, exhausted
+
+    def _strategy_chain(
+        self, entity_name: str, lang: str, enable_fallbacks: bool, skip_direct: bool
+    ) -> list[tuple[str, Callable[[], Awaitable[WikiPage | None]]]]:
+        """Return the (name, coroutine factory) pairs of the fallback chain in priority order."""
+        chain: list[tuple[str, Callable[[], Awaitable[WikiPage | None]]]] = []
 
         # Strategy 1: Direct lookup
-        try:
-            page = await self.direct_lookup(entity_name, lang)
-            if page and self.is_page_complete(page):
-                logger.info(f"Found '{entity_name}' via direct lookup")
-                return page
-        except Exception as e:
-            logger.warning(f"Direct lookup failed for '{entity_name}': {e}")
+        if not skip_direct:
+            chain.append(("direct", lambda: self.direct_lookup(entity_name, lang)))
 
         if not enable_fallbacks:
-            return None
+            return chain
 
         # Strategy 2: Language fallback (if not primary language)
         if lang != "de":  # Try German if we're not already searching in German
-            try:
-                page = await self.language_fallback(entity_name, "de")
-                if page and self.is_page_complete(page):
-                    logger.info(f"Found '{entity_name}' via German fallback")
-                    return page
-            except Exception as e:
-                logger.warning(f"German fallback failed for '{entity_name}': {e}")
+            chain.append(("language_de", lambda: self.language_fallback(entity_name, "de")))
 
         # Strategy 3: Synonym/variation fallback
-        try:
-            page = await self.synonym_fallback(entity_name, lang)
-            if page and self.is_page_complete(page):
-                logger.info(f"Found '{entity_name}' via synonym fallback")
-                return page
-        except Exception as e:
-            logger.warning(f"Synonym fallback failed for '{entity_name}': {e}")
+        chain.append(("synonym", lambda: self.synonym_fallback(entity_name, lang)))
 
         # Strategy 4: OpenSearch fallback
-        try:
-            page = await self.opensearch_fallback(entity_name, lang)
-            if page and self.is_page_complete(page):
-                logger.info(f"Found '{entity_name}' via OpenSearch fallback")
-                return page
-        except Exception as e:
-            logger.warning(f"OpenSearch fallback failed for '{entity_name}': {e}")
+        chain.append(("opensearch", lambda: self.opensearch_fallback(entity_name, lang)))
 
         # Strategy 5: Web scraping fallback (last resort)
-        page = await self.beautifulsoup_fallback(entity_name, lang)
-        if page and self.is_page_complete(page):
-            logger.info(f"Found '{entity_name}' via web scraping fallback")
-            return page
+        chain.append(("scraping", lambda: self.beautifulsoup_fallback(entity_name, lang)))
 
-        logger.warning(f"All fallback strategies failed for '{entity_name}'")
-        return None
+        return chain
+
+    def _accept(self, entity_name: str, strategy: str, page: WikiPage | None) -> WikiPage | None:
+        """Return *page* marked with the winning *strategy* if it is complete."""
+        if not (page and self.is_page_complete(page)):
+            return None
+        page.resolved_by = strategy
+        self._stats["wins"][strategy] += 1
+        logger.info(f"Found '{entity_name}' via {strategy} strategy")
+        return page
+
+    async def _run_sequential(
+        self, entity_name: str, chain: list[tuple[str, Callable[[], Awaitable[WikiPage | None]]]]
+    ) -> tuple[WikiPage | None, bool]:
+        """Try the strategies one after another; the first complete page wins."""
+        exhausted = True
+        for strategy, run in chain:
+            try:
+                page = self._accept(entity_name, strategy, await run())
+            except Exception as e:
+                logger.warning(f"{strategy} strategy failed for '{entity_name}': {e}")
+                exhausted = False
+                continue
+            if page:
+                return page, True
+        return None, exhausted
+
+    async def _run_hedged(
+        self, entity_name: str, chain: list[tuple[str, Callable[[], Awaitable[WikiPage | None]]]]
+    ) -> tuple[WikiPage | None, bool]:
+        """Run the strategies as staggered hedges; the first complete page wins, the rest is cancelled."""
+        running: dict[asyncio.Task, int] = {}
+        next_index = 0
+        exhausted = True
+
+        def launch() -> None:
+            nonlocal next_index
+            strategy, run = chain[next_index]
+            running[asyncio.create_task(run(), name=f"fallback-{strategy}")] = next_index
+            next_index += 1
+
+        launch()
+        try:
+            while running:
+                timeout = self.hedge_delay if next_index < len(chain) else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Hedge: earlier strategies are slow, start the next one alongside them
+                    launch()
+                    continue
+
+                # Strategies finishing in the same round are ranked by chain order
+                for task in sorted(done, key=running.__getitem__):
+                    strategy = chain[running.pop(task)][0]
+                    try:
+                        page = self._accept(entity_name, strategy, task.result())
+                    except Exception as e:
+                        logger.warning(f"{strategy} strategy failed for '{entity_name}': {e}")
+                        exhausted = False
+                        continue
+                    if page:
+                        return page, True
+
+                if not running and next_index < len(chain):
+                    launch()
+            return None, exhausted
+        finally:
+            losers = [task for task in running if not task.done()]
+            if losers:
+                self._stats["cancelled"] += len(losers)
+                for task in losers:
+                    task.cancel()
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get fallback statistics (wins per strategy, unresolved entities, cancelled hedges)."""
+        return {
+            "hedged": self.hedged,
+            "wins": dict(self._stats["wins"]),
+            "unresolved": self._stats["unresolved"],
+            "cancelled": self._stats["cancelled"],
+            "synonym_batches": self._stats["synonym_batches"],
+        }
 
     def _generate_name_variations(self, entity_name: str) -> list[str]:
         """Generate common variations of an entity name."""
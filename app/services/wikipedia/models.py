@@ -24,6 +24,9 @@ class WikiPage:
     lat: float | None = None
     lon: float | None = None
 
+    # Name of the fallback strategy that produced this page
+    resolved_by: str | None = None
+
     # Computed properties
     @property
     def wiki_url_en(self) -> str | None:
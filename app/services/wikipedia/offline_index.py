@@ -0,0 +1,396 @@
+"""Offline Wikipedia index built from database dumps.
+
+The index is a read-only SQLite database holding, per language, the article
+titles, redirects, language links, lead-section abstracts and Wikidata ids of
+a Wikipedia dump. It is the first tier of the default resolver chain
+(``resolvers.OfflineIndexResolver``), so the live MediaWiki API is only asked
+for titles the index does not know. Pages served offline carry no categories,
+links, coordinates or thumbnails; requests for those fields skip the index.
+
+Build an index from the dump files of https://dumps.wikimedia.org/ (plain or
+gzip-compressed; all inputs except ``--page`` are optional)::
+
+    python -m app.services.wikipedia.offline_index --lang de --output cache/offline.sqlite3
+        --page dewiki-latest-page.sql.gz --redirect dewiki-latest-redirect.sql.gz
+        --langlinks dewiki-latest-langlinks.sql.gz --page-props dewiki-latest-page_props.sql.gz
+        --abstracts dewiki-latest-abstract.xml.gz
+
+Run the command once per language against the same output file to combine languages.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator
+import gzip
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import IO, Any
+import xml.etree.ElementTree as ET
+
+from loguru import logger
+
+from app.core.settings import settings
+
+from .cache import normalize_title
+from .constants import PageDataMap, RedirectMap
+
+# Column positions in the MediaWiki table dumps
+_PAGE_ID, _PAGE_NAMESPACE, _PAGE_TITLE, _PAGE_IS_REDIRECT = 0, 1, 2, 3
+_RD_FROM, _RD_NAMESPACE, _RD_TITLE, _RD_INTERWIKI = 0, 1, 2, 3
+_LL_FROM, _LL_LANG, _LL_TITLE = 0, 1, 2
+_PP_PAGE, _PP_PROPNAME, _PP_VALUE = 0, 1, 2
+
+_SQL_VALUE_RE = re.compile(r"'((?:[^'\\]|\\.)*)'|(NULL)|(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)")
+_SQL_ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+_SQL_ESCAPES = {"0": "\0", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a"}
+_ABSTRACT_TITLE_PREFIX = "Wikipedia: "
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    lang TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    pageid INTEGER NOT NULL,
+    is_redirect INTEGER NOT NULL DEFAULT 0,
+    extract TEXT,
+    wikibase_item TEXT,
+    PRIMARY KEY (lang, title_key)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_pageid ON pages (lang, pageid);
+CREATE TABLE IF NOT EXISTS redirects (
+    lang TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    target_title TEXT NOT NULL,
+    PRIMARY KEY (lang, title_key)
+);
+CREATE TABLE IF NOT EXISTS langlinks (
+    lang TEXT NOT NULL,
+    pageid INTEGER NOT NULL,
+    target_lang TEXT NOT NULL,
+    target_title TEXT NOT NULL,
+    PRIMARY KEY (lang, pageid, target_lang)
+);
+"""
+
+
+def _open_dump(path: str) -> IO[str]:
+    """Open a plain or gzip-compressed dump file as text."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def _unescape_sql(value: str) -> str:
+    return _SQL_ESCAPE_RE.sub(lambda m: _SQL_ESCAPES.get(m.group(1), m.group(1)), value)
+
+
+def _parse_insert_values(line: str) -> Iterator[tuple[Any, ...]]:
+    """Parse the row tuples of one ``INSERT INTO ... VALUES (...),(...);`` statement."""
+    pos = line.find(" VALUES ")
+    if pos < 0:
+        return
+    pos += len(" VALUES ")
+    length = len(line)
+
+    while pos < length and line[pos] == "(":
+        pos += 1
+        row: list[Any] = []
+        while True:
+            match = _SQL_VALUE_RE.match(line, pos)
+            if match is None:
+                raise ValueError(f"Unparseable SQL value at offset {pos}")
+            string, null, number = match.groups()
+            if string is not None:
+                row.append(_unescape_sql(string))
+            elif null is not None:
+                row.append(None)
+            else:
+                row.append(float(number) if "." in number or "e" in number.lower() else int(number))
+            pos = match.end()
+            if line[pos] == ",":
+                pos += 1
+                continue
+            if line[pos] == ")":
+                pos += 1
+                break
+            raise ValueError(f"Unexpected character {line[pos]!r} at offset {pos}")
+        yield tuple(row)
+        if pos < length and line[pos] == ",":
+            pos += 1
+
+
+def iter_sql_rows(path: str) -> Iterator[tuple[Any, ...]]:
+    """Yield the rows of a MediaWiki SQL table dump (``*-page.sql.gz`` etc.)."""
+    with _open_dump(path) as dump:
+        for line in dump:
+            if line.startswith("INSERT INTO"):
+                yield from _parse_insert_values(line.rstrip("\n"))
+
+
+def iter_abstracts(path: str) -> Iterator[tuple[str, str]]:
+    """Yield (title, abstract) pairs from a ``*-abstract.xml`` dump."""
+    with _open_dump(path) as dump:
+        for _event, element in ET.iterparse(dump, events=("end",)):  # noqa: S314 - operator-supplied dump
+            if element.tag != "doc":
+                continue
+            title = (element.findtext("title") or "").removeprefix(_ABSTRACT_TITLE_PREFIX).strip()
+            abstract = (element.findtext("abstract") or "").strip()
+            if title and abstract:
+                yield title, abstract
+            element.clear()
+
+
+def _dump_title(title: str) -> str:
+    return title.replace("_", " ")
+
+
+def build_index(
+    output: str,
+    lang: str,
+    page: str,
+    redirect: str | None = None,
+    langlinks: str | None = None,
+    page_props: str | None = None,
+    abstracts: str | None = None,
+) -> dict[str, int]:
+    """
+    Ingest the dump files of one language into the index at *output*.
+
+    Existing entries of *lang* are replaced; other languages in the file are kept.
+
+    Args:
+        output: Path of the SQLite index
+        lang: Language code of the dumps
+        page: ``page`` table dump (article titles and ids)
+        redirect: ``redirect`` table dump
+        langlinks: ``langlinks`` table dump
+        page_props: ``page_props`` table dump (Wikidata ids)
+        abstracts: ``abstract.xml`` dump (lead-section abstracts)
+
+    Returns:
+        Number of ingested rows per input
+    """
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    counts = {"pages": 0, "redirects": 0, "langlinks": 0, "wikidata_ids": 0, "abstracts": 0}
+    conn = sqlite3.connect(output)
+    try:
+        conn.executescript(_SCHEMA)
+        for table in ("pages", "redirects", "langlinks"):
+            conn.execute(f"DELETE FROM {table} WHERE lang = ?", (lang,))  # noqa: S608 - fixed table names
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO pages (lang, title_key, title, pageid, is_redirect) VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    lang,
+                    normalize_title(row[_PAGE_TITLE]),
+                    _dump_title(row[_PAGE_TITLE]),
+                    row[_PAGE_ID],
+                    row[_PAGE_IS_REDIRECT],
+                )
+                for row in iter_sql_rows(page)
+                if row[_PAGE_NAMESPACE] == 0
+            ),
+        )
+
+        if redirect:
+            conn.execute("CREATE TEMP TABLE rd (pageid INTEGER PRIMARY KEY, target_title TEXT NOT NULL)")
+            conn.executemany(
+                "INSERT OR REPLACE INTO rd VALUES (?, ?)",
+                (
+                    (row[_RD_FROM], _dump_title(row[_RD_TITLE]))
+                    for row in iter_sql_rows(redirect)
+                    if row[_RD_NAMESPACE] == 0 and not row[_RD_INTERWIKI]
+                ),
+            )
+            counts["redirects"] = conn.execute(
+                """
+                INSERT OR REPLACE INTO redirects (lang, title_key, target_title)
+                SELECT p.lang, p.title_key, rd.target_title FROM rd JOIN pages p ON p.lang = ? AND p.pageid = rd.pageid
+                """,
+                (lang,),
+            ).rowcount
+            conn.execute("DROP TABLE rd")
+        # Redirect pages are only reachable through the redirects table
+        conn.execute("DELETE FROM pages WHERE lang = ? AND is_redirect = 1", (lang,))
+        counts["pages"] = conn.execute("SELECT COUNT(*) FROM pages WHERE lang = ?", (lang,)).fetchone()[0]
+
+        if langlinks:
+            counts["langlinks"] = conn.executemany(
+                "INSERT OR REPLACE INTO langlinks VALUES (?, ?, ?, ?)",
+                (
+                    (lang, row[_LL_FROM], row[_LL_LANG], row[_LL_TITLE])
+                    for row in iter_sql_rows(langlinks)
+                    if row[_LL_TITLE]
+                ),
+            ).rowcount
+
+        if page_props:
+            counts["wikidata_ids"] = conn.executemany(
+                "UPDATE pages SET wikibase_item = ? WHERE lang = ? AND pageid = ?",
+                (
+                    (row[_PP_VALUE], lang, row[_PP_PAGE])
+                    for row in iter_sql_rows(page_props)
+                    if row[_PP_PROPNAME] == "wikibase_item"
+                ),
+            ).rowcount
+
+        if abstracts:
+            counts["abstracts"] = conn.executemany(
+                "UPDATE pages SET extract = ? WHERE lang = ? AND title_key = ?",
+                ((abstract, lang, normalize_title(title)) for title, abstract in iter_abstracts(abstracts)),
+            ).rowcount
+
+        conn.commit()
+    finally:
+        conn.close()
+
+    logger.info(f"Built offline Wikipedia index for '{lang}' at {output}: {counts}")
+    return counts
+
+
+class OfflineIndex:
+    """Read-only lookups against an index built with :func:`build_index`."""
+
+    def __init__(self, path: str):
+        """Open the index at *path* read-only."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+
+    def _page_row(self, lang: str, title: str) -> tuple | None:
+        return self._conn.execute(
+            "SELECT title, pageid, extract, wikibase_item FROM pages WHERE lang = ? AND title_key = ?",
+            (lang, normalize_title(title)),
+        ).fetchone()
+
+    def _build_page(self, lang: str, row: tuple) -> dict[str, Any]:
+        """Build a MediaWiki (formatversion=2) page dict from an index row."""
+        title, pageid, extract, wikibase_item = row
+        page: dict[str, Any] = {"pageid": pageid, "ns": 0, "title": title, "extract": extract or ""}
+        if wikibase_item:
+            page["pageprops"] = {"wikibase_item": wikibase_item}
+        links = self._conn.execute(
+            "SELECT target_lang, target_title FROM langlinks WHERE lang = ? AND pageid = ? ORDER BY target_lang",
+            (lang, pageid),
+        ).fetchall()
+        if links:
+            page["langlinks"] = [{"lang": target_lang, "title": target_title} for target_lang, target_title in links]
+        return page
+
+    def lookup(self, titles: list[str], lang: str) -> tuple[PageDataMap, RedirectMap, list[str]]:
+        """
+        Look up *titles* in the index, following redirects.
+
+        Args:
+            titles: Requested page titles
+            lang: Language code
+
+        Returns:
+            Tuple of (pages_data keyed by final title, redirects from requested to final title,
+            titles that are not in the index)
+        """
+        pages_data: PageDataMap = {}
+        redirects: RedirectMap = {}
+        missing: list[str] = []
+
+        with self._lock:
+            for title in titles:
+                row = self._page_row(lang, title)
+                if row is None:
+                    target = self._conn.execute(
+                        "SELECT target_title FROM redirects WHERE lang = ? AND title_key = ?",
+                        (lang, normalize_title(title)),
+                    ).fetchone()
+                    if target is not None:
+                        row = self._page_row(lang, target[0])
+                if row is None:
+                    self._stats["misses"] += 1
+                    missing.append(title)
+                    continue
+
+                self._stats["hits"] += 1
+                final_title = row[0]
+                if final_title not in pages_data:
+                    pages_data[final_title] = self._build_page(lang, row)
+                if final_title != title:
+                    redirects[title] = final_title
+
+        return pages_data, redirects, missing
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get lookup statistics and the number of indexed pages per language."""
+        with self._lock:
+            pages = dict(self._conn.execute("SELECT lang, COUNT(*) FROM pages GROUP BY lang").fetchall())
+        return {**self._stats, "pages": pages}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+_indexes: dict[str, OfflineIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_offline_index() -> OfflineIndex | None:
+    """Return the process-wide index configured in WIKIPEDIA_OFFLINE_INDEX (None if disabled)."""
+    path = settings.WIKIPEDIA_OFFLINE_INDEX
+    if not path:
+        return None
+
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            if not os.path.exists(path):
+                logger.warning(f"Offline Wikipedia index {path} does not exist - using the live API only")
+                return None
+            try:
+                index = OfflineIndex(path)
+            except sqlite3.Error as e:
+                logger.error(f"Offline Wikipedia index unavailable at {path}: {e}")
+                return None
+            _indexes[path] = index
+        return index
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point for building an index."""
+    parser = argparse.ArgumentParser(description="Build an offline Wikipedia index from database dumps.")
+    parser.add_argument("--lang", required=True, help="Language code of the dumps (e.g. de)")
+    parser.add_argument("--output", default=os.path.join(settings.CACHE_DIR, "wikipedia-offline.sqlite3"))
+    parser.add_argument("--page", required=True, help="page table dump (*-page.sql[.gz])")
+    parser.add_argument("--redirect", help="redirect table dump (*-redirect.sql[.gz])")
+    parser.add_argument("--langlinks", help="langlinks table dump (*-langlinks.sql[.gz])")
+    parser.add_argument("--page-props", help="page_props table dump (*-page_props.sql[.gz])")
+    parser.add_argument("--abstracts", help="abstract dump (*-abstract.xml[.gz])")
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    counts = build_index(
+        args.output,
+        args.lang,
+        page=args.page,
+        redirect=args.redirect,
+        langlinks=args.langlinks,
+        page_props=args.page_props,
+        abstracts=args.abstracts,
+    )
+    print(f"Indexed {counts} into {args.output} in {time.perf_counter() - start_time:.1f}s")
+    return 0
+
+
+__all__ = ["OfflineIndex", "build_index", "get_offline_index", "iter_abstracts", "iter_sql_rows"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+"""Wikipedia page resolvers module."""
+
+from .base import PageResolver
+from .live import LiveResolver
+from .local import CacheResolver, OfflineIndexResolver
+from .replay import FixtureReplayResolver
+from .tiered import TieredResolver, build_resolver_chain
+
+__all__ = [
+    "CacheResolver",
+    "FixtureReplayResolver",
+    "LiveResolver",
+    "OfflineIndexResolver",
+    "PageResolver",
+    "TieredResolver",
+    "build_resolver_chain",
+]
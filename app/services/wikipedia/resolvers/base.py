@@ -0,0 +1,59 @@
+"""Resolver interface for Wikipedia page lookups."""
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+from ..constants import ALL_PROPS, PageDataMap, RedirectMap
+
+
+class PageResolver(ABC):
+    """
+    Source of MediaWiki page data for batches of titles.
+
+    ``resolve`` has the semantics of one MediaWiki ``action=query`` request:
+    pages are keyed by their final title (formatversion=2 page dicts) and the
+    redirect map leads from requested to final titles. Titles the resolver
+    cannot answer are simply absent from the result. ``props`` names the
+    MediaWiki props the caller needs; resolvers that cannot tell which props
+    a page was fetched with answer with what they have.
+    """
+
+    name = "resolver"
+
+    @abstractmethod
+    async def resolve(
+        self, titles: list[str], lang: str, props: frozenset[str] = ALL_PROPS
+    ) -> tuple[PageDataMap, RedirectMap]:
+        """
+        Resolve a batch of titles.
+
+        Args:
+            titles: Page titles to resolve
+            lang: Language code ('de' or 'en')
+            props: MediaWiki props the pages must carry
+
+        Returns:
+            Tuple of (pages_data, redirects_map)
+        """
+
+    def store(  # noqa: B027
+        self,
+        titles: list[str],
+        lang: str,
+        pages_data: PageDataMap,
+        redirects: RedirectMap,
+        props: frozenset[str] = ALL_PROPS,
+    ) -> None:
+        """Keep the answer of a lower tier for *titles* (no-op for read-only resolvers)."""
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get resolver statistics."""
+        return {}
+
+    async def close(self) -> None:  # noqa: B027
+        """Release resources held by the resolver."""
+
+
+def unresolved_titles(titles: list[str], pages_data: PageDataMap, redirects: RedirectMap) -> list[str]:
+    """Return the titles of *titles* that have no page in the result."""
+    return [title for title in titles if redirects.get(title, title) not in pages_data]
@@ -0,0 +1,33 @@
+"""Resolver backed by the live MediaWiki API."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from ..constants import ALL_PROPS, MAX_RETRIES, RETRY_DELAY, PageDataMap, RedirectMap
+from .base import PageResolver
+
+if TYPE_CHECKING:
+    from ..api.client import WikipediaAPIClient
+
+
+class LiveResolver(PageResolver):
+    """Fetches titles from the MediaWiki API through a ``WikipediaAPIClient``."""
+
+    name = "live"
+
+    def __init__(self, api_client: WikipediaAPIClient, max_retries: int = MAX_RETRIES, base_delay: float = RETRY_DELAY):
+        """Query the MediaWiki API through *api_client* with its retry settings."""
+        self.api_client = api_client
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+
+    async def resolve(
+        self, titles: list[str], lang: str, props: frozenset[str] = ALL_PROPS
+    ) -> tuple[PageDataMap, RedirectMap]:
+        """Query the MediaWiki API for *titles* (with retries), requesting only *props*."""
+        return await self.api_client.fetch_pages_live(titles, lang, self.max_retries, self.base_delay, props)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get request statistics of the API client."""
+        return self.api_client.request_stats
@@ -0,0 +1,69 @@
+"""Resolvers answering from local stores: the page cache and the offline dump index."""
+
+import asyncio
+from typing import Any
+
+from ..cache import WikipediaPageCache
+from ..constants import ALL_PROPS, BASE_PROPS, PageDataMap, RedirectMap
+from ..offline_index import OfflineIndex
+from .base import PageResolver
+
+
+class CacheResolver(PageResolver):
+    """Serves titles from the persistent page cache and keeps the answers of lower tiers."""
+
+    name = "cache"
+
+    def __init__(self, cache: WikipediaPageCache):
+        """Serve from and store into *cache*."""
+        self.cache = cache
+
+    async def resolve(
+        self, titles: list[str], lang: str, props: frozenset[str] = ALL_PROPS
+    ) -> tuple[PageDataMap, RedirectMap]:
+        """Look up *titles* in the page cache (entries fetched with fewer props miss)."""
+        pages_data, redirects, _missing = await asyncio.to_thread(self.cache.lookup, titles, lang, props)
+        return pages_data, redirects
+
+    def store(
+        self,
+        titles: list[str],
+        lang: str,
+        pages_data: PageDataMap,
+        redirects: RedirectMap,
+        props: frozenset[str] = ALL_PROPS,
+    ) -> None:
+        """Cache the pages found for *titles*."""
+        self.cache.store(titles, lang, pages_data, redirects, props)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get page cache statistics."""
+        return self.cache.get_stats()
+
+
+class OfflineIndexResolver(PageResolver):
+    """
+    Serves titles from an offline index built from Wikipedia dumps (read-only).
+
+    Dumps carry no categories, links, coordinates or thumbnails, so requests
+    whose ``props`` ask for any of them are passed on to the next tier.
+    """
+
+    name = "offline"
+
+    def __init__(self, index: OfflineIndex):
+        """Serve from *index*."""
+        self.index = index
+
+    async def resolve(
+        self, titles: list[str], lang: str, props: frozenset[str] = ALL_PROPS
+    ) -> tuple[PageDataMap, RedirectMap]:
+        """Look up *titles* in the offline index (none if *props* needs more than it provides)."""
+        if not props <= BASE_PROPS:
+            return {}, {}
+        pages_data, redirects, _missing = await asyncio.to_thread(self.index.lookup, titles, lang)
+        return pages_data, redirects
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get offline index statistics."""
+        return self.index.get_stats()
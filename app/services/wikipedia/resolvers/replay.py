@@ -0,0 +1,118 @@
+"""Resolver replaying recorded MediaWiki answers from a JSON fixture.
+
+The fixture maps language and normalized title to the final title and page
+data (``null`` for titles that do not exist)::
+
+    {"de": {"Einstein": {"title": "Albert Einstein", "page": {...}}, "Quantenbrezel": null}}
+
+Used as the only tier, lookups are deterministic and never touch the network
+(benchmarks, tests). Placed in front of other tiers, it records their answers
+and writes the fixture back on :meth:`FixtureReplayResolver.close`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any
+
+from loguru import logger
+
+from ..cache import normalize_title
+from ..constants import ALL_PROPS, PageDataMap, RedirectMap
+from .base import PageResolver
+
+
+class FixtureReplayResolver(PageResolver):
+    """Answers titles from recorded fixtures and records new answers."""
+
+    name = "replay"
+
+    def __init__(self, path: str):
+        """Load the fixture at *path* if it exists (recordings are saved there)."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._stats = {"hits": 0, "misses": 0, "recorded": 0}
+        self._fixtures: dict[str, dict[str, dict[str, Any] | None]] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._fixtures = json.load(f)
+            logger.info(f"Loaded {sum(map(len, self._fixtures.values()))} Wikipedia fixtures from {path}")
+
+    async def resolve(
+        self, titles: list[str], lang: str, props: frozenset[str] = ALL_PROPS
+    ) -> tuple[PageDataMap, RedirectMap]:
+        """Replay the recorded answers for *titles* (as recorded, whatever *props* asks for)."""
+        pages_data: PageDataMap = {}
+        redirects: RedirectMap = {}
+        recorded = self._fixtures.get(lang, {})
+
+        for title in titles:
+            key = normalize_title(title)
+            if key not in recorded:
+                self._stats["misses"] += 1
+                continue
+            self._stats["hits"] += 1
+            entry = recorded[key]
+            if entry is None:
+                continue
+            pages_data[entry["title"]] = entry["page"]
+            if entry["title"] != title:
+                redirects[title] = entry["title"]
+
+        return pages_data, redirects
+
+    def store(
+        self,
+        titles: list[str],
+        lang: str,
+        pages_data: PageDataMap,
+        redirects: RedirectMap,
+        props: frozenset[str] = ALL_PROPS,
+    ) -> None:
+        """Record the answers for *titles* (titles without a page are recorded as missing)."""
+        with self._lock:
+            recorded = self._fixtures.setdefault(lang, {})
+            for title in titles:
+                final_title = redirects.get(title, title)
+                page = pages_data.get(final_title)
+                recorded[normalize_title(title)] = {"title": final_title, "page": page} if page is not None else None
+                self._stats["recorded"] += 1
+            self._dirty = self._dirty or bool(titles)
+
+    def save(self) -> None:
+        """Write the fixture file if new answers were recorded."""
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._fixtures, f, ensure_ascii=False, indent=1, sort_keys=True)
+            self._dirty = False
+        logger.info(f"Saved Wikipedia fixtures to {self.path}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get replay statistics."""
+        return {**self._stats, "entries": sum(map(len, self._fixtures.values()))}
+
+    async def close(self) -> None:
+        """Persist newly recorded answers."""
+        self.save()
+
+
+_replays: dict[str, FixtureReplayResolver] = {}
+_replays_lock = threading.Lock()
+
+
+def get_replay_resolver(path: str) -> FixtureReplayResolver:
+    """Return the process-wide replay resolver for the fixture file at *path*."""
+    with _replays_lock:
+        resolver = _replays.get(path)
+        if resolver is None:
+            resolver = FixtureReplayResolver(path)
+            _replays[path] = resolver
+        return resolver
@@ -0,0 +1,126 @@
+"""Tiered composition of page resolvers."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from app.core.settings import settings
+
+from ..cache import WikipediaPageCache
+from ..constants import ALL_PROPS, PageDataMap, RedirectMap
+from ..offline_index import OfflineIndex
+from .base import PageResolver, unresolved_titles
+from .live import LiveResolver
+from .local import CacheResolver, OfflineIndexResolver
+from .replay import get_replay_resolver
+
+if TYPE_CHECKING:
+    from ..api.client import WikipediaAPIClient
+
+RESOLVER_NAMES = ("offline", "cache", "replay", "live")
+
+
+class TieredResolver(PageResolver):
+    """
+    Asks each tier in order for the titles the previous tiers could not resolve.
+
+    Answers of a lower tier are handed to the ``store`` hook of every tier above
+    it, so e.g. live results populate the cache. The last tier is authoritative:
+    titles it does not find are stored as missing by recording tiers.
+    """
+
+    name = "tiered"
+
+    def __init__(self, tiers: list[PageResolver]):
+        """Ask *tiers* in lookup order (at least one)."""
+        if not tiers:
+            raise ValueError("TieredResolver needs at least one tier")
+        self.tiers = tiers
+        self._stats = {tier.name: {"served": 0, "passed_on": 0} for tier in tiers}
+
+    async def resolve(
+        self, titles: list[str], lang: str, props: frozenset[str] = ALL_PROPS
+    ) -> tuple[PageDataMap, RedirectMap]:
+        """Resolve *titles* with the first tier that knows them."""
+        pages_data: PageDataMap = {}
+        redirects: RedirectMap = {}
+        remaining = list(dict.fromkeys(titles))
+
+        for position, tier in enumerate(self.tiers):
+            if not remaining:
+                break
+            tier_pages, tier_redirects = await tier.resolve(remaining, lang, props)
+            missing = unresolved_titles(remaining, tier_pages, tier_redirects)
+            self._stats[tier.name]["served"] += len(remaining) - len(missing)
+            self._stats[tier.name]["passed_on"] += len(missing)
+
+            is_last = position == len(self.tiers) - 1
+            missing_set = set(missing)
+            answered = remaining if is_last else [title for title in remaining if title not in missing_set]
+            if answered:
+                for upper in self.tiers[:position]:
+                    # Stores write to disk (page cache, fixtures) - keep them off the event loop
+                    await asyncio.to_thread(upper.store, answered, lang, tier_pages, tier_redirects, props)
+
+            pages_data.update(tier_pages)
+            redirects.update(tier_redirects)
+            if len(missing) < len(remaining):
+                logger.debug(f"Resolved {len(remaining) - len(missing)} {lang} titles via {tier.name}")
+            remaining = missing
+
+        return pages_data, redirects
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get per-tier statistics (titles served and passed on, plus the tier's own stats)."""
+        return {tier.name: {**tier.get_stats(), **self._stats[tier.name]} for tier in self.tiers}
+
+    async def close(self) -> None:
+        """Close every tier."""
+        for tier in self.tiers:
+            await tier.close()
+
+
+def build_resolver_chain(
+    api_client: WikipediaAPIClient,
+    cache: WikipediaPageCache | None = None,
+    offline_index: OfflineIndex | None = None,
+    names: list[str] | None = None,
+) -> TieredResolver:
+    """
+    Build the resolver chain configured in WIKIPEDIA_RESOLVERS.
+
+    Tiers whose backend is not available (cache disabled, no offline index or
+    replay fixture configured) are skipped.
+
+    Args:
+        api_client: Client used by the live tier
+        cache: Page cache for the cache tier
+        offline_index: Offline index for the offline tier
+        names: Tier names in lookup order (defaults to WIKIPEDIA_RESOLVERS)
+
+    Returns:
+        TieredResolver over the available tiers
+    """
+    if names is None:
+        names = [name.strip() for name in settings.WIKIPEDIA_RESOLVERS.split(",") if name.strip()]
+    unknown = [name for name in names if name not in RESOLVER_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown Wikipedia resolvers {unknown}, expected some of {list(RESOLVER_NAMES)}")
+
+    tiers: list[PageResolver] = []
+    for name in names:
+        if name == "offline" and offline_index is not None:
+            tiers.append(OfflineIndexResolver(offline_index))
+        elif name == "cache" and cache is not None:
+            tiers.append(CacheResolver(cache))
+        elif name == "replay" and settings.WIKIPEDIA_REPLAY_FIXTURE:
+            tiers.append(get_replay_resolver(settings.WIKIPEDIA_REPLAY_FIXTURE))
+        elif name == "live":
+            tiers.append(LiveResolver(api_client))
+
+    if not tiers:
+        raise ValueError(f"None of the Wikipedia resolvers {names} is available")
+    return TieredResolver(tiers)
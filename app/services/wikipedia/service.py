@@ -5,6 +5,7 @@ This is the new, modular Wikipedia service that integrates prompt data
 as fallbacks and provides clean output with only the required fields.
 """
 
+import asyncio
 from collections.abc import Iterable
 from typing import Any
 
@@ -13,9 +14,11 @@ from loguru import logger
 from app.models.entity_processing_context import EntityProcessingContext
 
 from .api.client import WikipediaAPIClient
-from .constants import CHUNK_SIZE
+from .cache import EntityLookupCache, get_lookup_cache
+from .constants import ALL_PROPS, CHUNK_SIZE, props_for_fields, props_key
 from .fallbacks.strategies import WikipediaFallbackStrategies
 from .models import WikiPage
+from .resolvers import PageResolver
 from .utils.data_processor import WikipediaDataProcessor
 
 
@@ -28,12 +31,26 @@ class WikipediaService:
     - Prompt data integration as fallbacks
     - Modular design with separate concerns
     - Efficient batch processing
+    - Pluggable page resolution (``resolver``, defaults to the client's WIKIPEDIA_RESOLVERS chain)
+    - Field selection (``fields``): only the MediaWiki props needed for the requested
+      optional fields (categories, coordinates, internal_links, thumbnail) are fetched
     """
 
-    def __init__(self, timeout: float = 30.0):
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        lookup_cache: EntityLookupCache | None = None,
+        resolver: PageResolver | None = None,
+        fields: Iterable[str] | None = None,
+    ):
         self.api_client = WikipediaAPIClient(timeout)
+        self.resolver = resolver if resolver is not None else self.api_client.resolver
+        self.props = props_for_fields(fields)
+        # Lookups with a trimmed prop set must not be served to callers needing every field
+        self._lookup_variant = "" if self.props == ALL_PROPS else props_key(self.props)
         self.data_processor = WikipediaDataProcessor()
-        self.fallback_strategies = WikipediaFallbackStrategies(self.api_client)
+        self.fallback_strategies = WikipediaFallbackStrategies(self.resolver, props=self.props)
+        self.lookup_cache = lookup_cache if lookup_cache is not None else get_lookup_cache()
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -42,6 +59,8 @@ class WikipediaService:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
+        await self.fallback_strategies.close()
+        await self.resolver.close()
         await self.api_client.__aexit__(exc_type, exc_val, exc_tb)
 
     async def process_entity_simple(self, entity_name: str, metadata: dict | None = None) -> dict:
@@ -66,12 +85,63 @@ class WikipediaService:
         # Return the Wikipedia data
         return result_context.wikipedia_data or {}
 
-    async def process_entity(self, context: EntityProcessingContext) -> EntityProcessingContext:
+    async def prefetch_direct(self, labels: Iterable[str], lang: str = "de") -> dict[str, WikiPage | None]:
+        """
+        Resolve the direct-lookup title of many entities with batched queries.
+
+        Args:
+            labels: Entity labels to look up
+            lang: Language to look up in
+
+        Returns:
+            Mapping of label to WikiPage (None for misses); labels whose batch failed are omitted
+        """
+        # Labels already resolved in-process are answered by the lookup cache in process_entity,
+        # known misses by the negative cache
+        cache = self.api_client.cache
+        pending = [label for label in labels if self.lookup_cache.get(label, lang, self._lookup_variant) is None]
+        if cache is not None and pending:
+            known_misses = await asyncio.to_thread(cache.known_misses, pending, lang)
+            pending = [label for label in pending if label not in known_misses]
+        try:
+            return await self.fallback_strategies.direct_lookup_batch(pending, lang)
+        except Exception as e:
+            logger.error(f"Batched direct lookup failed, falling back to per-entity lookups: {e}")
+            return {}
+
+    def prefetch_synonyms(self, prefetched: dict[str, WikiPage | None], lang: str = "de") -> None:
+        """
+        Start the batched synonym stage for the labels a batched direct lookup left unresolved.
+
+        While the fallback chains run, the name variations of these labels are
+        resolved with one batched query, and only the labels no variation matched
+        get their synonyms from one LLM call and a second batched query. Each
+        chain's synonym strategy picks up its label's result instead of running
+        both passes itself.
+
+        Args:
+            prefetched: Result of :meth:`prefetch_direct`
+            lang: Language to look up in
+        """
+        unresolved = [
+            label for label, page in prefetched.items() if not self.fallback_strategies.is_page_complete(page)
+        ]
+        if unresolved:
+            self.fallback_strategies.prefetch_synonyms(unresolved, lang)
+
+    async def process_entity(
+        self,
+        context: EntityProcessingContext,
+        prefetched: WikiPage | None = None,
+        skip_direct: bool = False,
+    ) -> EntityProcessingContext:
         """
         Process a single entity with Wikipedia linking and prompt data fallbacks.
 
         Args:
             context: Entity processing context with metadata
+            prefetched: Page already found by a batched direct lookup
+            skip_direct: The direct lookup was already done (only run the fallback chain)
 
         Returns:
             Updated context with Wikipedia data
@@ -82,12 +152,20 @@ class WikipediaService:
             # Extract prompt data from metadata for fallback
             prompt_metadata = context.metadata or {}
 
-            # Use fallback system to fetch Wikipedia data
-            wiki_page = await self.fallback_strategies.fetch_with_fallbacks(
-                context.label,
-                lang="de",  # Start with German as primary
-                enable_fallbacks=True,
-            )
+            if prefetched and self.fallback_strategies.is_page_complete(prefetched):
+                logger.info(f"Found '{context.label}' via batched direct lookup")
+                wiki_page = prefetched
+                wiki_page.resolved_by = wiki_page.resolved_by or "direct"
+                self.lookup_cache.put(context.label, "de", wiki_page, self._lookup_variant)
+            else:
+                # Use fallback system to fetch Wikipedia data; concurrent lookups of the same
+                # label share one fallback chain and found pages are reused across requests
+                wiki_page = await self.lookup_cache.get_or_fetch(
+                    context.label,
+                    "de",
+                    lambda: self._fetch_complete_page(context.label, skip_direct),
+                    self._lookup_variant,
+                )
 
             if wiki_page and self.fallback_strategies.is_page_complete(wiki_page):
                 # Successfully found Wikipedia data
@@ -129,6 +207,32 @@ class WikipediaService:
 
         return context
 
+    async def _fetch_complete_page(self, label: str, skip_direct: bool) -> WikiPage | None:
+        """
+        Run the fallback chain and return the page only if it is complete enough to link.
+
+        Labels that recently failed every strategy are answered from the negative cache.
+        A miss is only remembered if every strategy finished without an error, so
+        rate limits and outages are not mistaken for unresolvable labels.
+        """
+        cache = self.api_client.cache
+        if cache is not None and await asyncio.to_thread(cache.is_known_miss, label, "de"):
+            logger.debug(f"Skipping fallback chain for '{label}' (cached miss)")
+            return None
+
+        wiki_page, exhausted = await self.fallback_strategies.fetch_with_fallbacks(
+            label,
+            lang="de",  # Start with German as primary
+            enable_fallbacks=True,
+            skip_direct=skip_direct,
+        )
+        if wiki_page and self.fallback_strategies.is_page_complete(wiki_page):
+            return wiki_page
+
+        if cache is not None and exhausted:
+            await asyncio.to_thread(cache.store_miss, label, "de")
+        return None
+
     async def fetch_pages(
         self, titles: Iterable[str], lang: str = "de", fetch_other_lang: bool = True, try_capitalization: bool = True
     ) -> list[WikiPage]:
@@ -172,8 +276,33 @@ class WikipediaService:
             return []
 
         try:
-            # Fetch primary language data
-            primary_data, redirects = await self._fetch_language_data(list(results_map.keys()), lang)
+            titles = list(results_map.keys())
+            other_lang = "en" if lang == "de" else "de"
+            graph = self.api_client.title_graph
+            known_counterparts = (
+                await asyncio.to_thread(graph.counterparts, titles, lang, other_lang)
+                if fetch_other_lang and graph is not None
+                else {}
+            )
+
+            other_data = None
+            if known_counterparts:
+                # Counterparts seen before - fetch both languages in one concurrent round
+                primary_result, other_result = await asyncio.gather(
+                    self._fetch_language_data(titles, lang),
+                    self._fetch_language_data(list(dict.fromkeys(known_counterparts.values())), other_lang),
+                    return_exceptions=True,
+                )
+                if isinstance(primary_result, BaseException):
+                    raise primary_result
+                primary_data, redirects = primary_result
+                if isinstance(other_result, BaseException):
+                    logger.error(f"Error prefetching {other_lang} language data: {other_result}")
+                else:
+                    other_data = other_result
+            else:
+                # Fetch primary language data
+                primary_data, redirects = await self._fetch_language_data(titles, lang)
 
             # Process primary language data
             found_titles = set()
@@ -190,7 +319,9 @@ class WikipediaService:
 
             # Fetch other language data if requested
             if fetch_other_lang and found_titles:
-                await self._fetch_other_language_data(results_map, primary_data, redirects, lang)
+                await self._fetch_other_language_data(
+                    results_map, primary_data, redirects, lang, known_counterparts, other_data
+                )
 
             logger.info(f"Wikipedia fetch summary: {len(found_titles)} found")
             return list(results_map.values())
@@ -209,18 +340,27 @@ class WikipediaService:
             chunk = titles[i : i + CHUNK_SIZE]
             logger.debug(f"Fetching chunk {i // CHUNK_SIZE + 1} with {len(chunk)} titles")
 
-            pages_data, redirects = await self.api_client.fetch_pages_batch(chunk, lang)
+            pages_data, redirects = await self.resolver.resolve(chunk, lang, self.props)
             all_pages_data.update(pages_data)
             all_redirects.update(redirects)
 
         return all_pages_data, all_redirects
 
-    async def _fetch_other_language_data(self, results_map, primary_data, redirects, primary_lang):
-        """Fetch data for the other language using langlinks."""
+    async def _fetch_other_language_data(
+        self, results_map, primary_data, redirects, primary_lang, known_counterparts=None, other_data=None
+    ):
+        """
+        Fetch data for the other language using langlinks.
+
+        Counterparts already fetched concurrently with the primary language (``other_data``)
+        are reused; only titles first learned from the primary langlinks are fetched here.
+        """
         other_lang = "en" if primary_lang == "de" else "de"
-        langlinks_map: dict[str, str] = {}
+        langlinks_map: dict[str, str] = {
+            title: other_title for title, other_title in (known_counterparts or {}).items() if title in results_map
+        }
 
-        # Extract langlinks from primary data
+        # Extract langlinks from primary data (formatversion=2 uses "title", older responses "*")
         for original_title in results_map.keys():
             lookup_title = redirects.get(original_title, original_title)
             if lookup_title in primary_data:
@@ -228,29 +368,42 @@ class WikipediaService:
                 if "langlinks" in page_data and isinstance(page_data["langlinks"], list):
                     for link in page_data["langlinks"]:
                         if isinstance(link, dict) and link.get("lang") == other_lang:
-                            other_title = link.get("*")
+                            other_title = link.get("title") or link.get("*")
                             if other_title:
                                 langlinks_map[original_title] = other_title
                                 break
 
-        # Fetch other language data if we have langlinks
-        if langlinks_map:
-            other_lang_titles = list(langlinks_map.values())
-            logger.info(f"Found {len(other_lang_titles)} links to {other_lang.upper()} Wikipedia")
-
-            try:
-                secondary_data, _ = await self._fetch_language_data(other_lang_titles, other_lang)
-
-                for original_title, other_title in langlinks_map.items():
-                    if other_title in secondary_data:
-                        try:
-                            self.data_processor.merge_page_data(
-                                results_map[original_title], secondary_data[other_title], other_lang
-                            )
-                        except Exception as e:
-                            logger.error(f"Error merging {other_lang} data for '{original_title}': {e}")
-            except Exception as e:
-                logger.error(f"Error fetching {other_lang} language data: {e}")
+        if not langlinks_map:
+            return
+
+        secondary_data, secondary_redirects = other_data or ({}, {})
+        missing_titles = [
+            other_title
+            for other_title in dict.fromkeys(langlinks_map.values())
+            if secondary_redirects.get(other_title, other_title) not in secondary_data
+        ]
+        logger.info(
+            f"Found {len(langlinks_map)} links to {other_lang.upper()} Wikipedia "
+            f"({len(missing_titles)} not fetched yet)"
+        )
+
+        try:
+            if missing_titles:
+                fetched_data, fetched_redirects = await self._fetch_language_data(missing_titles, other_lang)
+                secondary_data = {**secondary_data, **fetched_data}
+                secondary_redirects = {**secondary_redirects, **fetched_redirects}
+
+            for original_title, other_title in langlinks_map.items():
+                final_title = secondary_redirects.get(other_title, other_title)
+                if final_title in secondary_data:
+                    try:
+                        self.data_processor.merge_page_data(
+                            results_map[original_title], secondary_data[final_title], other_lang
+                        )
+                    except Exception as e:
+                        logger.error(f"Error merging {other_lang} data for '{original_title}': {e}")
+        except Exception as e:
+            logger.error(f"Error fetching {other_lang} language data: {e}")
 
     async def fetch_pages_dict(
         self, titles: Iterable[str], lang: str = "de", fetch_other_lang: bool = True, try_capitalization: bool = True
@@ -300,6 +453,13 @@ class WikipediaService:
 
     def get_stats(self) -> dict[str, Any]:
         """Get service statistics."""
-        return {
+        stats = {
             "api_client": self.api_client.get_stats(),
+            "lookup_cache": self.lookup_cache.get_stats(),
+            "fallbacks": self.fallback_strategies.get_stats(),
         }
+        if self.api_client.title_graph is not None:
+            stats["title_graph"] = self.api_client.title_graph.get_stats()
+        if self.resolver is not self.api_client.resolver:
+            stats["resolver"] = self.resolver.get_stats()
+        return stats
@@ -0,0 +1,195 @@
+"""Persistent graph of Wikipedia title relations.
+
+Every MediaWiki response teaches us two kinds of edges: redirects/normalizations
+from a requested title to the canonical page title, and language links between
+the German and English article of the same topic. ``TitleGraph`` keeps these
+edges in a small SQLite database under ``settings.CACHE_DIR`` so later requests
+know a page's cross-language counterpart up front and can fetch both languages
+in one concurrent round instead of two sequential ones.
+
+Only the two-language ``WikipediaService.fetch_pages`` reads the counterparts.
+The linker resolves German pages and takes the English title from their
+langlinks without a second fetch, so it only feeds the graph.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+
+from loguru import logger
+
+from app.core.settings import settings
+
+from .cache import normalize_title
+from .constants import PageDataMap, RedirectMap
+
+GRAPH_FILENAME = "wikipedia-titles.sqlite3"
+GRAPH_LANGUAGES = ("de", "en")
+
+
+class TitleGraph:
+    """SQLite-backed redirect and langlink edges with TTL expiry."""
+
+    def __init__(self, path: str, ttl: int = 30 * 24 * 3600):
+        """Open or create the edge database at *path*; edges older than *ttl* seconds are ignored."""
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "learned": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # Lets one query follow a redirect to the langlink edges of its canonical title
+        self._conn.create_function("normalize_title", 1, normalize_title, deterministic=True)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS redirect_edges (
+                lang TEXT NOT NULL,
+                title_key TEXT NOT NULL,
+                canonical TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (lang, title_key)
+            );
+            CREATE TABLE IF NOT EXISTS langlink_edges (
+                lang TEXT NOT NULL,
+                title_key TEXT NOT NULL,
+                other_lang TEXT NOT NULL,
+                other_title TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (lang, title_key, other_lang)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def learn(self, lang: str, pages_data: PageDataMap, redirects: RedirectMap) -> None:
+        """
+        Record the redirect and langlink edges of one batch response.
+
+        Args:
+            lang: Language of the response
+            pages_data: Pages keyed by final title
+            redirects: Redirect map from requested to final title
+        """
+        now = time.time()
+        redirect_rows = [
+            (lang, normalize_title(source), target, now)
+            for source, target in redirects.items()
+            if normalize_title(source) != normalize_title(target)
+        ]
+        langlink_rows = []
+        for title, page in pages_data.items():
+            for link in page.get("langlinks") or []:
+                if not isinstance(link, dict):
+                    continue
+                other_lang = link.get("lang")
+                other_title = link.get("title") or link.get("*")
+                if other_lang in GRAPH_LANGUAGES and other_lang != lang and other_title:
+                    # Language links are symmetric - remember both directions
+                    langlink_rows.append((lang, normalize_title(title), other_lang, other_title, now))
+                    langlink_rows.append((other_lang, normalize_title(other_title), lang, title, now))
+
+        if not redirect_rows and not langlink_rows:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO redirect_edges VALUES (?, ?, ?, ?)", redirect_rows)
+            self._conn.executemany("INSERT OR REPLACE INTO langlink_edges VALUES (?, ?, ?, ?, ?)", langlink_rows)
+            self._stats["learned"] += len(redirect_rows) + len(langlink_rows)
+            self._conn.commit()
+
+    def canonical(self, title: str, lang: str) -> str:
+        """Return the canonical page title for *title* (the title itself if no redirect is known)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT canonical FROM redirect_edges WHERE lang = ? AND title_key = ? AND updated_at >= ?",
+                (lang, normalize_title(title), time.time() - self.ttl),
+            ).fetchone()
+        return row[0] if row else title
+
+    def counterparts(self, titles: list[str], lang: str, other_lang: str) -> dict[str, str]:
+        """
+        Look up the known *other_lang* article of each of *titles*.
+
+        Args:
+            titles: Requested titles (redirects are followed)
+            lang: Language of *titles*
+            other_lang: Language of the counterparts
+
+        Returns:
+            Mapping of requested title to counterpart title for titles with a known langlink
+        """
+        keys = {title: normalize_title(title) for title in titles}
+        unique_keys = list(dict.fromkeys(keys.values()))
+        if not unique_keys:
+            return {}
+
+        placeholders = ", ".join("?" * len(unique_keys))
+        cutoff = time.time() - self.ttl
+        # Redirected titles take the langlink of their canonical title, all others their own
+        query = f"""
+            SELECT r.title_key, l.other_title
+            FROM redirect_edges AS r
+            JOIN langlink_edges AS l
+                ON l.lang = r.lang AND l.title_key = normalize_title(r.canonical)
+                AND l.other_lang = ? AND l.updated_at >= ?
+            WHERE r.lang = ? AND r.title_key IN ({placeholders}) AND r.updated_at >= ?
+            UNION ALL
+            SELECT l.title_key, l.other_title
+            FROM langlink_edges AS l
+            LEFT JOIN redirect_edges AS r
+                ON r.lang = l.lang AND r.title_key = l.title_key AND r.updated_at >= ?
+            WHERE l.lang = ? AND l.title_key IN ({placeholders}) AND l.other_lang = ? AND l.updated_at >= ?
+                AND r.title_key IS NULL
+        """  # noqa: S608 - only placeholders are interpolated
+        params = [other_lang, cutoff, lang, *unique_keys, cutoff, cutoff, lang, *unique_keys, other_lang, cutoff]
+        with self._lock:
+            found = dict(self._conn.execute(query, params).fetchall())
+            result = {title: found[key] for title, key in keys.items() if key in found}
+            self._stats["hits"] += len(result)
+            self._stats["misses"] += len(keys) - len(result)
+        return result
+
+    def clear(self) -> None:
+        """Remove all edges."""
+        with self._lock:
+            self._conn.execute("DELETE FROM redirect_edges")
+            self._conn.execute("DELETE FROM langlink_edges")
+            self._conn.commit()
+
+    def get_stats(self) -> dict[str, int]:
+        """Get graph statistics."""
+        with self._lock:
+            (redirect_edges,) = self._conn.execute("SELECT COUNT(*) FROM redirect_edges").fetchone()
+            (langlink_edges,) = self._conn.execute("SELECT COUNT(*) FROM langlink_edges").fetchone()
+        return {**self._stats, "redirect_edges": redirect_edges, "langlink_edges": langlink_edges}
+
+
+_graphs: dict[str, TitleGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def get_title_graph() -> TitleGraph | None:
+    """Return the process-wide title graph for the configured CACHE_DIR (None if caching is disabled)."""
+    if not settings.WIKIPEDIA_CACHE_ENABLED:
+        return None
+
+    path = os.path.join(settings.CACHE_DIR, GRAPH_FILENAME)
+    with _graphs_lock:
+        graph = _graphs.get(path)
+        if graph is None:
+            try:
+                graph = TitleGraph(path, ttl=settings.WIKIPEDIA_TITLE_GRAPH_TTL)
+            except sqlite3.Error as e:
+                logger.error(f"Wikipedia title graph unavailable at {path}: {e}")
+                return None
+            _graphs[path] = graph
+        return graph
+
+
+__all__ = ["TitleGraph", "get_title_graph"]
@@ -193,6 +193,7 @@ class WikipediaDataProcessor:
             "geo_lon": page.lon,
             "infobox_type": page.infobox_type or "",
             "dbpedia_uri": "",  # Will be generated later in finalize_dbpedia_uri
+            "resolved_by": page.resolved_by,
         }
 
         logger.debug(f"Formatted result extract field: '{result['extract'][:100] if result['extract'] else 'EMPTY'}...")
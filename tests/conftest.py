@@ -2,8 +2,20 @@
 import pathlib
 import sys
 
+import pytest
+
 # Add project root (one level above `backend`) to PYTHONPATH so that
 # `import backend.app.*` works independent of where pytest is executed.
 PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep persistent caches out of the working tree and independent between tests."""
+    from app.core.settings import settings
+    from app.services.wikipedia.cache import get_lookup_cache
+
+    monkeypatch.setattr(settings, "CACHE_DIR", str(tmp_path / "cache"))
+    get_lookup_cache().clear()
@@ -0,0 +1 @@
+INSERT INTO `langlinks` VALUES (1,'en','Albert Einstein'),(1,'fr','Albert Einstein'),(3,'en','Zugspitze');
@@ -0,0 +1,3 @@
+-- MySQL dump (sample)
+INSERT INTO `page` VALUES (1,0,'Albert_Einstein',0,0,0.5,'20240101000000',NULL,100,2000,'wikitext',NULL),(2,0,'Einstein',1,0,0.1,'20240101000000',NULL,101,30,'wikitext',NULL),(3,0,'Zugspitze',0,0,0.2,'20240101000000',NULL,102,1500,'wikitext',NULL),(4,14,'Physiker',0,0,0.3,'20240101000000',NULL,103,100,'wikitext',NULL);
+INSERT INTO `page` VALUES (5,0,'Rock_\'n\'_Roll',0,0,0.4,'20240101000000',NULL,104,900,'wikitext',NULL);
@@ -0,0 +1 @@
+INSERT INTO `page_props` VALUES (1,'wikibase_item','Q937',NULL),(1,'page_image_free','Einstein_1921.jpg',NULL),(3,'wikibase_item','Q3375',NULL),(5,'wikibase_item','Q7749',NULL);
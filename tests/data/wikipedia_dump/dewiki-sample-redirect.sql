@@ -0,0 +1 @@
+INSERT INTO `redirect` VALUES (2,0,'Albert_Einstein','','');
@@ -37,3 +37,94 @@ def test_compendium() -> None:
     md = resp2.json()["markdown"]
     print("\n--- Kompendium-Output ---\n", md, "\n------------------------\n")
     assert "## Kompendium" in md or "Zugspitze" in md
+
+
+def test_compendium_stream_sends_chunks_then_bibliography_and_statistics() -> None:
+    """The streaming endpoint forwards markdown chunks before bibliography and statistics."""
+    import json
+    from unittest.mock import patch
+
+    async def fake_stream(*_args):
+        for fragment in ("## Zugspitze\n", "Der höchste Berg."):
+            yield fragment
+
+    linker_data = {
+        "original_text": "Die Zugspitze ist der höchste Berg Deutschlands.",
+        "entities": [
+            {
+                "entity": "Zugspitze",
+                "sources": {"wikipedia": {"url_de": "https://de.wikipedia.org/wiki/Zugspitze", "extract": "Berg."}},
+            }
+        ],
+    }
+    payload = {"input_type": "linker_output", "linker_data": linker_data}
+
+    with patch("app.core.compendium.stream_compendium_with_openai", fake_stream):
+        resp = client.post("/api/v1/compendium/stream", json=payload)
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+
+    events = []
+    for block in resp.text.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))))
+
+    assert [name for name, _ in events] == ["chunk", "chunk", "bibliography", "statistics", "done"]
+    assert "".join(data["text"] for name, data in events if name == "chunk") == "## Zugspitze\nDer höchste Berg."
+    assert "https://de.wikipedia.org/wiki/Zugspitze" in events[2][1]["text"]
+    assert events[3][1]["output_length"] == len("## Zugspitze\nDer höchste Berg.")
+
+
+def test_compendium_context_is_ranked_and_trimmed_to_the_token_budget(monkeypatch) -> None:
+    """With 100 entity extracts the prompt stays within budget, keeping the entities the text mentions."""
+    from app.api.v1.compendium import CompendiumConfig
+    from app.core import compendium as comp_core
+    from app.core.settings import settings
+    from app.core.token_budget import count_message_tokens
+
+    monkeypatch.setattr(settings, "COMPENDIUM_PROMPT_TOKEN_BUDGET", 3000)
+    extract = "Ein Satz über das Thema mit einigen Einzelheiten. " * 20
+    linker_data = {
+        "original_text": "Begriff042 und Begriff077 prägen das Thema. Begriff077 wird zweimal genannt.",
+        "entities": [
+            {
+                "entity": f"Begriff{i:03d}",
+                "sources": {"wikipedia": {"url_de": f"https://de.wikipedia.org/wiki/B{i}", "extract": extract}},
+            }
+            for i in range(100)
+        ],
+    }
+    config = CompendiumConfig()
+    sent = {}
+
+    def fake_generate(topic, context, references, config):
+        sent["messages"] = comp_core._messages(topic, context, references, config)
+        return "## Kompendium"
+
+    monkeypatch.setattr(comp_core, "generate_compendium_with_openai", fake_generate)
+    _markdown, _bibliography, statistics = comp_core.generate_compendium(linker_data, config)
+
+    tokens = statistics["tokens"]
+    assert tokens["prompt_tokens"] == count_message_tokens(sent["messages"]) <= 3000
+    assert tokens["snippets_included"] + tokens["snippets_dropped"] == 100
+    assert tokens["snippets_dropped"] > 0
+    context = sent["messages"][1]["content"].split("Entity-Informationen:")[1]
+    assert context.index("Begriff000") < context.index("Begriff042") < context.index("Begriff077")
+    assert "Begriff099" not in context
+    # Without a budget every extract is included
+    assert comp_core.create_entity_context(linker_data).count("**Begriff") == 100
+
+
+def test_special_token_markup_in_user_text_is_counted_as_text(monkeypatch) -> None:
+    """Text containing "<|endoftext|>" is counted instead of raising like tiktoken's default encode."""
+    from app.core import token_budget
+
+    class Encoding:
+        def encode(self, text, disallowed_special="all"):
+            if disallowed_special and "<|endoftext|>" in text:
+                raise ValueError("Encountered text corresponding to disallowed special token")
+            return text.split()
+
+    monkeypatch.setattr(token_budget, "_encoding", lambda model: Encoding())
+    assert token_budget.count_tokens("Ende <|endoftext|> des Textes") == 4
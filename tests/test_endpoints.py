@@ -40,23 +40,23 @@ def test_linker_mock() -> None:
         type="LOCATION",
         wiki_url_de="https://de.wikipedia.org/wiki/Zugspitze",
         wiki_url_en="https://en.wikipedia.org/wiki/Zugspitze",
-        abstract_de=("Die Zugspitze ist mit 2962 m ü. NHN der höchste "
-                   "Gipfel des Wettersteingebirges und gleichzeitig "
-                   "Deutschlands höchster Berg."),
-        abstract_en=("The Zugspitze is the highest peak of the "
-                   "Wetterstein Mountains and the highest mountain in Germany."),
+        abstract_de=(
+            "Die Zugspitze ist mit 2962 m ü. NHN der höchste "
+            "Gipfel des Wettersteingebirges und gleichzeitig "
+            "Deutschlands höchster Berg."
+        ),
+        abstract_en=(
+            "The Zugspitze is the highest peak of the Wetterstein Mountains and the highest mountain in Germany."
+        ),
         categories=[],
         internal_links=[],
-        status="linked"
+        status="linked",
     )
 
     # Mock the process_text function to return our mock entity
-    with patch('app.core.linker.process_text') as mock_process_text:
+    with patch("app.core.linker.process_text") as mock_process_text:
         # Mock the return value of process_text
-        mock_process_text.return_value = (
-            [mock_entity],
-            {"total_entities": 1}
-        )
+        mock_process_text.return_value = ([mock_entity], {"total_entities": 1})
 
         payload = {
             "text": "Die Zugspitze ist der höchste Berg Deutschlands.",
@@ -76,3 +76,124 @@ def test_linker_mock() -> None:
         assert "id" in entity
         # Just check that we have some entity data
         assert entity["entity"] is not None
+
+
+def test_linker_stream_emits_entities_as_they_resolve() -> None:
+    """`/api/v1/linker/stream` emits NDJSON entity records in completion order plus statistics."""
+    import asyncio
+    import json
+    from unittest.mock import AsyncMock, patch
+
+    from app.models.entity_processing_context import EntityProcessingContext
+
+    delays = {"Langsam": 0.05, "Schnell": 0.0}
+
+    class FakeService:
+        def __init__(self, fields=None):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def prefetch_direct(self, labels):
+            return {}
+
+        async def process_entity(self, ctx, prefetched=None, skip_direct=False):
+            await asyncio.sleep(delays[ctx.label])
+            ctx.wikipedia_data = {
+                "status": "found",
+                "url_de": f"https://de.wikipedia.org/wiki/{ctx.label}",
+                "wikidata_id": "Q1",
+            }
+            return ctx
+
+    contexts = [EntityProcessingContext(label=label, type="CONCEPT") for label in ["Langsam", "Schnell"]]
+
+    with (
+        patch("app.core.linker._extract_or_generate_entities", AsyncMock(return_value=contexts)),
+        patch("app.core.linker.WikipediaService", FakeService),
+    ):
+        resp = client.post("/api/v1/linker/stream", json={"text": "Langsam und Schnell", "config": {"MODE": "extract"}})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert [(r["type"], r.get("index")) for r in records] == [("entity", 1), ("entity", 0), ("statistics", None)]
+    assert records[0]["entity"]["entity"] == "Schnell"
+    assert records[2]["statistics"]["total_entities"] == 2
+    assert records[2]["statistics"]["linked"]["wikipedia"]["count"] == 2
+    assert records[2]["processing"]["entities_linked"] == 2
+
+
+def test_linker_batch_resolves_each_label_once() -> None:
+    """`/api/v1/linker/batch` dedupes labels across texts and returns per-document results."""
+    from unittest.mock import patch
+
+    from app.models.entity_processing_context import EntityProcessingContext
+
+    extracted = {
+        "Text A": [EntityProcessingContext(label="Zugspitze", type="MOUNTAIN")],
+        "Text B": [
+            EntityProcessingContext(label="zugspitze", type="MOUNTAIN"),
+            EntityProcessingContext(label="Garmisch", type="LOCATION"),
+        ],
+    }
+
+    async def fake_extract(text, *_args):
+        if text == "Kaputt":
+            raise RuntimeError("LLM down")
+        return extracted[text]
+
+    resolved = []
+    requested_fields = []
+
+    class FakeService:
+        def __init__(self, fields=None):
+            requested_fields.append(fields)
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def prefetch_direct(self, labels):
+            return {}
+
+        async def process_entity(self, ctx, prefetched=None, skip_direct=False):
+            resolved.append(ctx.label)
+            ctx.wikipedia_data = {
+                "status": "found",
+                "url_de": f"https://de.wikipedia.org/wiki/{ctx.label}",
+                "internal_links": ["Bayern"],
+            }
+            return ctx
+
+    with (
+        patch("app.core.linker._extract_or_generate_entities", side_effect=fake_extract),
+        patch("app.core.linker.WikipediaService", FakeService),
+    ):
+        resp = client.post(
+            "/api/v1/linker/batch",
+            json={
+                "texts": ["Text A", "Text B", "Kaputt"],
+                "config": {"MODE": "extract", "WIKIPEDIA_FIELDS": ["internal_links"]},
+            },
+        )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert sorted(resolved) == ["Garmisch", "Zugspitze"]
+    assert [r["original_text"] for r in data["results"]] == ["Text A", "Text B", "Kaputt"]
+    assert [len(r["entities"]) for r in data["results"]] == [1, 2, 0]
+    assert data["results"][1]["entities"][0]["sources"]["wikipedia"]["url_de"].endswith("/Zugspitze")
+    assert data["results"][2]["error"] == "LLM down"
+    assert data["statistics"]["unique_labels"] == 2
+    assert data["statistics"]["entities_extracted"] == 3
+    assert data["statistics"]["failed_documents"] == 1
+    assert requested_fields == [["internal_links"]]
+    assert data["results"][1]["statistics"]["top10"]["wikipedia_internal_links"] == {"Bayern": 2}
@@ -64,3 +64,141 @@ def test_auto_splitter():
         # Should still work with long text
         assert len(entities) >= 0
         assert "entities_extracted" in stats
+
+
+@pytest.mark.asyncio
+async def test_resolve_contexts_keeps_order_and_isolates_errors():
+    """Entities resolve concurrently, keep input order and fail independently."""
+    import asyncio
+
+    from app.core.linker import _resolve_contexts
+    from app.models.entity_processing_context import EntityProcessingContext
+
+    class FakeService:
+        def __init__(self):
+            self.in_flight = 0
+            self.peak = 0
+
+        async def prefetch_direct(self, labels):
+            return {}
+
+        async def process_entity(self, ctx, prefetched=None, skip_direct=False):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            if ctx.label == "Kaputt":
+                raise RuntimeError("boom")
+            ctx.wikipedia_data = {"status": "found", "wikidata_id": "Q1"}
+            return ctx
+
+    service = FakeService()
+    contexts = [EntityProcessingContext(label=label, type="CONCEPT") for label in ["A", "Kaputt", "B", "C"]]
+
+    timings = await _resolve_contexts(service, contexts, concurrency=2)
+
+    assert [t["label"] for t in timings] == ["A", "Kaputt", "B", "C"]
+    assert [t["status"] for t in timings] == ["found", "error", "found", "found"]
+    assert contexts[1].wikipedia_data["status"] == "error"
+    assert service.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_long_texts_are_extracted_in_parallel_chunks_and_merged(monkeypatch):
+    """Texts above the split threshold are extracted chunk by chunk and deduplicated by label."""
+    import asyncio
+
+    from app.core import linker
+    from app.core.settings import settings
+
+    monkeypatch.setattr(settings, "TEXT_SPLIT_THRESHOLD", 500)
+    monkeypatch.setattr(settings, "TEXT_CHUNK_SIZE", 200)
+    monkeypatch.setattr(settings, "LINKER_CHUNK_EXTRACTION_CONCURRENCY", 2)
+
+    text = " ".join(
+        ["Die Zugspitze ist ein Berg."] * 8 + ["Albert Einstein war Physiker."] * 8 + ["Kaputt ist dieser Satz."] * 6
+    )
+    in_flight = peak = 0
+
+    async def extract(chunk, max_entities, allowed_entity_types):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if "Kaputt" in chunk:
+            raise RuntimeError("boom")
+        found = []
+        if "Zugspitze" in chunk:
+            found.append(("zugspitze" if "Einstein" in chunk else "Zugspitze", "LOCATION", {}))
+        if "Einstein" in chunk:
+            found.append(("Albert Einstein", "PERSON", {}))
+        return found
+
+    monkeypatch.setattr(linker, "extract_entities_async", extract)
+
+    contexts = await linker._extract_or_generate_entities(text, "extract", 10, False, "auto")
+
+    assert [ctx.label for ctx in contexts] == ["Zugspitze", "Albert Einstein"]
+    zugspitze, einstein = contexts
+    assert zugspitze.metadata["chunks"] == [0, 1] and zugspitze.metadata["offset"] == 4
+    assert zugspitze.metadata["mentions"] == einstein.metadata["mentions"] == 8
+    assert einstein.metadata["chunks"] == [1] and einstein.metadata["offset"] == text.index("Albert")
+    assert peak == 2
+
+    one_entity = await linker._extract_or_generate_entities(text, "extract", 1, False, "auto")
+    assert [ctx.label for ctx in one_entity] == ["Zugspitze"]
+
+    # Both are named by two chunks; the label occurring more often in the text wins
+    text = text.replace("war Physiker.", "war Physiker wie Albert Einstein.")
+    one_entity = await linker._extract_or_generate_entities(text, "extract", 1, False, "auto")
+    assert [ctx.label for ctx in one_entity] == ["Albert Einstein"]
+    assert one_entity[0].metadata["mentions"] == 16
+
+
+@pytest.mark.asyncio
+async def test_structured_entity_extraction_requests_the_schema_and_skips_text_repairs(monkeypatch):
+    """Structured mode sends a strict JSON schema and reads the validated entity list."""
+    from types import SimpleNamespace
+
+    from app.core import openai_wrapper
+    from app.core.settings import settings
+
+    monkeypatch.setattr(settings, "OPENAI_STRUCTURED_OUTPUTS", True)
+    content = (
+        '{"entities": [{"label_de": "Zugspitze", "label_en": "Zugspitze", "type": "location", '
+        '"wikipedia_url_de": "https://de.wikipedia.org/wiki/Zugspitze", "wikipedia_url_en": null, '
+        '"wikidata_id": "Q3375"}]}'
+    )
+    requests = []
+
+    async def create(**request):
+        requests.append(request)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(openai_wrapper, "get_async_client", lambda: client)
+
+    entities = await openai_wrapper.extract_entities_async("Die Zugspitze ist hoch.", max_entities=3)
+
+    assert entities == [
+        (
+            "Zugspitze",
+            "LOCATION",
+            {
+                "label_de": "Zugspitze",
+                "label_en": "Zugspitze",
+                "wiki_url_de": "https://de.wikipedia.org/wiki/Zugspitze",
+                "wiki_url_en": None,
+                "wikidata_id": "Q3375",
+            },
+        )
+    ]
+    response_format = requests[0]["response_format"]
+    assert response_format["type"] == "json_schema"
+    schema = response_format["json_schema"]["schema"]
+    assert schema["required"] == ["entities"]
+    assert "wikidata_id" in schema["$defs"]["EntityItem"]["required"]
+
+    with pytest.raises(RuntimeError, match="Invalid structured output"):
+        openai_wrapper._parse_entities_response("[]", generated=False)
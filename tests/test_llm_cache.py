@@ -0,0 +1,87 @@
+"""Tests for the LLM response cache."""
+
+import json
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from app.core import llm_cache
+from app.core.llm_cache import LLMResponseCache, bypass_llm_cache, complete, complete_async, get_llm_cache
+
+
+def _response(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _request(text: str) -> dict:
+    return {"model": "m", "messages": [{"role": "user", "content": text}], "temperature": 0.0, "max_tokens": 10}
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_are_answered_from_memory_then_disk(tmp_path):
+    """A repeated request is not sent again; a fresh process finds it on disk."""
+    calls = []
+
+    async def create(**request):
+        calls.append(request)
+        return _response(f" {request['messages'][0]['content']} translated ")
+
+    first = await complete_async("translate", _request("Haus"), create, str.strip)
+    again = await complete_async("translate", {**_request("Haus"), "timeout": 5}, create, str.strip)
+    other = await complete_async("translate", _request("Baum"), create, str.strip)
+
+    assert first == again == "Haus translated"
+    assert other == "Baum translated"
+    assert len(calls) == 2
+
+    stats = get_llm_cache().get_stats()
+    assert stats["memory_hits"] == 1 and stats["misses"] == 2
+    assert stats["endpoints"]["translate"]["hit_rate"] == pytest.approx(0.333)
+
+    reopened = LLMResponseCache(get_llm_cache().path)
+    changes = reopened._conn.total_changes
+    assert reopened.get("translate", llm_cache.request_key(_request("Haus"))) == " Haus translated "
+    assert reopened.get_stats()["disk_hits"] == 1
+
+    reopened.ttls = {"translate": -1}
+    assert reopened.get("translate", llm_cache.request_key(_request("Baum"))) is None
+    assert reopened._conn.total_changes == changes  # lookups never write
+
+
+def test_unparsable_answers_and_bypassed_requests_are_not_cached():
+    """Answers the parser rejects are asked again; bypassed requests neither read nor write."""
+    answers = iter(["not json", '["Gebäude"]', '["Bauwerk"]'])
+    calls = 0
+
+    def create(**_request):
+        nonlocal calls
+        calls += 1
+        return _response(next(answers))
+
+    with pytest.raises(ValueError):
+        complete("synonyms", _request("Haus"), create, json.loads)
+    assert complete("synonyms", _request("Haus"), create, json.loads) == ["Gebäude"]
+    assert complete("synonyms", _request("Haus"), create, json.loads) == ["Gebäude"]
+    with bypass_llm_cache():
+        assert complete("synonyms", _request("Haus"), create, json.loads) == ["Bauwerk"]
+
+    assert calls == 3
+    assert get_llm_cache().get_stats()["endpoints"]["synonyms"]["bypassed"] == 1
+
+
+def test_no_cache_header_bypasses_the_cache_for_the_request():
+    """Cache-Control: no-cache switches the cache off while the request is handled."""
+    from app.middleware.llm_cache import LLMCacheControlMiddleware
+
+    app = FastAPI()
+    app.add_middleware(LLMCacheControlMiddleware)
+
+    @app.get("/probe")
+    async def probe() -> dict:
+        return {"bypassed": llm_cache._bypass.get()}
+
+    client = TestClient(app)
+    assert client.get("/probe").json() == {"bypassed": False}
+    assert client.get("/probe", headers={"Cache-Control": "no-cache"}).json() == {"bypassed": True}
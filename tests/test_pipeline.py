@@ -7,44 +7,28 @@ from app.main import app
 client = TestClient(app)
 
 def test_pipeline_happy_path():
-    """Test successful pipeline execution with all steps."""
-    # Mock the internal HTTP client calls that pipeline makes
-    mock_linker_response = {
-        "original_text": "Die Zugspitze ist der höchste Berg Deutschlands.",
-        "entities": [
-            {
-                "label": "Zugspitze",
-                "type": "MOUNTAIN",
-                "wiki_url_de": "https://de.wikipedia.org/wiki/Zugspitze",
-                "wiki_url_en": "https://en.wikipedia.org/wiki/Zugspitze"
-            }
-        ],
-        "statistics": {"total_entities": 1}
-    }
-
-    mock_compendium_response = {
-        "markdown": "## Zugspitze\nDie Zugspitze ist der höchste Berg Deutschlands...",
-        "bibliography": "1. https://de.wikipedia.org/wiki/Zugspitze",
-        "statistics": {"length": 100}
-    }
-
-    mock_qa_response = {
-        "qa": [{"question": "Was ist die Zugspitze?", "answer": "Der höchste Berg Deutschlands"}],
-        "statistics": {"num_pairs": 1}
-    }
-
-    # Mock the httpx client used for internal API calls
-    with patch('httpx.AsyncClient') as mock_client:
-        mock_instance = AsyncMock()
-        mock_client.return_value.__aenter__.return_value = mock_instance
-
-        # Mock the three sequential API calls
-        mock_instance.post.side_effect = [
-            AsyncMock(status_code=200, json=lambda: mock_linker_response),
-            AsyncMock(status_code=200, json=lambda: mock_compendium_response),
-            AsyncMock(status_code=200, json=lambda: mock_qa_response)
-        ]
+    """Test successful pipeline execution with all steps running in-process."""
+    from app.models.entity import Entity
+
+    entity = Entity(
+        label="Zugspitze",
+        type="MOUNTAIN",
+        wiki_url_de="https://de.wikipedia.org/wiki/Zugspitze",
+        wiki_url_en="https://en.wikipedia.org/wiki/Zugspitze",
+        abstract_de="Die Zugspitze ist der höchste Gipfel Deutschlands.",
+    )
+    markdown = "## Zugspitze\nDie Zugspitze ist der höchste Berg Deutschlands..."
 
+    with (
+        patch("app.core.linker.process_text_async", AsyncMock(return_value=([entity], {}))) as mock_linker,
+        patch(
+            "app.core.compendium.generate_compendium_with_openai_async", AsyncMock(return_value=markdown)
+        ) as mock_compendium,
+        patch(
+            "app.core.qa.generate_qa_pairs_async",
+            AsyncMock(return_value=[("Was ist die Zugspitze?", "Der höchste Berg Deutschlands")]),
+        ) as mock_qa,
+    ):
         payload = {
             "text": "Die Zugspitze ist der höchste Berg Deutschlands.",
             "config": {
@@ -64,8 +48,64 @@ def test_pipeline_happy_path():
         assert "qa_output" in data
         assert "pipeline_statistics" in data
 
+        assert data["linker_output"]["entities"][0]["entity"] == "Zugspitze"
+        assert data["compendium_output"]["markdown"] == markdown
+        assert data["qa_output"]["qa"][0]["question"] == "Was ist die Zugspitze?"
+        stats = data["pipeline_statistics"]
+        assert stats["completed_steps"] == 3
+        assert set(stats["processing_times"]) == {"linker", "compendium", "qa"}
+
+        assert mock_linker.await_args.kwargs["max_entities"] == 10
+        topic, context, references, _config = mock_compendium.await_args.args
+        assert topic == "Die Zugspitze ist der höchste Berg Deutschlands"
+        assert references == ["https://de.wikipedia.org/wiki/Zugspitze"]
+        assert "Die Zugspitze ist der höchste Gipfel Deutschlands." in context
+        assert mock_qa.await_args.args[0] == markdown
+
+
+def test_pipeline_reports_failed_step():
+    """A failing stage surfaces as '<Stage> step failed'."""
+    with patch("app.core.linker.process_text_async", AsyncMock(side_effect=RuntimeError("boom"))):
+        resp = client.post("/api/v1/pipeline", json={"text": "Zugspitze"})
+
+    assert resp.status_code == 500
+    assert resp.json()["detail"].startswith("Linker step failed")
+
 
 def test_pipeline_empty_text():
     """Test pipeline validation with empty text input."""
     resp = client.post("/api/v1/pipeline", json={"text": ""})
     assert resp.status_code == 422  # Validation error for empty text
+
+
+def test_pipeline_parallel_mode_overlaps_compendium_and_qa():
+    """In parallel mode QA runs from the linker abstracts while the compendium is generated."""
+    import asyncio
+
+    from app.models.entity import Entity
+
+    entity = Entity(label="Zugspitze", type="MOUNTAIN", abstract_de="Höchster Gipfel Deutschlands.")
+    qa_started = asyncio.Event()
+
+    async def fake_compendium(*_args):
+        # Only completes if QA has started without waiting for the compendium
+        await asyncio.wait_for(qa_started.wait(), timeout=2)
+        return "## Zugspitze"
+
+    async def fake_qa(text, *_args, **_kwargs):
+        qa_started.set()
+        return [("Was ist die Zugspitze?", "Ein Berg")]
+
+    with (
+        patch("app.core.linker.process_text_async", AsyncMock(return_value=([entity], {}))),
+        patch("app.core.compendium.generate_compendium_with_openai_async", side_effect=fake_compendium),
+        patch("app.core.qa.generate_qa_pairs_async", side_effect=fake_qa) as mock_qa,
+    ):
+        payload = {"text": "Die Zugspitze.", "config": {"dependency_mode": "parallel"}}
+        resp = client.post("/api/v1/pipeline", json=payload)
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["compendium_output"]["markdown"] == "## Zugspitze"
+    assert data["pipeline_statistics"]["dependency_mode"] == "parallel"
+    assert "**Zugspitze**: Höchster Gipfel Deutschlands." in mock_qa.call_args.args[0]
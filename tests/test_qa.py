@@ -21,3 +21,54 @@ def test_qa_mock() -> None:
     })
     assert resp.status_code == 200
     assert len(resp.json()["qa"]) >= 1
+
+
+def test_structured_qa_with_levels_is_schema_constrained_and_validated(monkeypatch) -> None:
+    """In structured mode the request carries the level enum and the JSON answer is validated, not line-parsed."""
+    import asyncio
+    import json
+    from types import SimpleNamespace
+
+    import pytest
+
+    from app.core import openai_wrapper, qa
+    from app.core.settings import settings
+
+    monkeypatch.setattr(settings, "OPENAI_STRUCTURED_OUTPUTS", True)
+    answers = iter(
+        [
+            '{"pairs": [{"question": "Wie hoch ist die Zugspitze?"',
+            json.dumps(
+                {
+                    "pairs": [
+                        {"question": "Was ist die Zugspitze?", "answer": "Ein Berg.", "level": "Primarstufe"},
+                        {"question": "Wie hoch ist sie?", "answer": "2962 Meter hoch.", "level": "Hochschule"},
+                    ]
+                }
+            ),
+        ]
+    )
+    requests = []
+
+    async def create(**request):
+        requests.append(request)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=next(answers)))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(openai_wrapper, "get_async_client", lambda: client)
+
+    markdown = "## Zugspitze\nDie Zugspitze ist mit 2962 Metern der höchste Berg Deutschlands."
+    levels = ["Primarstufe", "Hochschule"]
+    with pytest.raises(ValueError):
+        asyncio.run(qa.generate_qa_pairs_with_levels_async(markdown, 2, max_chars=12, level_values=levels))
+    pairs = asyncio.run(qa.generate_qa_pairs_with_levels_async(markdown, 2, max_chars=12, level_values=levels))
+
+    assert pairs == [
+        ("Was ist die Zugspitze?", "Ein Berg.", "Bildungsstufe", "Primarstufe"),
+        ("Wie hoch ist sie?", "2962 Mete...", "Bildungsstufe", "Hochschule"),
+    ]
+    # The malformed answer was not cached, so the second call reached the model again
+    assert len(requests) == 2
+    schema = requests[0]["response_format"]["json_schema"]
+    assert schema["strict"] is True
+    assert schema["schema"]["$defs"]["QALevelPair"]["properties"]["level"]["enum"] == levels
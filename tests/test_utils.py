@@ -2,7 +2,7 @@
 
 import pathlib
 import sys
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
@@ -38,7 +38,7 @@ def test_synonyms() -> None:
 def test_translate() -> None:
     """Test translation endpoint."""
     # Test with mocked translation
-    with patch('app.core.utils._translate_text') as mock_translate:
+    with patch('app.core.utils._translate_text_async', new_callable=AsyncMock) as mock_translate:
         mock_translate.return_value = "Hello"
         resp = client.post("/api/v1/utils/translate", json={
             "text": "Hallo", "target_language": "en"
@@ -47,7 +47,7 @@ def test_translate() -> None:
         assert resp.json()["translation"] == "Hello"
 
     # Test with fallback
-    with patch('app.core.utils._translate_text', side_effect=Exception("API Error")):
+    with patch('app.core.utils._translate_text_async', new_callable=AsyncMock, side_effect=Exception("API Error")):
         resp = client.post("/api/v1/utils/translate", json={
             "text": "Hallo", "target_language": "en"
         })
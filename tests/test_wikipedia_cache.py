@@ -0,0 +1,242 @@
+"""Tests for the persistent Wikipedia page cache."""
+
+import re
+
+from aioresponses import aioresponses
+import pytest
+
+from app.services.wikipedia.api.client import WikipediaAPIClient
+from app.services.wikipedia.cache import WikipediaPageCache
+
+
+def _page(title: str, qid: str) -> dict:
+    return {"pageid": 1, "title": title, "extract": f"{title} extract", "pageprops": {"wikibase_item": qid}}
+
+
+def test_cache_roundtrip_follows_redirects(tmp_path):
+    """Stored pages are found by requested and by final title."""
+    cache = WikipediaPageCache(str(tmp_path / "c.sqlite3"))
+    pages = {"Albert Einstein": _page("Albert Einstein", "Q937")}
+    cache.store(["Einstein"], "de", pages, {"Einstein": "Albert Einstein"})
+
+    pages, redirects, missing = cache.lookup(["einstein", "Albert_Einstein", "Zugspitze"], "de")
+
+    assert missing == ["Zugspitze"]
+    assert redirects["einstein"] == "Albert Einstein"
+    assert pages["Albert Einstein"]["pageprops"]["wikibase_item"] == "Q937"
+    assert cache.get_stats()["hits"] == 2
+    assert cache.lookup(["Einstein"], "en")[2] == ["Einstein"]
+
+
+def test_cache_ttl_and_lru_eviction(tmp_path):
+    """Expired entries miss and the least recently used entries are evicted first."""
+    cache = WikipediaPageCache(str(tmp_path / "c.sqlite3"), ttl=3600, max_entries=2)
+    cache.store(["A"], "de", {"A": _page("A", "Q1")}, {})
+    cache.store(["B"], "de", {"B": _page("B", "Q2")}, {})
+    cache.lookup(["A"], "de")  # A is now more recently used than B
+    cache.store(["C"], "de", {"C": _page("C", "Q3")}, {})
+
+    assert cache.lookup(["A", "B", "C"], "de")[2] == ["B"]
+
+    cache.ttl = -1
+    assert cache.lookup(["A"], "de")[2] == ["A"]
+    assert cache.get_stats()["expired"] == 1
+
+
+def test_cache_hits_do_not_write_until_the_next_store(tmp_path):
+    """Lookups are read-only; their access times are written with the next store."""
+    cache = WikipediaPageCache(str(tmp_path / "c.sqlite3"))
+    cache.store(["A"], "de", {"A": _page("A", "Q1")}, {})
+    before = cache._conn.total_changes
+
+    cache.lookup(["A"], "de")
+    assert cache._conn.total_changes == before
+    assert cache.known_misses(["A", "B"], "de") == set()
+
+    cache.store(["B"], "de", {"B": _page("B", "Q2")}, {})
+    (accessed_at,) = cache._conn.execute("SELECT accessed_at FROM pages WHERE title_key = 'A'").fetchone()
+    (created_at,) = cache._conn.execute("SELECT created_at FROM pages WHERE title_key = 'A'").fetchone()
+    assert accessed_at > created_at
+
+
+@pytest.mark.asyncio
+async def test_client_serves_repeated_titles_from_cache(tmp_path):
+    """A second fetch of the same title does not hit the network."""
+    cache = WikipediaPageCache(str(tmp_path / "c.sqlite3"))
+    api_resp = {"query": {"pages": [_page("Zugspitze", "Q3375")]}}
+
+    with aioresponses() as mock:
+        mock.get(re.compile(r"https://de\.wikipedia\.org/w/api\.php.*"), payload=api_resp, status=200)
+
+        async with WikipediaAPIClient(cache=cache) as client:
+            await client.fetch_pages_batch(["Zugspitze"], "de")
+            pages, _ = await client.fetch_pages_batch(["Zugspitze"], "de")
+            stats = client.get_stats()
+
+        assert sum(len(calls) for calls in mock.requests.values()) == 1
+
+    assert "Zugspitze" in pages
+    assert stats["resolver"]["cache"]["served"] == 1
+    assert stats["resolver"]["cache"]["passed_on"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lookup_cache_coalesces_concurrent_lookups():
+    """Concurrent lookups of one label share a single fetch and later ones hit the LRU."""
+    import asyncio
+
+    from app.services.wikipedia.cache import EntityLookupCache
+    from app.services.wikipedia.models import WikiPage
+
+    cache = EntityLookupCache(max_entries=10)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return WikiPage(title_de="Zugspitze", abstract_de="Berg", wikidata_id="Q3375")
+
+    pages = await asyncio.gather(*(cache.get_or_fetch("Zugspitze", "de", fetch) for _ in range(5)))
+    again = await cache.get_or_fetch("zugspitze", "de", fetch)
+
+    assert calls == 1
+    assert all(page.wikidata_id == "Q3375" for page in pages)
+    assert again.title_de == "Zugspitze"
+    assert cache.get_stats() == {"hits": 1, "misses": 1, "coalesced": 4, "entries": 1, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_skips_fallback_chain_for_known_misses(monkeypatch):
+    """Unresolvable labels run the fallback chain once; outages are not remembered as misses."""
+    from unittest.mock import AsyncMock
+
+    from fastapi.testclient import TestClient
+
+    from app.core.settings import settings
+    from app.main import app
+    from app.models.entity_processing_context import EntityProcessingContext
+    from app.services.wikipedia.cache import EntityLookupCache, get_page_cache
+    from app.services.wikipedia.exceptions import WikipediaRateLimitError
+    from app.services.wikipedia.service import WikipediaService
+
+    async def _resolve(label):
+        svc = WikipediaService(lookup_cache=EntityLookupCache())
+        svc.fallback_strategies.fetch_with_fallbacks = chain
+        ctx = await svc.process_entity(EntityProcessingContext(label=label, type="CONCEPT"))
+        return ctx.wikipedia_data["status"]
+
+    chain = AsyncMock(return_value=(None, True))
+    assert await _resolve("Quantenbrezel") == "not_found"
+    assert await _resolve("quantenbrezel") == "not_found"
+    assert chain.await_count == 1
+    assert get_page_cache().get_stats()["negative_hits"] == 1
+
+    class RateLimitedResolver:
+        async def resolve(self, titles, lang, props):
+            raise WikipediaRateLimitError(5)
+
+    # Every strategy runs for real but its lookups are rate limited, so the chain does not finish
+    svc = WikipediaService(lookup_cache=EntityLookupCache())
+    svc.fallback_strategies.resolver = RateLimitedResolver()
+    ctx = await svc.process_entity(EntityProcessingContext(label="Ausfall", type="CONCEPT"))
+    assert ctx.wikipedia_data["status"] == "not_found"
+    assert not get_page_cache().is_known_miss("Ausfall", "de")
+
+    client = TestClient(app)
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+    assert client.delete("/api/v1/admin/cache/negative").status_code == 404
+    assert client.delete("/api/v1/admin/cache/llm").status_code == 404
+    assert get_page_cache().is_known_miss("Quantenbrezel", "de")
+
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "geheim")
+    assert client.delete("/api/v1/admin/cache/negative").status_code == 401
+    resp = client.delete(
+        "/api/v1/admin/cache/negative", params={"label": "Quantenbrezel"}, headers={"X-Admin-Key": "geheim"}
+    )
+    assert resp.json() == {"removed": 1}
+
+    await _resolve("Quantenbrezel")
+    assert chain.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_offline_index_from_sample_dump_serves_pages_without_network(tmp_path):
+    """The index built from the sample dump resolves redirects locally; only unknown titles go live."""
+    from pathlib import Path
+
+    from app.services.wikipedia.constants import BASE_PROPS
+    from app.services.wikipedia.offline_index import OfflineIndex, main
+
+    dump = Path(__file__).parent / "data" / "wikipedia_dump"
+    output = tmp_path / "offline.sqlite3"
+    assert (
+        main(
+            [
+                "--lang=de",
+                f"--output={output}",
+                f"--page={dump / 'dewiki-sample-page.sql'}",
+                f"--redirect={dump / 'dewiki-sample-redirect.sql'}",
+                f"--langlinks={dump / 'dewiki-sample-langlinks.sql'}",
+                f"--page-props={dump / 'dewiki-sample-page_props.sql'}",
+                f"--abstracts={dump / 'dewiki-sample-abstract.xml'}",
+            ]
+        )
+        == 0
+    )
+    index = OfflineIndex(str(output))
+
+    pages, redirects, missing = index.lookup(["einstein", "Rock 'n' Roll", "Physiker", "Unbekannt"], "de")
+
+    assert missing == ["Physiker", "Unbekannt"]  # categories are not indexed
+    assert redirects == {"einstein": "Albert Einstein"}
+    einstein = pages["Albert Einstein"]
+    assert einstein["pageprops"] == {"wikibase_item": "Q937"}
+    assert einstein["extract"].startswith("Albert Einstein war")
+    assert {"lang": "en", "title": "Albert Einstein"} in einstein["langlinks"]
+    assert pages["Rock 'n' Roll"]["pageprops"]["wikibase_item"] == "Q7749"
+
+    api_resp = {"query": {"pages": [_page("Unbekannt", "Q1"), {**_page("Zugspitze", "Q3375"), "pageid": 2}]}}
+    with aioresponses() as mock:
+        mock.get(re.compile(r"https://de\.wikipedia\.org/w/api\.php.*"), payload=api_resp, repeat=True)
+
+        cache = WikipediaPageCache(str(tmp_path / "c.sqlite3"))
+        async with WikipediaAPIClient(cache=cache, offline_index=index) as client:
+            pages, _ = await client.fetch_pages_batch(["Zugspitze", "Unbekannt"], "de", BASE_PROPS)
+            # Categories, links, coordinates and thumbnails are not in the index: both titles go live
+            await client.fetch_pages_batch(["Zugspitze", "Einstein"], "de")
+            stats = client.get_stats()
+
+        requests = [call.kwargs["params"]["titles"] for calls in mock.requests.values() for call in calls]
+        assert requests == ["Unbekannt", "Zugspitze|Einstein"]
+
+    assert set(pages) == {"Zugspitze", "Unbekannt"}
+    assert stats["resolver"]["offline"]["served"] == 1
+    assert stats["resolver"]["offline"]["pages"] == {"de": 3}
+
+
+@pytest.mark.asyncio
+async def test_field_selection_trims_props_and_cache_respects_them(tmp_path):
+    """Only the selected props are requested; cached pages only answer requests they cover."""
+    from app.services.wikipedia.constants import props_for_fields
+
+    cache = WikipediaPageCache(str(tmp_path / "c.sqlite3"))
+    narrow = props_for_fields(["categories"])
+    api_resp = {"query": {"pages": [_page("Zugspitze", "Q3375")]}}
+
+    with aioresponses() as mock:
+        mock.get(re.compile(r"https://de\.wikipedia\.org/w/api\.php.*"), payload=api_resp, repeat=True)
+
+        async with WikipediaAPIClient(cache=cache) as client:
+            await client.fetch_pages_batch(["Zugspitze"], "de", narrow)
+            await client.fetch_pages_batch(["Zugspitze"], "de", narrow)  # cached with enough props
+            await client.fetch_pages_batch(["Zugspitze"], "de")  # needs every prop
+            await client.fetch_pages_batch(["Zugspitze"], "de", narrow)  # answered by the wider entry
+
+        params = [call.kwargs["params"] for calls in mock.requests.values() for call in calls]
+
+    assert len(params) == 2
+    assert params[0]["prop"] == "categories|extracts|langlinks|pageprops"
+    assert "pllimit" not in params[0] and "piprop" not in params[0]
+    assert params[1]["prop"] == "categories|coordinates|extracts|langlinks|links|pageimages|pageprops"
+    assert params[1]["pllimit"] == "max"
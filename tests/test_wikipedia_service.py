@@ -23,26 +23,11 @@ async def test_fetch_single_basic_fields():
                     "ns": 0,
                     "title": title,
                     "extract": "Albert Einstein was a German-born theoretical physicist...",
-                    "pageprops": {
-                        "wikibase_item": "Q937",
-                        "infoboxes": ["scientist"]
-                    },
-                    "coordinates": [
-                        {
-                            "lat": 52.5,
-                            "lon": 13.4,
-                            "primary": "",
-                            "globe": "earth"
-                        }
-                    ],
-                    "categories": [
-                        {"title": "Category:German physicists"}
-                    ],
-                    "links": [
-                        {"title": "Physics"},
-                        {"title": "Relativity"}
-                    ],
-                    "pageimage": "Einstein_1921.jpg"
+                    "pageprops": {"wikibase_item": "Q937", "infoboxes": ["scientist"]},
+                    "coordinates": [{"lat": 52.5, "lon": 13.4, "primary": "", "globe": "earth"}],
+                    "categories": [{"title": "Category:German physicists"}],
+                    "links": [{"title": "Physics"}, {"title": "Relativity"}],
+                    "pageimage": "Einstein_1921.jpg",
                 }
             }
         }
@@ -97,6 +82,419 @@ async def test_handles_http_error():
 
         # Expect WikipediaAPIError to be raised
         from app.services.wikipedia.exceptions import WikipediaAPIError
+
         with pytest.raises(WikipediaAPIError):
             async with WikipediaService() as svc:
                 await svc.fetch_pages([title], lang="en")
+
+
+@pytest.mark.asyncio
+async def test_prefetch_direct_uses_single_batched_query():
+    """Direct lookups for all entities are answered by one MediaWiki query."""
+    api_resp = {
+        "query": {
+            "normalized": [{"from": "zugspitze", "to": "Zugspitze"}],
+            "redirects": [{"from": "Einstein", "to": "Albert Einstein"}],
+            "pages": [
+                {
+                    "pageid": 1,
+                    "title": "Zugspitze",
+                    "extract": "Die Zugspitze ist der höchste Berg Deutschlands.",
+                    "pageprops": {"wikibase_item": "Q3375"},
+                },
+                {
+                    "pageid": 2,
+                    "title": "Albert Einstein",
+                    "extract": "Albert Einstein war ein Physiker.",
+                    "pageprops": {"wikibase_item": "Q937"},
+                },
+                {"title": "Gibtsnicht", "missing": True},
+            ],
+        }
+    }
+
+    with aioresponses() as mock:
+        de_url_re = re.compile(r"https://de\.wikipedia\.org/w/api\.php.*")
+        mock.get(de_url_re, payload=api_resp, status=200)
+
+        async with WikipediaService() as svc:
+            pages = await svc.prefetch_direct(["zugspitze", "Einstein", "Gibtsnicht"])
+
+        assert sum(len(calls) for calls in mock.requests.values()) == 1
+
+    assert pages["zugspitze"].wikidata_id == "Q3375"
+    assert pages["Einstein"].title_de == "Albert Einstein"
+    assert pages["Gibtsnicht"] is None
+
+
+@pytest.mark.asyncio
+async def test_hedged_fallbacks_take_first_complete_page_and_cancel_the_rest():
+    """A fast later strategy wins over a slow direct lookup, which is cancelled."""
+    import asyncio
+
+    from app.services.wikipedia.fallbacks.strategies import WikipediaFallbackStrategies
+    from app.services.wikipedia.models import WikiPage
+
+    strategies = WikipediaFallbackStrategies(resolver=None, hedged=True, hedge_delay=0.01)
+    direct_cancelled = asyncio.Event()
+
+    async def slow_direct(entity_name, lang):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            direct_cancelled.set()
+            raise
+
+    async def synonym(entity_name, lang):
+        await asyncio.sleep(0.02)
+        return WikiPage(title_de="Zugspitze", abstract_de="Berg.", wikidata_id="Q3375")
+
+    async def nothing(entity_name, lang):
+        return None
+
+    strategies.direct_lookup = slow_direct
+    strategies.synonym_fallback = synonym
+    strategies.opensearch_fallback = nothing
+    strategies.beautifulsoup_fallback = nothing
+
+    page, exhausted = await asyncio.wait_for(strategies.fetch_with_fallbacks("Zugspitze"), timeout=1)
+
+    assert page.resolved_by == "synonym" and exhausted
+    assert direct_cancelled.is_set()
+    stats = strategies.get_stats()
+    assert stats["wins"] == {"synonym": 1}
+    assert stats["cancelled"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_requests_count_as_failures():
+    """A request that only ever gets HTTP 429 is recorded as failed and raises a rate-limit error."""
+    from app.services.wikipedia.exceptions import WikipediaAPIError, WikipediaRateLimitError
+
+    with aioresponses() as mock:
+        mock.get(
+            re.compile(r"https://de\.wikipedia\.org/w/api\.php.*"),
+            status=429,
+            headers={"Retry-After": "0"},
+            repeat=True,
+        )
+        async with WikipediaService() as svc:
+            with pytest.raises(WikipediaAPIError) as excinfo:
+                await svc.api_client.fetch_pages_live(["Zugspitze"], "de", max_retries=1, base_delay=0)
+            stats = svc.api_client.request_stats
+
+    assert isinstance(excinfo.value.__cause__, WikipediaRateLimitError)
+    assert stats == {"requests": 2, "successes": 0, "failures": 2}
+
+
+@pytest.mark.asyncio
+async def test_synonym_fallback_resolves_all_variations_in_one_query():
+    """All name variations of an entity are looked up with a single batched query."""
+    api_resp = {
+        "query": {
+            "normalized": [{"from": "zugspitze", "to": "Zugspitze"}, {"from": "die zugspitze", "to": "Die zugspitze"}],
+            "pages": [
+                {"title": "Die Zugspitze", "missing": True},
+                {"title": "Die zugspitze", "missing": True},
+                {"title": "DIE ZUGSPITZE", "missing": True},
+                {
+                    "pageid": 1,
+                    "title": "Zugspitze",
+                    "extract": "Die Zugspitze ist der höchste Berg Deutschlands.",
+                    "pageprops": {"wikibase_item": "Q3375"},
+                },
+            ],
+        }
+    }
+
+    with aioresponses() as mock:
+        mock.get(re.compile(r"https://de\.wikipedia\.org/w/api\.php.*"), payload=api_resp, status=200)
+
+        async with WikipediaService() as svc:
+            page = await svc.fallback_strategies.synonym_fallback("Die zugspitze", "de")
+
+        assert sum(len(calls) for calls in mock.requests.values()) == 1
+
+    assert page.wikidata_id == "Q3375"
+    assert page.title_de == "Zugspitze"
+
+
+@pytest.mark.asyncio
+async def test_unresolved_entities_share_one_synonym_call_and_one_batched_query(monkeypatch):
+    """Direct-lookup misses try their variations first; only the rest share one synonym LLM call."""
+    from aioresponses import CallbackResult
+
+    from app.core import utils
+    from app.core.linker import _resolve_contexts
+    from app.models.entity_processing_context import EntityProcessingContext
+
+    known = {
+        title: {"pageid": i, "title": title, "extract": f"{title}.", "pageprops": {"wikibase_item": f"Q{i}"}}
+        for i, title in enumerate(["Albert Einstein", "Johann Wolfgang von Goethe", "Zugspitze"], start=1)
+    }
+    llm_calls = []
+
+    async def synonyms_batch(words, max_synonyms, lang):
+        llm_calls.append(list(words))
+        return {"Relativitätsvater": ["Albert Einstein"], "Dichterfürst": ["Johann Wolfgang von Goethe"]}
+
+    def reply(url, **kwargs):
+        titles = kwargs["params"]["titles"].split("|")
+        pages = [known.get(title, {"title": title, "missing": True}) for title in titles]
+        return CallbackResult(payload={"query": {"pages": pages}})
+
+    monkeypatch.setattr(utils, "_synonyms_batch_llm_async", synonyms_batch)
+    contexts = [
+        EntityProcessingContext(label=label, type="PERSON")
+        for label in ["Relativitätsvater", "Dichterfürst", "Die Zugspitze"]
+    ]
+
+    with aioresponses() as mock:
+        mock.get(re.compile(r"https://de\.wikipedia\.org/w/api\.php.*"), callback=reply, repeat=True)
+        async with WikipediaService() as svc:
+            timings = await _resolve_contexts(svc, contexts)
+            stats = svc.get_stats()["fallbacks"]
+        requested = [call.kwargs["params"]["titles"] for calls in mock.requests.values() for call in calls]
+
+    assert llm_calls == [["Relativitätsvater", "Dichterfürst"]]
+    assert [t["resolved_by"] for t in timings] == ["synonym", "synonym", "synonym"]
+    assert [ctx.wikipedia_data["wikidata_id"] for ctx in contexts] == ["Q1", "Q2", "Q3"]
+    assert requested.count("Albert Einstein|Johann Wolfgang von Goethe") == 1
+    assert stats["synonym_batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_caps_in_flight_and_adapts_window(monkeypatch):
+    """The AIMD window bounds concurrency, grows on healthy responses and halves on overload."""
+    import asyncio
+
+    from app.core.settings import settings
+    from app.services.wikipedia.api.limiter import AdaptiveConcurrencyLimiter, get_host_limiter
+
+    limiter = AdaptiveConcurrencyLimiter(max_limit=8, initial_limit=2, cooldown=0)
+    in_flight = peak = 0
+
+    async def request():
+        nonlocal in_flight, peak
+        async with limiter:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    assert peak == 2
+
+    for _ in range(20):
+        limiter.on_success(0.1)
+    assert limiter.limit > 2
+
+    grown = limiter.limit
+    limiter.on_overload("HTTP 429")
+    assert limiter.limit == max(1, grown // 2)
+
+    limiter.on_success(5.0, size=50)  # a 50-title batch is as fast per title as single lookups
+    limiter.on_success(1.0, kind="links+continue")  # continuations are averaged separately
+    limiter.on_success(1.0)  # far above the latency average, but a single outlier
+    assert limiter.get_stats()["decreases"] == 1
+    limiter.on_success(1.0)
+    limiter.on_success(1.0)
+    assert limiter.get_stats()["decreases"] == 2
+    assert AdaptiveConcurrencyLimiter(max_limit=8).limit == 8
+
+    # Host windows never exceed the connector's pool, so pool waits are not measured as latency
+    monkeypatch.setattr(settings, "WIKIPEDIA_LIMITER_MAX", 32)
+    monkeypatch.setattr(settings, "WIKIPEDIA_CONNECTIONS_PER_HOST", 6)
+    assert get_host_limiter("pool-capped.wikipedia.test").max_limit == 6
+
+
+@pytest.mark.asyncio
+async def test_clients_reuse_shared_session():
+    """Clients use the shared session while it is open and never close it."""
+    from app.services.wikipedia.api.client import WikipediaAPIClient
+    from app.services.wikipedia.api.session import close_shared_session, open_shared_session
+
+    shared = await open_shared_session()
+    try:
+        async with WikipediaAPIClient() as first:
+            assert first._session is shared
+        async with WikipediaAPIClient() as second:
+            assert second._session is shared
+        assert not shared.closed
+        assert "connections_reused" in second.get_stats()["connections"]
+    finally:
+        await close_shared_session()
+
+    async with WikipediaAPIClient() as standalone:
+        assert standalone._session is not shared
+
+
+@pytest.mark.asyncio
+async def test_truncated_batches_are_continued_per_prop_up_to_the_page_caps(monkeypatch):
+    """Continuation tokens are followed per prop; a full page is skipped instead of paged through."""
+    from aioresponses import CallbackResult
+
+    from app.core.settings import settings
+    from app.services.wikipedia.api.client import WikipediaAPIClient
+
+    monkeypatch.setattr(settings, "WIKIPEDIA_MAX_LINKS_PER_PAGE", 3)
+
+    def links(*titles):
+        return [{"ns": 0, "title": title} for title in titles]
+
+    first = {
+        "continue": {"plcontinue": "1|0|L3", "excontinue": 2, "continue": "||"},
+        "query": {
+            "pages": [
+                {"pageid": 1, "title": "A", "extract": "A.", "links": links("L1", "L2")},
+                {"pageid": 2, "title": "B", "extract": "B."},
+                {"pageid": 3, "title": "C"},
+            ]
+        },
+    }
+    responses = {
+        ("links", "1|0|L3"): {
+            "continue": {"plcontinue": "1|0|L5", "continue": "||"},
+            "query": {"pages": [{"pageid": 1, "title": "A", "links": links("L3", "L4")}]},
+        },
+        ("links", None): {
+            "query": {
+                "pages": [
+                    {"pageid": 2, "title": "B", "links": links("M1")},
+                    {"pageid": 3, "title": "C", "links": links("N1")},
+                ]
+            }
+        },
+        ("extracts", 2): {"query": {"pages": [{"pageid": 3, "title": "C", "extract": "C."}]}},
+    }
+    requests = []
+
+    def reply(url, **kwargs):
+        params = kwargs["params"]
+        requests.append(params)
+        if "titles" in params:
+            return CallbackResult(payload=first)
+        token = params.get("plcontinue", params.get("excontinue"))
+        return CallbackResult(payload=responses[(params["prop"], token)])
+
+    with aioresponses() as mock:
+        mock.get(re.compile(r"https://de\.wikipedia\.org/w/api\.php.*"), callback=reply, repeat=True)
+        async with WikipediaAPIClient() as client:
+            pages, _ = await client.fetch_pages_batch(["A", "B", "C"], "de")
+
+    assert [link["title"] for link in pages["A"]["links"]] == ["L1", "L2", "L3"]
+    assert pages["B"]["links"] == links("M1") and pages["C"]["links"] == links("N1")
+    assert pages["C"]["extract"] == "C."
+    assert len(requests) == 4
+    assert any(params.get("pageids") == "2|3" and "plcontinue" not in params for params in requests)
+
+
+@pytest.mark.asyncio
+async def test_replay_resolver_records_live_answers_and_replays_them_offline(tmp_path):
+    """A replay tier in front of another tier records its answers; replayed alone it needs no network."""
+    from app.services.wikipedia.resolvers import FixtureReplayResolver, PageResolver, TieredResolver
+
+    class StubLive(PageResolver):
+        name = "live"
+
+        def __init__(self):
+            self.requested = []
+
+        async def resolve(self, titles, lang, props=None):
+            self.requested.extend(titles)
+            page = {"pageid": 1, "title": "Zugspitze", "extract": "Berg", "pageprops": {"wikibase_item": "Q3375"}}
+            return {"Zugspitze": page}, {"zugspitze": "Zugspitze"}
+
+    fixture = tmp_path / "wiki.json"
+    live = StubLive()
+    recording = TieredResolver([FixtureReplayResolver(str(fixture)), live])
+    await recording.resolve(["zugspitze", "Quantenbrezel"], "de")
+    await recording.resolve(["Zugspitze"], "de")
+    await recording.close()
+
+    assert live.requested == ["zugspitze", "Quantenbrezel"]
+    assert recording.get_stats()["replay"]["served"] == 1
+
+    with aioresponses() as mock:
+        async with WikipediaService(resolver=FixtureReplayResolver(str(fixture))) as svc:
+            pages = await svc.fetch_pages(["zugspitze", "Quantenbrezel"], "de", fetch_other_lang=False)
+        assert not mock.requests
+
+    assert [page.wikidata_id for page in pages] == ["Q3375", None]
+    assert svc.get_stats()["resolver"]["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_title_graph_learns_langlinks_and_fetches_known_counterparts_concurrently():
+    """Langlinks learned from one response let later lookups fetch both languages in one round."""
+    import asyncio
+
+    from app.services.wikipedia.resolvers import PageResolver
+
+    de_page = {
+        "pageid": 1,
+        "title": "Albert Einstein",
+        "extract": "Physiker",
+        "pageprops": {"wikibase_item": "Q937"},
+        "langlinks": [{"lang": "en", "title": "Albert Einstein (physicist)"}],
+    }
+    en_page = {"pageid": 2, "title": "Albert Einstein (physicist)", "extract": "Physicist"}
+    de_resp = {"query": {"redirects": [{"from": "Einstein", "to": "Albert Einstein"}], "pages": [de_page]}}
+    en_resp = {"query": {"pages": [en_page]}}
+
+    with aioresponses() as mock:
+        mock.get(re.compile(r"https://de\.wikipedia\.org/w/api\.php.*"), payload=de_resp)
+        mock.get(re.compile(r"https://en\.wikipedia\.org/w/api\.php.*"), payload=en_resp)
+        async with WikipediaService() as svc:
+            (page,) = await svc.fetch_pages(["Einstein"], "de")
+            graph = svc.api_client.title_graph
+
+    assert page.title_en == "Albert Einstein (physicist)"
+    assert page.abstract_en == "Physicist"
+    assert graph.counterparts(["einstein"], "de", "en") == {"einstein": "Albert Einstein (physicist)"}
+    assert graph.counterparts(["Albert Einstein (physicist)"], "en", "de") == {
+        "Albert Einstein (physicist)": "Albert Einstein"
+    }
+
+    # Redirected, canonical and unknown titles are answered by a single query
+    statements = []
+    graph._conn.set_trace_callback(statements.append)
+    assert graph.counterparts(["einstein", "Albert Einstein", "Unbekannt"], "de", "en") == {
+        "einstein": "Albert Einstein (physicist)",
+        "Albert Einstein": "Albert Einstein (physicist)",
+    }
+    graph._conn.set_trace_callback(None)
+    assert len(statements) == 1
+
+    class SlowResolver(PageResolver):
+        def __init__(self):
+            self.in_flight = self.max_in_flight = 0
+
+        async def resolve(self, titles, lang, props=None):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            if lang == "de":
+                return {"Albert Einstein": de_page}, {"Einstein": "Albert Einstein"}
+            return {"Albert Einstein (physicist)": en_page}, {}
+
+    resolver = SlowResolver()
+    async with WikipediaService(resolver=resolver) as svc:
+        (page,) = await svc.fetch_pages(["Einstein"], "de")
+
+    assert resolver.max_in_flight == 2
+    assert page.abstract_en == "Physicist"
+
+    from app.services.wikipedia.exceptions import WikipediaAPIError
+
+    class FailingPrimaryResolver(SlowResolver):
+        async def resolve(self, titles, lang, props=None):
+            if lang == "de":
+                raise WikipediaAPIError("Server error: 503", status_code=503)
+            return await super().resolve(titles, lang, props)
+
+    # The counterpart is known, so both languages are fetched together; the primary error surfaces as is
+    with pytest.raises(WikipediaAPIError, match="503"):
+        async with WikipediaService(resolver=FailingPrimaryResolver()) as svc:
+            await svc.fetch_pages(["Einstein"], "de")